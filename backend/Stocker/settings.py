@@ -92,7 +92,8 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware'
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'utils.middleware.ActivityBufferMiddleware'
 ]
 
 # Cors and Csrf Config
@@ -130,15 +131,42 @@ WSGI_APPLICATION = 'Stocker.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds and health checked
+# before being reused. Set DB_PGBOUNCER when connecting through PgBouncer in
+# transaction pooling mode: server-side cursors don't survive the transaction
+# there, and the role's timezone must be UTC so no session state is needed
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() in ['true', '1']
+
 DATABASES = {
     'default': {
         #'ENGINE': 'django.db.backends.sqlite3',
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'utils.postgresql',
         'NAME': os.getenv('DATABASE'),
         'USER': os.getenv('USER'),
         'PASSWORD': os.getenv('PASSWORD'),
         'HOST': os.getenv('HOST'),
-        'PORT': os.getenv('PORT')
+        'PORT': os.getenv('PORT'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+    }
+}
+
+# Cache
+# Defaults to a per-process memory cache. CACHE_BACKEND=file stores entries
+# in the CACHE_LOCATION directory and CACHE_BACKEND=redis uses the Redis
+# server at CACHE_LOCATION (requires the redis package)
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'locmem')],
+        'LOCATION': os.getenv('CACHE_LOCATION', 'stocker'),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
     }
 }
 
@@ -160,15 +188,37 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# JSON responses are encoded with orjson when it is installed, falling
+# back to the stdlib encoder otherwise. JSON_RENDERER=stdlib always uses
+# DRF's renderer
+JSON_RENDERERS = {
+    'fast': 'utils.renderers.FastJSONRenderer',
+    'stdlib': 'rest_framework.renderers.JSONRenderer',
+}
+
 # DRF
 REST_FRAMEWORK = {
     # Auth
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # Pagination
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.CustomCursorPagination',
+    # Rendering
+    'DEFAULT_RENDERER_CLASSES': (
+        JSON_RENDERERS[os.getenv('JSON_RENDERER', 'fast')],
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# Page size of list endpoints, which clients can raise with ?page_size
+# up to the max page size. Full listings are streamed with ?export=ndjson
+PAGINATION_PAGE_SIZE = 10
+PAGINATION_MAX_PAGE_SIZE = 100
+# Rows fetched and serialized at once by ?export=ndjson
+EXPORT_CHUNK_SIZE = 500
+
 # JWT Token Config
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
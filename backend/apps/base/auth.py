@@ -2,6 +2,7 @@ from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 import jwt
 from django.conf import settings
+from utils.user_cache import user_cache
 from .models import User
 
 
@@ -16,7 +17,8 @@ class TokenVersionAuthentication(BaseAuthentication):
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
             user_id = payload['user_id']
             token_version = payload['token_version']
-            user = User.objects.get(id=user_id)
+            # Served from memory for a short while after the first request
+            user = user_cache.load(user_id)
             if user.token_version != token_version:
                 raise AuthenticationFailed('Invalid or expired token.')
             return (user, token)
@@ -0,0 +1,74 @@
+import timeit
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from utils.renderers import FastJSONRenderer, orjson
+from utils.tokens import Token
+
+
+def build_payload(rows: int) -> dict:
+    """
+    Returns a page like payload of rows list entries holding the Decimal,
+    UUID and datetime values serializers return before rendering
+    """
+    now = datetime.now(timezone.utc)
+    return {
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'id': Token.generate_uuid(),
+                'created_by': 'user_1',
+                'name': f'item_{row}',
+                'quantity': row % 50,
+                'price': Decimal('19.99') + row,
+                'total_price': (Decimal('19.99') + row) * (row % 50),
+                'in_inventory': row % 2 == 0,
+                'variants': [{'name': 'Color', 'options': ['Red', 'Blue']}],
+                'created_at': now - timedelta(minutes=row),
+                'updated_at': now,
+            }
+            for row in range(rows)
+        ]
+    }
+
+
+class Command(BaseCommand):
+    """Benchmarks the JSON renderers on a large list payload"""
+    help = (
+        "Times the rendering of a list payload by DRF's JSONRenderer "
+        "and by FastJSONRenderer, and reports the best time of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000,
+                            help="Number of entries in the rendered list")
+        parser.add_argument('--repeat', type=int, default=5,
+                            help="Number of timed renders per renderer")
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError("--rows and --repeat must be at least 1.")
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                "orjson is not installed, FastJSONRenderer falls back "
+                "to the stdlib encoder."
+            ))
+
+        payload = build_payload(options['rows'])
+        timings = {}
+        for renderer in [JSONRenderer(), FastJSONRenderer()]:
+            name = type(renderer).__name__
+            size = len(renderer.render(payload))
+            timings[name] = min(timeit.repeat(lambda: renderer.render(payload),
+                                              number=1,
+                                              repeat=options['repeat']))
+            self.stdout.write(f"{name}: {timings[name] * 1000:.2f} ms "
+                              f"({size} bytes)")
+
+        speedup = timings['JSONRenderer'] / timings['FastJSONRenderer']
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {options['rows']} rows {speedup:.1f}x faster "
+            "with FastJSONRenderer."
+        ))
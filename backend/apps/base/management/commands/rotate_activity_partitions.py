@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from ...partitions import ACTIVITY_TABLE, rotate_month_partitions
+
+
+class Command(BaseCommand):
+    """Rotates the monthly partitions of the activity table"""
+    help = (
+        "Creates the activity partitions of the coming months and drops, "
+        "or archives, the partitions past the retention period. "
+        "Meant to run monthly (e.g. with cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-months', type=int,
+                            default=getattr(settings, 'ACTIVITY_RETENTION_MONTHS', 12),
+                            help="Months of activities to keep")
+        parser.add_argument('--months-ahead', type=int,
+                            default=getattr(settings, 'ACTIVITY_PARTITIONS_AHEAD', 3),
+                            help="Months to create partitions ahead for")
+        parser.add_argument('--archive', action='store_true',
+                            help="Detach expired partitions into *_archive "
+                                 "tables instead of dropping them")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Activity partitions require PostgreSQL.")
+        if options['retention_months'] < 1:
+            raise CommandError("--retention-months must be at least 1.")
+
+        result = rotate_month_partitions(ACTIVITY_TABLE,
+                                         timezone.now().date(),
+                                         options['retention_months'],
+                                         options['months_ahead'],
+                                         archive=options['archive'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(result['created'])} partitions, "
+            f"dropped {len(result['dropped'])} and "
+            f"archived {len(result['archived'])}."
+        ))
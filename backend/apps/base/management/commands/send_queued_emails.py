@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+from utils.email_queue import deliver_queued_emails
+
+
+class Command(BaseCommand):
+    """Sends the queued outbound emails"""
+    help = (
+        "Sends the pending outbound emails that are due and reschedules "
+        "the ones that fail. Runs once, or keeps polling the queue with "
+        "--loop (e.g. as a worker process)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Maximum number of emails sent per batch")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep polling the queue")
+        parser.add_argument('--interval', type=float, default=5,
+                            help="Seconds to wait between polls of an "
+                                 "empty queue")
+
+    def handle(self, *args, **options):
+        while True:
+            counts = deliver_queued_emails(batch_size=options['batch_size'])
+            if any(counts.values()):
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {counts['sent']} emails, "
+                    f"{counts['retried']} to retry, "
+                    f"{counts['failed']} failed."
+                ))
+            if not options['loop']:
+                if not any(counts.values()):
+                    self.stdout.write(self.style.SUCCESS("No emails to send."))
+                break
+            if not any(counts.values()):
+                time.sleep(options['interval'])
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.13 on 2026-10-19 17:05
+
+from datetime import date
+from django.db import migrations, models
+from django.utils import timezone
+
+
+INDEX = models.Index(fields=['user', '-created_at'], name='activity_user_created_idx')
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_activity(apps, schema_editor):
+    """
+    Rebuilds base_activity as a table partitioned by month of created_at
+    with a default partition, and copies the existing rows over.
+    The primary key must include the partition key, so it becomes
+    (id, created_at). Other databases only get the feed index.
+    """
+    Activity = apps.get_model('base', 'Activity')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.add_index(Activity, INDEX)
+        return
+
+    execute = schema_editor.execute
+    execute("ALTER TABLE base_activity RENAME TO base_activity_unpartitioned")
+    execute(
+        "CREATE TABLE base_activity ("
+        "id uuid NOT NULL, "
+        "created_at timestamp with time zone NOT NULL, "
+        "updated_at timestamp with time zone NOT NULL, "
+        "action varchar(50) NOT NULL, "
+        "model_name varchar(50) NOT NULL, "
+        "user_id uuid NOT NULL, "
+        "object_ref jsonb NOT NULL, "
+        "PRIMARY KEY (id, created_at), "
+        "FOREIGN KEY (user_id) REFERENCES base_user (id) "
+        "DEFERRABLE INITIALLY DEFERRED"
+        ") PARTITION BY RANGE (created_at)"
+    )
+    execute("CREATE TABLE base_activity_default PARTITION OF base_activity DEFAULT")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(created_at) FROM base_activity_unpartitioned")
+        oldest = cursor.fetchone()[0]
+    current_month = timezone.now().date().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current_month
+    while month <= add_months(current_month, 3):
+        next_month = add_months(month, 1)
+        execute(
+            f"CREATE TABLE base_activity_y{month.year}m{month.month:02d} "
+            "PARTITION OF base_activity FOR VALUES FROM (%s) TO (%s)",
+            params=[month.isoformat(), next_month.isoformat()]
+        )
+        month = next_month
+
+    execute("INSERT INTO base_activity "
+            "(id, created_at, updated_at, action, model_name, user_id, object_ref) "
+            "SELECT id, created_at, updated_at, action, model_name, user_id, object_ref "
+            "FROM base_activity_unpartitioned")
+    execute("DROP TABLE base_activity_unpartitioned")
+    execute("CREATE INDEX activity_user_created_idx "
+            "ON base_activity (user_id, created_at DESC)")
+
+
+def unpartition_activity(apps, schema_editor):
+    """Rebuilds base_activity as a regular table"""
+    Activity = apps.get_model('base', 'Activity')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.remove_index(Activity, INDEX)
+        return
+
+    execute = schema_editor.execute
+    execute("CREATE TABLE base_activity_unpartitioned "
+            "(LIKE base_activity INCLUDING DEFAULTS)")
+    execute("INSERT INTO base_activity_unpartitioned SELECT * FROM base_activity")
+    execute("DROP TABLE base_activity CASCADE")
+    execute("ALTER TABLE base_activity_unpartitioned RENAME TO base_activity")
+    execute("ALTER TABLE base_activity ADD PRIMARY KEY (id)")
+    execute("ALTER TABLE base_activity ADD CONSTRAINT "
+            "base_activity_user_id_7110c0a4_fk_base_user_id "
+            "FOREIGN KEY (user_id) REFERENCES base_user (id) "
+            "DEFERRABLE INITIALLY DEFERRED")
+    execute("CREATE INDEX base_activity_user_id_7110c0a4 ON base_activity (user_id)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0029_outboundemail'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(partition_activity, unpartition_activity),
+            ],
+            state_operations=[
+                migrations.AddIndex(model_name='activity', index=INDEX),
+            ],
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.contrib.auth.password_validation import validate_password
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from utils.tokens import Token
 from utils.models import BaseModel
@@ -111,9 +112,53 @@ class Activity(BaseModel):
     model_name = models.CharField(max_length=50)
     object_ref = models.JSONField(default=list)
 
+    class Meta(BaseModel.Meta):
+        # On PostgreSQL the table is partitioned by month of created_at
+        # and old partitions are rotated by rotate_activity_partitions
+        indexes = [
+            models.Index(fields=['user', '-created_at'],
+                         name='activity_user_created_idx'),
+        ]
+
     def __str__(self):
         return (
             f"{self.user.username} "
             f"{self.action} {self.model_name} "
             f"{self.object_ref}"
         )
+
+
+OUTBOUND_EMAIL_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('sent', 'Sent'),
+    ('failed', 'Failed'),
+]
+
+
+class OutboundEmail(BaseModel):
+    """
+    Outbound Email Model
+    Emails are queued by requests and delivered once the request's
+    transaction commits, or later by the send_queued_emails worker.
+    """
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(null=True, blank=True)
+    from_email = models.CharField(max_length=254, null=True, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10,
+                              choices=OUTBOUND_EMAIL_STATUS_CHOICES,
+                              default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'],
+                         name='outbound_email_due_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,115 @@
+import re
+from datetime import date
+from typing import Dict, List
+from django.db import connection, transaction
+
+
+ACTIVITY_TABLE = 'base_activity'
+
+PARTITION_NAME_PATTERN = re.compile(r'_y(\d{4})m(\d{2})$')
+
+
+def month_start(day: date) -> date:
+    """Returns the first day of day's month"""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Returns the first day of the month months after month"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Returns the name of table's partition holding month"""
+    return f'{table}_y{month.year}m{month.month:02d}'
+
+
+def get_month_partitions(table: str) -> Dict[date, str]:
+    """Returns a month to partition name map of table's monthly partitions"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s",
+            [table]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_PATTERN.search(name)
+        if match:
+            year, month = map(int, match.groups())
+            partitions[date(year, month, 1)] = name
+    return partitions
+
+
+@transaction.atomic
+def create_month_partition(table: str, month: date) -> str:
+    """
+    Creates table's partition for month and returns its name.
+    Rows of that month that were routed to the default partition
+    in the meantime are moved into the new partition.
+    """
+    name = partition_name(table, month)
+    quote = connection.ops.quote_name
+    bounds = [month.isoformat(), add_months(month, 1).isoformat()]
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {quote(name)} "
+                       f"(LIKE {quote(table)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote(table + '_default')} "
+            "WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {quote(name)} SELECT * FROM moved",
+            bounds
+        )
+        cursor.execute(f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} "
+                       "FOR VALUES FROM (%s) TO (%s)", bounds)
+    return name
+
+
+@transaction.atomic
+def rotate_month_partitions(
+    table: str,
+    today: date,
+    retention_months: int,
+    months_ahead: int,
+    archive: bool = False
+) -> Dict[str, List[str]]:
+    """
+    Creates table's partitions from the current month to months_ahead
+    months later, and drops the partitions whose whole month is older
+    than retention_months, or detaches and renames them to *_archive so
+    they can be dumped and dropped later. Returns the affected partitions.
+    """
+    quote = connection.ops.quote_name
+    current_month = month_start(today)
+    cutoff = add_months(current_month, -retention_months)
+    partitions = get_month_partitions(table)
+    result = {'created': [], 'dropped': [], 'archived': []}
+
+    for months in range(months_ahead + 1):
+        month = add_months(current_month, months)
+        if month not in partitions:
+            result['created'].append(create_month_partition(table, month))
+
+    with connection.cursor() as cursor:
+        # Partitions with deferred foreign key checks pending can't be dropped
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for month, name in sorted(partitions.items()):
+            if month >= cutoff:
+                continue
+            if archive:
+                cursor.execute(f"ALTER TABLE {quote(table)} "
+                               f"DETACH PARTITION {quote(name)}")
+                cursor.execute(f"ALTER TABLE {quote(name)} "
+                               f"RENAME TO {quote(name + '_archive')}")
+                result['archived'].append(name)
+            else:
+                cursor.execute(f"DROP TABLE {quote(name)}")
+                result['dropped'].append(name)
+        # Rows past the retention period that fell into the default partition
+        cursor.execute(f"DELETE FROM {quote(table + '_default')} "
+                       "WHERE created_at < %s", [cutoff.isoformat()])
+    return result
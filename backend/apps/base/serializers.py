@@ -163,7 +163,7 @@ class ChangePasswordSerializer(serializers.Serializer):
     def save(self, **kwargs):
         new_password1 = self.validated_data['new_password1']
         self.user.set_password(new_password1)
-        self.user.save()
+        self.user.save(update_fields=['password'])
         return self.user
 
 
@@ -198,7 +198,12 @@ class ResetPasswordSerializer(serializers.Serializer):
 
 
 class ActivitySerializer(serializers.ModelSerializer):
-    """Activity Serializer"""
+    """
+    Activity Serializer
+    The domain and each user's block are built once per serializer, so
+    rendering a page of activities costs no extra work per row. Compact
+    mode (context['compact']) leaves the user block out of every activity.
+    """
     class Meta:
         model = Activity
         fields = [
@@ -210,25 +215,39 @@ class ActivitySerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
-    def get_user(self, instance):
-        request = self.context.get('request', None)
-        domain = (
-            request.build_absolute_uri('/')[:-1]
-            if request else 'http://localhost:8000'
-        )
-        avatar = (
-            f'{domain}{instance.user.avatar.url}'
-            if instance.user.avatar
-            else None
-        )
+    def get_domain(self):
+        if not hasattr(self, '_domain'):
+            request = self.context.get('request', None)
+            self._domain = (
+                request.build_absolute_uri('/')[:-1]
+                if request else 'http://localhost:8000'
+            )
+        return self._domain
+
+    def get_user_block(self, user: User):
+        """Returns the username and avatar url of user"""
+        if not hasattr(self, '_user_blocks'):
+            self._user_blocks = {}
+        if user.id not in self._user_blocks:
+            avatar = (
+                f'{self.get_domain()}{user.avatar.url}'
+                if user.avatar
+                else None
+            )
+            self._user_blocks[user.id] = {
+                'username': user.username,
+                'avatar': avatar
+            }
+        return self._user_blocks[user.id]
 
-        return {
-            'username': instance.user.username,
-            'avatar': avatar
-        }
+    def get_user(self, instance):
+        return self.get_user_block(instance.user)
 
     def to_representation(self, instance: Activity):
         activity_repr = super().to_representation(instance)
-        activity_repr['user'] = self.get_user(instance)
+        if self.context.get('compact'):
+            activity_repr.pop('user')
+        else:
+            activity_repr['user'] = self.get_user(instance)
         activity_repr['created_at'] = datetime_repr_format(instance.created_at)
         return activity_repr
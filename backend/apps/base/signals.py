@@ -0,0 +1,32 @@
+from django.core.signals import request_started
+from django.db import connections
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from utils.cache import invalidate_on_change
+from utils.db_metrics import pool_metrics
+from utils.user_cache import user_cache
+from .models import User, Activity
+
+
+invalidate_on_change(User, 'users', user_field='id')
+invalidate_on_change(Activity, 'activities', user_field='user_id')
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drops the user cached by token authentication whenever it changes,
+    so bumped token versions revoke tokens right away
+    """
+    user_cache.invalidate(instance.id)
+
+
+@receiver(request_started)
+def count_reused_connections(sender, **kwargs):
+    """
+    Counts the connections a request starts with that are still open.
+    Runs after Django closed the obsolete connections on request start.
+    """
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            pool_metrics.increment(connection.alias, 'reused')
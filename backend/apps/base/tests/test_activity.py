@@ -0,0 +1,202 @@
+import pytest
+from io import StringIO
+from threading import Event
+from datetime import datetime, timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+from apps.base.factories import ActivityFactory, UserFactory
+from apps.base.models import Activity
+from apps.base.partitions import (ACTIVITY_TABLE,
+                                  add_months,
+                                  create_month_partition,
+                                  get_month_partitions,
+                                  month_start,
+                                  partition_name)
+from utils.activity import (ActivityBuffer,
+                            activity_buffer,
+                            buffered_activities,
+                            register_activity)
+from utils.middleware import ActivityBufferMiddleware
+
+
+@pytest.mark.django_db
+class TestActivityBuffer:
+    """Tests for the buffered activity writes"""
+
+    def test_activity_is_saved_right_away_without_buffer(self):
+        user = UserFactory.create()
+        register_activity(user, "created", "item", ["Laptop"])
+        assert Activity.objects.filter(user=user).count() == 1
+
+    def test_buffered_activities_are_written_in_one_insert(
+        self,
+        django_assert_num_queries
+    ):
+        user = UserFactory.create()
+        with django_assert_num_queries(1):
+            with buffered_activities():
+                for name in ["Laptop", "Mouse", "Screen"]:
+                    register_activity(user, "created", "item", [name])
+
+        # Latest first, in the order they were registered
+        activities = Activity.objects.filter(user=user)
+        assert [activity.object_ref for activity in activities] == [
+            ["Screen"], ["Mouse"], ["Laptop"]
+        ]
+
+    def test_nested_buffers_are_flushed_by_the_outermost(self):
+        user = UserFactory.create()
+        with buffered_activities():
+            with buffered_activities():
+                register_activity(user, "created", "item", ["Laptop"])
+            assert Activity.objects.count() == 0
+        assert Activity.objects.count() == 1
+
+    def test_buffered_activities_are_dropped_on_error(self):
+        user = UserFactory.create()
+        with pytest.raises(ValueError):
+            with buffered_activities():
+                register_activity(user, "created", "item", ["Laptop"])
+                raise ValueError
+        assert Activity.objects.count() == 0
+        assert not activity_buffer.active
+
+    @pytest.mark.parametrize("status_code, activities_count", [(201, 1), (400, 0)])
+    def test_middleware_flushes_activities_of_successful_requests(
+        self,
+        status_code,
+        activities_count
+    ):
+        user = UserFactory.create()
+
+        def view(request):
+            register_activity(user, "created", "item", ["Laptop"])
+            return HttpResponse(status=status_code)
+
+        middleware = ActivityBufferMiddleware(view)
+        middleware(RequestFactory().post('/'))
+        assert Activity.objects.count() == activities_count
+        assert not activity_buffer.active
+
+
+@pytest.mark.django_db(transaction=True)
+def test_activities_are_written_in_order_by_the_background_writer():
+    user = UserFactory.create()
+    buffer = ActivityBuffer(flush_mode='thread')
+    for name in ["Laptop", "Mouse"]:
+        buffer.start()
+        buffer.add(Activity(user=user, action="created",
+                            model_name="item", object_ref=[name]))
+        buffer.flush()
+    buffer.wait()
+
+    activities = Activity.objects.filter(user=user)
+    assert [activity.object_ref for activity in activities] == [["Mouse"], ["Laptop"]]
+
+
+
+@pytest.mark.django_db(transaction=True)
+def test_readers_only_wait_for_the_batches_of_their_user():
+    user, other_user = UserFactory.create_batch(2)
+    buffer = ActivityBuffer(flush_mode='thread')
+    release = Event()
+    bulk_create = buffer._bulk_create
+
+    def blocked_bulk_create(activities):
+        if activities[0].user_id == other_user.id:
+            release.wait(5)
+        bulk_create(activities)
+
+    buffer._bulk_create = blocked_bulk_create
+    buffer.start()
+    buffer.add(Activity(user=other_user, action="created",
+                        model_name="item", object_ref=["Laptop"]))
+    buffer.flush()
+
+    # Nothing is pending for user while the writer is stuck on other_user
+    assert buffer.wait(user_id=user.id, timeout=0.1)
+    assert not buffer.wait(user_id=other_user.id, timeout=0.1)
+
+    buffer.start()
+    buffer.add(Activity(user=user, action="created",
+                        model_name="item", object_ref=["Mouse"]))
+    buffer.flush()
+    assert not buffer.wait(user_id=user.id, timeout=0.1)
+
+    release.set()
+    assert buffer.wait(user_id=user.id)
+    assert Activity.objects.filter(user=user).count() == 1
+    assert buffer.wait()
+
+
+@pytest.mark.django_db
+class TestRotateActivityPartitionsCommand:
+    """Tests for the rotate_activity_partitions command"""
+
+    @pytest.fixture
+    def old_activity(self):
+        activity = ActivityFactory.create(user=UserFactory.create())
+        old_month = add_months(month_start(timezone.now().date()), -14)
+        create_month_partition(ACTIVITY_TABLE, old_month)
+        Activity.objects.filter(id=activity.id).update(
+            created_at=timezone.make_aware(datetime(old_month.year, old_month.month, 2))
+        )
+        return activity, partition_name(ACTIVITY_TABLE, old_month)
+
+    def test_partitions_are_created_ahead(self):
+        current_month = month_start(timezone.now().date())
+        call_command("rotate_activity_partitions", "--months-ahead", "5",
+                     stdout=StringIO())
+
+        partitions = get_month_partitions(ACTIVITY_TABLE)
+        for months in range(6):
+            assert add_months(current_month, months) in partitions
+
+    def test_expired_partitions_are_dropped(self, old_activity):
+        activity, name = old_activity
+        recent_activity = ActivityFactory.create(user=UserFactory.create())
+        out = StringIO()
+        call_command("rotate_activity_partitions", stdout=out)
+
+        assert "dropped 1 and archived 0" in out.getvalue()
+        assert name not in get_month_partitions(ACTIVITY_TABLE).values()
+        assert not Activity.objects.filter(id=activity.id).exists()
+        assert Activity.objects.filter(id=recent_activity.id).exists()
+
+    def test_expired_partitions_are_archived(self, old_activity):
+        activity, name = old_activity
+        call_command("rotate_activity_partitions", "--archive", stdout=StringIO())
+
+        assert not Activity.objects.filter(id=activity.id).exists()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT id FROM {name}_archive")
+            assert [str(row[0]) for row in cursor.fetchall()] == [str(activity.id)]
+
+    def test_expired_rows_of_the_default_partition_are_deleted(self):
+        activity = ActivityFactory.create(user=UserFactory.create())
+        Activity.objects.filter(id=activity.id).update(
+            created_at=timezone.now() - timedelta(days=800)
+        )
+        call_command("rotate_activity_partitions", stdout=StringIO())
+        assert not Activity.objects.filter(id=activity.id).exists()
+
+    def test_rows_are_moved_out_of_the_default_partition(self):
+        activity = ActivityFactory.create(user=UserFactory.create())
+        month = add_months(month_start(timezone.now().date()), 8)
+        Activity.objects.filter(id=activity.id).update(
+            created_at=timezone.make_aware(datetime(month.year, month.month, 3))
+        )
+        name = create_month_partition(ACTIVITY_TABLE, month)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT id FROM {name}")
+            assert [str(row[0]) for row in cursor.fetchall()] == [str(activity.id)]
+
+    def test_invalid_retention_period(self):
+        with pytest.raises(CommandError,
+                           match="--retention-months must be at least 1."):
+            call_command("rotate_activity_partitions", "--retention-months", "0")
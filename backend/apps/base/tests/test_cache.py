@@ -0,0 +1,83 @@
+import pytest
+from django.db import transaction
+from apps.base.factories import UserFactory
+from apps.inventory.factories import ItemFactory
+from utils.cache import cached, invalidate, invalidate_on_commit, make_key
+
+
+calls = []
+
+
+@cached('items')
+def count_calls(user, value):
+    calls.append(value)
+    return len(calls)
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+class TestCacheLayer:
+    """Tests for the namespaced cache layer"""
+
+    def test_results_are_cached_per_user_and_arguments(self):
+        user, other_user = UserFactory.create_batch(2)
+
+        assert count_calls(user, 'a') == 1
+        assert count_calls(user, 'a') == 1
+        assert count_calls(user, 'b') == 2
+        assert count_calls(other_user, 'a') == 3
+
+    def test_user_invalidation_only_drops_the_user_entries(self):
+        user, other_user = UserFactory.create_batch(2)
+        count_calls(user, 'a')
+        count_calls(other_user, 'a')
+
+        invalidate('items', user_id=user.id)
+        assert count_calls(user, 'a') == 3
+        assert count_calls(other_user, 'a') == 2
+
+    def test_shared_invalidation_drops_every_user_entries(self):
+        user, other_user = UserFactory.create_batch(2)
+        count_calls(user, 'a')
+        count_calls(other_user, 'a')
+
+        invalidate('items')
+        assert count_calls(user, 'a') == 3
+        assert count_calls(other_user, 'a') == 4
+
+    def test_keys_only_change_with_their_namespaces(self):
+        user = UserFactory.create()
+        key = make_key('report', ['sales'], user.id, {'limit': 5})
+
+        invalidate('clients', user_id=user.id)
+        assert make_key('report', ['sales'], user.id, {'limit': 5}) == key
+
+        invalidate('sales', user_id=user.id)
+        assert make_key('report', ['sales'], user.id, {'limit': 5}) != key
+
+    def test_invalidations_are_repeated_once_on_commit(
+        self,
+        django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            # Saving the user already schedules an invalidation
+            user = UserFactory.create()
+            with transaction.atomic():
+                invalidate_on_commit('items', 'sales', user_id=user.id)
+                invalidate_on_commit('clients', user_id=user.id)
+        assert len(callbacks) == 1
+
+        key = make_key('report', ['clients'], user.id)
+        callbacks[0]()
+        assert make_key('report', ['clients'], user.id) != key
+
+    def test_model_changes_invalidate_their_owner_namespaces(self):
+        user = UserFactory.create()
+        count_calls(user, 'a')
+
+        ItemFactory.create(created_by=user)
+        assert count_calls(user, 'a') == 2
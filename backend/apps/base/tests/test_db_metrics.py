@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import patch
+from django.db import connections
+from django.urls import reverse
+from utils.db_metrics import pool_metrics
+
+
+@pytest.fixture
+def new_connection():
+    connection = connections.create_connection('default')
+    yield connection
+    connection.close()
+
+
+@pytest.mark.django_db
+class TestConnectionPoolMetrics:
+    """Tests for the connection metrics of the database backend"""
+
+    def test_opened_and_closed_connections_are_counted(self, new_connection):
+        new_connection.connect()
+        metrics = pool_metrics.snapshot()['default']
+        assert metrics['opened'] == 1
+        assert metrics['connect_time'] > 0
+        assert metrics['avg_connect_time'] == metrics['connect_time']
+
+        new_connection.close()
+        assert pool_metrics.snapshot()['default']['closed'] == 1
+
+    def test_failed_health_checks_are_counted(self, new_connection):
+        new_connection.connect()
+        new_connection.health_check_enabled = True
+        new_connection.health_check_done = False
+
+        with patch.object(new_connection, 'is_usable', return_value=False):
+            new_connection.close_if_health_check_failed()
+
+        assert new_connection.connection is None
+        metrics = pool_metrics.snapshot()['default']
+        assert metrics['health_check_failures'] == 1
+        assert metrics['closed'] == 1
+
+    def test_persistent_connections_are_reused_by_requests(self, client):
+        client.get(reverse('get_user_activities'))
+        client.get(reverse('get_user_activities'))
+        assert pool_metrics.snapshot()['default']['reused'] == 2
+
@@ -0,0 +1,119 @@
+import pytest
+from io import StringIO
+from datetime import timedelta
+from smtplib import SMTPException
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from apps.base.models import OutboundEmail
+from utils.email_queue import queue_email, deliver_queued_emails
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    """Email backend whose mail server always rejects messages"""
+    def send_messages(self, email_messages):
+        raise SMTPException("Service unavailable")
+
+
+@pytest.fixture
+def failing_email_backend(settings):
+    settings.EMAIL_BACKEND = 'apps.base.tests.test_email_queue.FailingEmailBackend'
+
+
+@pytest.mark.django_db
+class TestEmailQueue:
+    """Tests for the outbound email queue"""
+
+    def test_email_is_sent_after_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            email = queue_email("Subject", "Body", ["user@example.com"],
+                                html_body="<p>Body</p>")
+        assert len(mail.outbox) == 0
+        assert len(callbacks) == 1
+
+        callbacks[0]()
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].alternatives == [("<p>Body</p>", "text/html")]
+
+        email.refresh_from_db()
+        assert email.status == 'sent'
+        assert email.attempts == 1
+        assert email.sent_at is not None
+
+    def test_worker_dispatch_leaves_emails_queued(
+        self,
+        settings,
+        django_capture_on_commit_callbacks
+    ):
+        settings.EMAIL_QUEUE_DISPATCH = 'worker'
+        with django_capture_on_commit_callbacks(execute=True):
+            email = queue_email("Subject", "Body", ["user@example.com"])
+        assert len(mail.outbox) == 0
+
+        email.refresh_from_db()
+        assert email.status == 'pending'
+
+    def test_failed_email_is_retried_with_backoff(self, failing_email_backend):
+        email = OutboundEmail.objects.create(subject="Subject", body="Body",
+                                             to=["user@example.com"])
+
+        counts = deliver_queued_emails()
+        assert counts == {'sent': 0, 'retried': 1, 'failed': 0}
+
+        email.refresh_from_db()
+        assert email.status == 'pending'
+        assert email.attempts == 1
+        assert email.last_error == "Service unavailable"
+        delay = (email.next_attempt_at - timezone.now()).total_seconds()
+        assert 50 < delay <= 60
+
+        # Not due yet
+        assert deliver_queued_emails() == {'sent': 0, 'retried': 0, 'failed': 0}
+
+        OutboundEmail.objects.filter(id=email.id).update(next_attempt_at=timezone.now())
+        deliver_queued_emails()
+        email.refresh_from_db()
+        assert email.attempts == 2
+        delay = (email.next_attempt_at - timezone.now()).total_seconds()
+        assert 110 < delay <= 120
+
+    def test_email_fails_after_max_attempts(self, settings, failing_email_backend):
+        settings.EMAIL_QUEUE_MAX_ATTEMPTS = 3
+        email = OutboundEmail.objects.create(subject="Subject", body="Body",
+                                             to=["user@example.com"],
+                                             attempts=2)
+
+        assert deliver_queued_emails()['failed'] == 1
+        email.refresh_from_db()
+        assert email.status == 'failed'
+        assert email.attempts == 3
+
+    def test_due_emails_are_sent_in_batches(self):
+        past = timezone.now() - timedelta(minutes=5)
+        for index in range(3):
+            OutboundEmail.objects.create(subject=f"Subject {index}", body="Body",
+                                         to=["user@example.com"],
+                                         next_attempt_at=past + timedelta(seconds=index))
+        OutboundEmail.objects.create(subject="Later", body="Body",
+                                     to=["user@example.com"],
+                                     next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        assert deliver_queued_emails(batch_size=2)['sent'] == 2
+        assert [email.subject for email in mail.outbox] == ["Subject 0", "Subject 1"]
+
+        assert deliver_queued_emails(batch_size=2)['sent'] == 1
+        assert OutboundEmail.objects.filter(status='pending').count() == 1
+
+    def test_send_queued_emails_command(self):
+        OutboundEmail.objects.create(subject="Subject", body="Body",
+                                     to=["user@example.com"])
+        out = StringIO()
+        call_command("send_queued_emails", stdout=out)
+
+        assert "Sent 1 emails, 0 to retry, 0 failed." in out.getvalue()
+        assert len(mail.outbox) == 1
+
+        out = StringIO()
+        call_command("send_queued_emails", stdout=out)
+        assert "No emails to send." in out.getvalue()
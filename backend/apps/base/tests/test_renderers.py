@@ -0,0 +1,84 @@
+import pytest
+import json
+import uuid
+from io import StringIO
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from apps.base.factories import UserFactory
+from utils import renderers
+from utils.renderers import FastJSONRenderer, dumps
+
+
+@pytest.fixture
+def payload():
+    return {
+        "id": uuid.UUID("123e4567-e89b-12d3-a456-426655440000"),
+        "price": Decimal("19.99"),
+        "created_at": datetime(2026, 10, 19, 10, 30, 15, 250, tzinfo=timezone.utc),
+        "day": date(2026, 10, 19),
+        "label": gettext_lazy("Pending"),
+        "variants": [{"name": "Color", "options": ["Red", "Blué"]}],
+        "counts": {1: 2},
+    }
+
+
+class TestFastJSONRenderer:
+    """Tests for the orjson based JSON renderer"""
+
+    def test_renders_like_the_stdlib_renderer(self, payload):
+        rendered = FastJSONRenderer().render(payload)
+        assert rendered == JSONRenderer().render(payload)
+        assert json.loads(rendered) == {
+            "id": "123e4567-e89b-12d3-a456-426655440000",
+            "price": 19.99,
+            "created_at": "2026-10-19T10:30:15.000250Z",
+            "day": "2026-10-19",
+            "label": "Pending",
+            "variants": [{"name": "Color", "options": ["Red", "Blué"]}],
+            "counts": {"1": 2},
+        }
+
+    def test_renders_nothing_for_no_data(self):
+        assert FastJSONRenderer().render(None) == b""
+
+    def test_renders_indented_when_requested(self, payload):
+        rendered = FastJSONRenderer().render(
+            payload, "application/json; indent=4"
+        )
+        assert b'\n  "id"' in rendered
+        assert json.loads(rendered)["price"] == 19.99
+
+    def test_falls_back_to_the_stdlib_renderer(self, payload, monkeypatch):
+        monkeypatch.setattr(renderers, "orjson", None)
+        assert FastJSONRenderer().render(payload) == JSONRenderer().render(payload)
+        assert dumps(payload) == JSONRenderer().render(payload)
+
+    def test_unsupported_values_raise_type_errors(self):
+        with pytest.raises(TypeError):
+            FastJSONRenderer().render({"value": object()})
+
+
+@pytest.mark.django_db
+class TestRendererSettings:
+    """Tests for the selection of the default renderer"""
+
+    def test_responses_are_rendered_by_the_fast_renderer(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory.create())
+        res = client.get(reverse("create_list_items"))
+        assert res.status_code == 200
+        assert isinstance(res.accepted_renderer, FastJSONRenderer)
+
+    def test_benchmark_renderers_command(self):
+        out = StringIO()
+        call_command("benchmark_renderers", "--rows", "20", "--repeat", "1",
+                     stdout=out)
+        output = out.getvalue()
+        assert "JSONRenderer:" in output
+        assert "FastJSONRenderer:" in output
+        assert "Rendered 20 rows" in output
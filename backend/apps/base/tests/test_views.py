@@ -1,8 +1,10 @@
 import pytest
 import os
+import json
 import jwt
 import shutil
 import calendar
+import time
 from typing import Union
 from urllib.parse import urlparse, parse_qs, urlencode
 from dateutil import parser
@@ -10,6 +12,8 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.core import mail
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -18,12 +22,13 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from datetime import date, datetime, timezone, timedelta
 from apps.base.models import User, Activity
-from apps.base.factories import ActivityFactory
+from apps.base.factories import ActivityFactory, UserFactory
 from apps.inventory.factories import ItemFactory
 from apps.client_orders.factories import OrderStatusFactory, ClientOrderFactory
 from apps.sales.models import SoldItem
 from apps.sales.factories import SaleFactory, SoldItemFactory
 from utils.serializers import datetime_repr_format
+from utils.user_cache import AuthenticatedUserCache
 
 
 @pytest.fixture
@@ -882,13 +887,15 @@ class TestSignUpView:
         self,
         api_client,
         signup_url,
-        signup_view_data
+        signup_view_data,
+        django_capture_on_commit_callbacks
     ):
-        res = api_client.post(
-            signup_url,
-            data=signup_view_data,
-            format='json'
-        )
+        with django_capture_on_commit_callbacks(execute=True):
+            res = api_client.post(
+                signup_url,
+                data=signup_view_data,
+                format='json'
+            )
         assert res.status_code == 201
         assert len(mail.outbox) == 1
 
@@ -1676,6 +1683,102 @@ class TestGetUpdateUserView:
         assert user_instance.avatar.name == ""
 
 
+@pytest.mark.django_db
+class TestTokenVersionAuthentication:
+    """Tests for the token version authentication"""
+
+    def test_authenticated_requests_reuse_the_cached_user(
+        self,
+        auth_client,
+        get_update_user_url
+    ):
+        assert auth_client.get(get_update_user_url).status_code == 200
+
+        with CaptureQueriesContext(connection) as context:
+            res = auth_client.get(get_update_user_url)
+        assert res.status_code == 200
+        assert not any('"base_user"' in query['sql']
+                       for query in context.captured_queries)
+
+    def test_user_update_refreshes_the_cached_user(
+        self,
+        auth_client,
+        user_instance,
+        get_update_user_url
+    ):
+        assert auth_client.get(get_update_user_url).status_code == 200
+
+        user_instance.first_name = "Safuan"
+        user_instance.save()
+
+        res = auth_client.get(get_update_user_url)
+        assert res.status_code == 200
+        assert res.data["first_name"] == "Safuan"
+
+    def test_user_update_keeps_changes_missed_by_the_cached_user(
+        self,
+        auth_client,
+        user_instance,
+        get_update_user_url
+    ):
+        assert auth_client.get(get_update_user_url).status_code == 200
+
+        # Changed by another process, which this process' cache misses
+        user_instance.set_password("adlux567@")
+        User.objects.filter(pk=user_instance.pk).update(
+            password=user_instance.password,
+            token_version=user_instance.token_version + 1
+        )
+
+        res = auth_client.patch(get_update_user_url, data={"first_name": "Safuan"})
+        assert res.status_code == 200
+
+        stored_user = User.objects.get(pk=user_instance.pk)
+        assert stored_user.first_name == "Safuan"
+        assert stored_user.token_version == user_instance.token_version + 1
+        assert stored_user.check_password("adlux567@")
+
+    def test_change_password_checks_the_stored_password(
+        self,
+        auth_client,
+        user_instance,
+        get_update_user_url,
+        change_password_url
+    ):
+        assert auth_client.get(get_update_user_url).status_code == 200
+
+        user_instance.set_password("adlux567@")
+        User.objects.filter(pk=user_instance.pk).update(
+            password=user_instance.password
+        )
+
+        res = auth_client.post(change_password_url, data={
+            "old_password": "adeltest123@",
+            "new_password1": "adnew890@",
+            "new_password2": "adnew890@"
+        }, format='json')
+        assert res.status_code == 400
+        assert res.data["old_password"] == ["Old password is incorrect."]
+
+        res = auth_client.post(change_password_url, data={
+            "old_password": "adlux567@",
+            "new_password1": "adnew890@",
+            "new_password2": "adnew890@"
+        }, format='json')
+        assert res.status_code == 200
+        stored_user = User.objects.get(pk=user_instance.pk)
+        assert stored_user.check_password("adnew890@")
+        assert stored_user.token_version == user_instance.token_version + 1
+
+    def test_cached_users_expire(self, user_instance):
+        cache = AuthenticatedUserCache(ttl=0.01)
+        assert str(cache.load(user_instance.id).id) == str(user_instance.id)
+        assert str(cache.get(user_instance.id).id) == str(user_instance.id)
+
+        time.sleep(0.02)
+        assert cache.get(user_instance.id) is None
+
+
 @pytest.mark.django_db
 class TestChangePasswordView:
     """Tests for the ChangePasswordView"""
@@ -1919,6 +2022,27 @@ class TestChangePasswordView:
         user_instance.refresh_from_db()
         assert user_instance.token_version == 2
 
+    def test_old_access_token_is_revoked_after_pwd_change(
+        self,
+        auth_client,
+        change_password_data,
+        change_password_url,
+        get_update_user_url
+    ):
+        # Authenticated requests cache the user
+        assert auth_client.get(get_update_user_url).status_code == 200
+
+        res = auth_client.post(
+            change_password_url,
+            data=change_password_data,
+            format='json'
+        )
+        assert res.status_code == 200
+
+        # The cached user is dropped with the token version bump
+        res = auth_client.get(get_update_user_url)
+        assert res.status_code == 403
+
     def test_access_token_in_response_after_pwd_change(
         self,
         auth_client,
@@ -2123,13 +2247,15 @@ class TestRequestPasswordResetView:
         self,
         api_client,
         user_instance,
-        request_pwd_reset_url
-    ):
-        res = api_client.post(
-            request_pwd_reset_url,
-            data={"email": user_instance.email},
-            format="json"
-        )
+        request_pwd_reset_url,
+        django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            res = api_client.post(
+                request_pwd_reset_url,
+                data={"email": user_instance.email},
+                format="json"
+            )
         assert res.status_code == 200
         assert len(mail.outbox) == 1
 
@@ -2142,13 +2268,15 @@ class TestRequestPasswordResetView:
     def test_no_email_is_sent_if_the_provided_email_does_not_exist(
         self,
         api_client,
-        request_pwd_reset_url
+        request_pwd_reset_url,
+        django_capture_on_commit_callbacks
     ):
-        res = api_client.post(
-            request_pwd_reset_url,
-            data={"email": "adelu@gmail.com"},
-            format="json"
-        )
+        with django_capture_on_commit_callbacks(execute=True):
+            res = api_client.post(
+                request_pwd_reset_url,
+                data={"email": "adelu@gmail.com"},
+                format="json"
+            )
 
         assert res.status_code == 200
         assert len(mail.outbox) == 0
@@ -2157,13 +2285,15 @@ class TestRequestPasswordResetView:
         self,
         api_client,
         user_instance,
-        request_pwd_reset_url
-    ):
-        res = api_client.post(
-            request_pwd_reset_url,
-            data={"email": user_instance.email},
-            format="json"
-        )
+        request_pwd_reset_url,
+        django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            res = api_client.post(
+                request_pwd_reset_url,
+                data={"email": user_instance.email},
+                format="json"
+            )
         assert res.status_code == 200
         assert len(mail.outbox) == 1
 
@@ -2183,13 +2313,15 @@ class TestRequestPasswordResetView:
         self,
         api_client,
         user_instance,
-        request_pwd_reset_url
-    ):
-        res = api_client.post(
-            request_pwd_reset_url,
-            data={"email": user_instance.email},
-            format="json"
-        )
+        request_pwd_reset_url,
+        django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            res = api_client.post(
+                request_pwd_reset_url,
+                data={"email": user_instance.email},
+                format="json"
+            )
         assert res.status_code == 200
         assert len(mail.outbox) == 1
 
@@ -2917,6 +3049,60 @@ class TestGetUserActivitiesView:
             parser.parse(second_page_activities[0]['created_at'])
         )
 
+    def test_user_activities_query_count_does_not_grow_with_results(
+        self,
+        auth_client,
+        user_instance,
+        user_activities_url,
+        django_assert_max_num_queries
+    ):
+        ActivityFactory.create_batch(2, user=user_instance)
+        with django_assert_max_num_queries(3) as captured:
+            auth_client.get(user_activities_url)
+        queries_count = len(captured)
+
+        ActivityFactory.create_batch(8, user=user_instance)
+        with django_assert_max_num_queries(queries_count):
+            res = auth_client.get(user_activities_url)
+        assert len(res.data["results"]) == 10
+
+    def test_user_activities_in_compact_mode(
+        self,
+        auth_client,
+        user_instance,
+        user_activities_url,
+    ):
+        ActivityFactory.create_batch(4, user=user_instance)
+
+        res = auth_client.get(user_activities_url, {"compact": "true"})
+
+        assert res.status_code == 200
+        assert res.data["user"]["username"] == user_instance.username
+        assert "avatar" in res.data["user"]
+        assert len(res.data["results"]) == 4
+        for activity in res.data["results"]:
+            assert "user" not in activity
+            assert "action" in activity
+
+    def test_export_user_activities(
+        self,
+        auth_client,
+        user_instance,
+        user_activities_url,
+    ):
+        ActivityFactory.create_batch(12, user=user_instance)
+        ActivityFactory.create_batch(2, user=UserFactory.create())
+
+        res = auth_client.get(user_activities_url, {"export": "ndjson",
+                                                    "compact": "true"})
+
+        assert res.status_code == 200
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        assert len(lines) == 12
+        for line in lines:
+            activity = json.loads(line)
+            assert activity["user"]["username"] == user_instance.username
+
 
 @pytest.mark.django_db
 class TestDashboardAPIView:
@@ -3643,3 +3829,26 @@ class TestDashboardAPIView:
             assert res_data[i]["model_name"] == activity.model_name
             assert res_data[i]["object_ref"] == activity.object_ref
             assert res_data[i]["created_at"] == datetime_repr_format(activity.created_at)
+
+
+@pytest.mark.django_db
+class TestDatabaseMetricsView:
+    """Tests for the DatabaseMetrics View"""
+
+    @pytest.fixture
+    def admin_client(self, auth_client, user_instance):
+        user_instance.is_staff = True
+        user_instance.save()
+        return auth_client
+
+    def test_metrics_require_an_admin_user(self, auth_client):
+        res = auth_client.get(reverse('database_metrics'))
+        assert res.status_code == 403
+
+    def test_metrics_of_the_serving_process(self, admin_client):
+        res = admin_client.get(reverse('database_metrics'))
+
+        assert res.status_code == 200
+        assert res.data['default']['reused'] >= 1
+        assert 'opened' in res.data['default']
+        assert 'avg_connect_time' in res.data['default']
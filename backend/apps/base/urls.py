@@ -3,7 +3,7 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenVerifyView
 )
-from .views import user_views, dashboard_views
+from .views import user_views, dashboard_views, metrics_views
 
 
 urlpatterns = [
@@ -46,4 +46,9 @@ urlpatterns = [
     path('dashboard/',
          dashboard_views.DashboardAPIView.as_view(),
          name='dashboard'),
+
+    # Metrics
+    path('metrics/database/',
+         metrics_views.DatabaseMetricsView.as_view(),
+         name='database_metrics'),
 ]
\ No newline at end of file
@@ -4,7 +4,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.db.models.functions import ExtractIsoWeekDay, ExtractDay
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import F, Q, Sum
 from datetime import datetime, date, time, timedelta
 from typing import Union, List
 from itertools import chain
@@ -159,17 +159,33 @@ def revenue_per_day(
     date_type_query: dict,
     initial_revenue_per_day_map: dict
 ) -> dict:
-    """Returns a dictionary that contains the Sales costs and profits per day"""
-    sale_records_days = (
+    """
+    Returns a dictionary that contains the Sales costs and profits per day.
+    Costs come from the sold items' stored unit costs, so each day's totals
+    are grouped in the database without loading the sales or their items.
+    """
+    sales_per_day = (
         sales
         .annotate(**date_type_query)
+        .order_by()
+        .values('day')
     )
+    items_totals = sales_per_day.annotate(
+        revenue=Sum(F('sold_items__sold_quantity') * F('sold_items__sold_price')),
+        items_cost=Sum(F('sold_items__sold_quantity') * F('sold_items__unit_cost')),
+    )
+    shipping_costs = {
+        day['day']: day['shipping_cost']
+        for day in sales_per_day.annotate(shipping_cost=Sum('shipping_cost'))
+    }
 
     sales_revenue_per_day = initial_revenue_per_day_map.copy()
 
-    for sale in sale_records_days:
-        if sale.day in sales_revenue_per_day:
-            sales_revenue_per_day[sale.day]['cost'] += sale.total_cost
-            sales_revenue_per_day[sale.day]['profit'] += sale.net_profit
+    for day in items_totals:
+        if day['day'] in sales_revenue_per_day:
+            revenue = day['revenue'] or 0
+            cost = (day['items_cost'] or 0) + (shipping_costs.get(day['day']) or 0)
+            sales_revenue_per_day[day['day']]['cost'] += cost
+            sales_revenue_per_day[day['day']]['profit'] += revenue - cost
 
     return sales_revenue_per_day
@@ -10,11 +10,17 @@ from ..serializers import ActivitySerializer
 from apps.inventory.models import Item
 from apps.client_orders.models import ClientOrder
 from apps.sales.models import Sale, SoldItem
+from apps.sales.utils import get_sales_totals
 from ..utils import (generate_filter_info, records_per_day,
                      revenue_per_day)
+from utils.activity import activity_buffer
+from utils.cache import cache_view
 from utils.status import (ACTIVE_DELIVERY_STATUS,
                           ACTIVE_PAYMENT_STATUS,
-                          FAILED_STATUS)
+                          FAILED_STATUS,
+                          ORDER_STATUS_CODES,
+                          get_status_codes,
+                          get_status_summary)
 from typing import Union
 
 
@@ -23,6 +29,8 @@ class DashboardAPIView(generics.GenericAPIView):
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
 
+    @cache_view('sales', 'client_orders', 'items', 'activities', 'users',
+                'order_statuses')
     def get(self, request, *args, **kwargs) -> Response:
         user = request.user
         info = request.GET.get('info', None)
@@ -76,27 +84,28 @@ class DashboardAPIView(generics.GenericAPIView):
         total_sales = Sale.objects.filter(created_by=user)
         client_orders = ClientOrder.objects.filter(created_by=user)
 
-        active_query = {
-            'delivery_status__name__in': ACTIVE_DELIVERY_STATUS,
-            'payment_status__name__in': ACTIVE_PAYMENT_STATUS,
-        }
+        active_query = Q(
+            delivery_state__in=get_status_codes(ACTIVE_DELIVERY_STATUS),
+            payment_state__in=get_status_codes(ACTIVE_PAYMENT_STATUS),
+        )
 
-        active_orders = client_orders.filter(**active_query).count()
-        active_sales = total_sales.filter(**active_query).count()
+        sales_summary = get_status_summary(total_sales, active=active_query)
+        orders_summary = get_status_summary(client_orders, active=active_query)
 
         completed_sales = (
             total_sales
             .filter(
-                delivery_status__name='Delivered',
-                payment_status__name='Paid'
+                delivery_state=ORDER_STATUS_CODES['Delivered'],
+                payment_state=ORDER_STATUS_CODES['Paid']
             )
         )
 
-        total_profit = sum(sale.net_profit for sale in completed_sales)
+        total_profit = get_sales_totals(completed_sales)['profit']
 
         return Response({'total_items': total_items_quantities,
-                         'total_sales': total_sales.count(),
-                         'active_sales_orders': active_sales + active_orders,
+                         'total_sales': sales_summary['total'],
+                         'active_sales_orders': (sales_summary['active'] +
+                                                 orders_summary['active']),
                          'total_profit': total_profit},
                          status=status.HTTP_200_OK)
 
@@ -122,12 +131,13 @@ class DashboardAPIView(generics.GenericAPIView):
 
         # Completed sales and failed sales - orders query
         completed_query = {
-            'delivery_status__name': 'Delivered',
-            'payment_status__name': 'Paid'
+            'delivery_state': ORDER_STATUS_CODES['Delivered'],
+            'payment_state': ORDER_STATUS_CODES['Paid']
         }
 
-        failed_query = (Q(delivery_status__name__in=FAILED_STATUS) | 
-                        Q(payment_status__name__in=FAILED_STATUS))
+        failed_codes = get_status_codes(FAILED_STATUS)
+        failed_query = (Q(delivery_state__in=failed_codes) |
+                        Q(payment_state__in=failed_codes))
 
         # Completed sales per day
         completed_sales_per_day = records_per_day(
@@ -174,8 +184,8 @@ class DashboardAPIView(generics.GenericAPIView):
 
         completed_sales = Sale.objects.filter(
             created_by=user,
-            delivery_status__name='Delivered',
-            payment_status__name='Paid',
+            delivery_state=ORDER_STATUS_CODES['Delivered'],
+            payment_state=ORDER_STATUS_CODES['Paid'],
             created_at__range=filter_info['created_at_range']
         )
 
@@ -232,8 +242,8 @@ class DashboardAPIView(generics.GenericAPIView):
 
         completed_sales = Sale.objects.filter(
             created_by=user,
-            delivery_status__name='Delivered',
-            payment_status__name='Paid',
+            delivery_state=ORDER_STATUS_CODES['Delivered'],
+            payment_state=ORDER_STATUS_CODES['Paid'],
         )
         sold_items = SoldItem.objects.filter(sale__in=completed_sales)
 
@@ -256,7 +266,7 @@ class DashboardAPIView(generics.GenericAPIView):
                 total_quantity=Sum('sold_quantity'),
                 total_profit=(
                     Sum(F('sold_quantity') * F('sold_price')) -
-                    Sum(F('sold_quantity') * F('item__price'))
+                    Sum(F('sold_quantity') * F('unit_cost'))
                 ),
                 total_revenue=Sum(F('sold_quantity') * F('sold_price')),
             )
@@ -280,7 +290,8 @@ class DashboardAPIView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        activities = Activity.objects.filter(user=user)[:limit]
+        activity_buffer.wait(user_id=user.id)
+        activities = Activity.objects.filter(user=user).select_related('user')[:limit]
         serializer = ActivitySerializer(
             activities,
             many=True,
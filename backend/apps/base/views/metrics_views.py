@@ -0,0 +1,14 @@
+from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from utils.db_metrics import pool_metrics
+from ..auth import TokenVersionAuthentication
+
+
+class DatabaseMetricsView(generics.GenericAPIView):
+    """Returns the database connection metrics of the serving process"""
+    authentication_classes = (TokenVersionAuthentication,)
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs) -> Response:
+        return Response(pool_metrics.snapshot(), status=status.HTTP_200_OK)
@@ -1,18 +1,20 @@
-from django.core.mail import send_mail, EmailMultiAlternatives
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import RetrieveUpdateAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 import os
+from utils.activity import activity_buffer
+from utils.email_queue import queue_email
 from ..models import User, Activity
 from ..serializers import (UserSerializer,
                           UserLoginSerializer,
@@ -23,6 +25,7 @@ from ..serializers import (UserSerializer,
 from ..auth import TokenVersionAuthentication
 from ..utils import get_tokens_for_user, set_refresh_token
 from utils.pagination import CustomCursorPagination
+from utils.views import ExportListMixin
 
 
 class CustomTokenRefreshView(APIView):
@@ -77,14 +80,12 @@ class SignUpView(APIView):
 
         if serializer.is_valid():
             user = serializer.save()
-            send_mail(
+            # Sent once the user is committed, outside of the request
+            queue_email(
                 "Welcome to Stocker",
-                f"You have Successfully Created A Stocker Account.",
-                os.getenv('EMAIL_HOST_USER'),
+                "You have Successfully Created A Stocker Account.",
                 [user.email],
-                # fail_silently: A boolean. When it’s False, send_mail()
-                # will raise an smtplib.SMTPException if an error occurs.
-                fail_silently=False
+                from_email=os.getenv('EMAIL_HOST_USER')
             )
             user_data = UserSerializer(user).data
             token = get_tokens_for_user(user)
@@ -130,7 +131,11 @@ class GetUpdateUserView(RetrieveUpdateAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        if self.request.method in SAFE_METHODS:
+            return self.request.user
+        # request.user may be a cached snapshot, so updates start from
+        # the stored user to keep a newer password and token_version
+        return User.objects.get(pk=self.request.user.pk)
 
 
 class ChangePasswordView(APIView):
@@ -138,12 +143,16 @@ class ChangePasswordView(APIView):
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
 
+    @transaction.atomic
     def post(self, request):
-        serializer = ChangePasswordSerializer(user=request.user, data=request.data)
+        # Checks the old password against the stored hash, not against
+        # the possibly stale cached request.user
+        user = User.objects.select_for_update().get(pk=request.user.pk)
+        serializer = ChangePasswordSerializer(user=user, data=request.data)
         if serializer.is_valid():
             user = serializer.save()
             user.token_version += 1
-            user.save()
+            user.save(update_fields=['token_version'])
             new_token = get_tokens_for_user(user)
             response = Response({'access_token': new_token['access']},
                                  status=status.HTTP_200_OK)
@@ -179,11 +188,10 @@ class RequestPasswordReset(APIView):
             to_email = [user.email]
             text_content = f"You can reset your password here: {reset_url}"
             html_content = f"You can reset your password here <a href='{reset_url}'>{reset_url}</a>."
-            # Supports HTML Content
-            email = EmailMultiAlternatives(subject, text_content, from_email, to_email)
-            # add an HTML version of the email content if email clients accepts html
-            email.attach_alternative(html_content, "text/html")
-            email.send(fail_silently=False)
+            # Supports HTML Content for email clients that accept html
+            queue_email(subject, text_content, to_email,
+                        from_email=from_email,
+                        html_body=html_content)
         return Response({'message': 'If the email is associated with an account, a reset link has been sent.'},
                         status=status.HTTP_200_OK)
 
@@ -213,14 +221,39 @@ class ResetPasswordView(APIView):
                             status=status.HTTP_400_BAD_REQUEST)
 
 
-class GetUserActivities(generics.ListAPIView):
-    """Returns user activities"""
+class GetUserActivities(ExportListMixin, generics.ListAPIView):
+    """
+    Returns user activities
+    With ?compact=true the user block is returned once alongside
+    the results instead of in every activity.
+    """
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = ActivitySerializer
-    queryset = Activity.objects.all()
+    queryset = Activity.objects.select_related('user')
     pagination_class = CustomCursorPagination
 
+    def is_compact(self):
+        # Exported lines are read on their own so they keep the user block
+        if self.is_export():
+            return False
+        return self.request.query_params.get('compact', '').lower() in ['true', '1']
+
     def get_queryset(self):
+        # Wait for the user's activities handed off to the background writer
+        activity_buffer.wait(user_id=self.request.user.id)
         queryset = super().get_queryset()
         return queryset.filter(user=self.request.user)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['compact'] = self.is_compact()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if self.is_compact():
+            # Every activity belongs to the requesting user
+            serializer = self.get_serializer()
+            response.data['user'] = serializer.get_user_block(request.user)
+        return response
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ClientOrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.client_orders'
+
+    def ready(self):
+        from . import signals
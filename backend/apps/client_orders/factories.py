@@ -8,6 +8,7 @@ from .models import (
     Location,
     AcquisitionSource,
     Client,
+    ClientSegment,
     OrderStatus,
     ClientOrder,
     ClientOrderedItem
@@ -112,3 +113,17 @@ class ClientOrderedItemFactory(factory.django.DjangoModelFactory):
         max_value=999.99,
         min_value=1,
     )
+
+
+class ClientSegmentFactory(factory.django.DjangoModelFactory):
+    """Client Segment Factory"""
+    class Meta:
+        model = ClientSegment
+
+    created_by = factory.SubFactory(UserFactory)
+    client = factory.SubFactory(ClientFactory)
+    frequency = factory.Faker("pyint", min_value=1, max_value=20)
+    recency_score = factory.Faker("pyint", min_value=1, max_value=5)
+    frequency_score = factory.Faker("pyint", min_value=1, max_value=5)
+    monetary_score = factory.Faker("pyint", min_value=1, max_value=5)
+    segment = "needs_attention"
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...models import User
+from ...utils import compute_client_segments
+
+
+class Command(BaseCommand):
+    """Computes the RFM segments of clients"""
+    help = (
+        "Computes the recency, frequency and monetary (RFM) scores and "
+        "segments of every client in a single set-based statement. "
+        "Meant to be scheduled (e.g. nightly with cron); segments are "
+        "replaced on every run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=str, default=None,
+                            help="Only compute the segments of the clients "
+                                 "of the user with this username")
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if not user:
+                raise CommandError(f"User '{options['user']}' does not exist.")
+
+        segments_count = compute_client_segments(user)
+        self.stdout.write(self.style.SUCCESS(
+            f"Computed {segments_count} client segments."
+        ))
@@ -0,0 +1,182 @@
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from utils.cache import invalidate_on_commit
+from utils.tokens import Token
+from ...models import Country, City
+
+
+class Command(BaseCommand):
+    """Loads countries and their cities from a local CSV or JSON dataset"""
+    help = (
+        "Loads countries and cities from a CSV file with 'country' and 'city' "
+        "columns, or a JSON file mapping each country to its list of cities "
+        "(a list of {'country': ..., 'city': ...} objects is also accepted). "
+        "Already existing countries and cities are skipped, so the command "
+        "can safely be rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str,
+                            help="Path to the CSV or JSON dataset file")
+        parser.add_argument('--format', choices=['csv', 'json'], default=None,
+                            help="Dataset format, inferred from the file "
+                                 "extension when omitted")
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help="Batch size used by the non-Postgres "
+                                 "bulk insert fallback")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f"File '{path}' does not exist.")
+
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if file_format not in ('csv', 'json'):
+            raise CommandError("Unsupported dataset format. Use a .csv or .json "
+                               "file or pass --format explicitly.")
+
+        if file_format == 'csv':
+            rows = self.read_csv(path)
+        else:
+            rows = self.read_json(path)
+
+        countries, cities = self.normalize_rows(rows)
+
+        countries_count = Country.objects.count()
+        cities_count = City.objects.count()
+
+        with transaction.atomic():
+            country_ids = self.load_countries(countries)
+            city_rows = [
+                (country_ids[country_name], city_name)
+                for country_name, city_name in cities
+            ]
+            if connection.vendor == 'postgresql':
+                self.copy_cities(city_rows)
+            else:
+                self.bulk_create_cities(city_rows, options['batch_size'])
+            invalidate_on_commit('locations')
+
+        new_countries = Country.objects.count() - countries_count
+        new_cities = City.objects.count() - cities_count
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {new_countries} new countries and {new_cities} new cities "
+            f"({len(countries)} countries and {len(cities)} cities in dataset)."
+        ))
+
+    def read_csv(self, path: Path) -> List[Tuple[str, str]]:
+        """Returns (country, city) rows from a CSV dataset"""
+        with path.open(newline='', encoding='utf-8-sig') as file:
+            reader = csv.DictReader(file)
+            fields = {field.lower(): field for field in reader.fieldnames or []}
+            if 'country' not in fields:
+                raise CommandError("CSV dataset must have a 'country' column.")
+            country_field = fields['country']
+            city_field = fields.get('city')
+            return [
+                (row[country_field], row[city_field] if city_field else None)
+                for row in reader
+            ]
+
+    def read_json(self, path: Path) -> List[Tuple[str, str]]:
+        """Returns (country, city) rows from a JSON dataset"""
+        with path.open(encoding='utf-8') as file:
+            try:
+                data = json.load(file)
+            except json.JSONDecodeError as err:
+                raise CommandError(f"Invalid JSON dataset: {err}")
+
+        rows = []
+        if isinstance(data, dict):
+            for country_name, city_names in data.items():
+                rows.append((country_name, None))
+                rows.extend((country_name, city_name)
+                            for city_name in city_names or [])
+        elif isinstance(data, list):
+            for entry in data:
+                if not isinstance(entry, dict) or 'country' not in entry:
+                    raise CommandError("Each JSON dataset entry must be an "
+                                       "object with a 'country' key.")
+                rows.append((entry['country'], entry.get('city')))
+        else:
+            raise CommandError("JSON dataset must be an object or a list.")
+        return rows
+
+    def normalize_rows(
+        self,
+        rows: List[Tuple[str, str]]
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Strips names and drops empty and duplicated entries while keeping
+        the dataset order.
+        """
+        countries = {}
+        cities = {}
+        for country_name, city_name in rows:
+            country_name = (country_name or '').strip()
+            city_name = (city_name or '').strip()
+            if not country_name:
+                continue
+            countries.setdefault(country_name, None)
+            if city_name:
+                cities.setdefault((country_name, city_name), None)
+        return list(countries), list(cities)
+
+    def load_countries(self, countries: List[str]) -> Dict[str, str]:
+        """Inserts missing countries and returns a name to id map"""
+        Country.objects.bulk_create(
+            [Country(name=name) for name in countries],
+            ignore_conflicts=True
+        )
+        return dict(
+            Country.objects
+            .filter(name__in=countries)
+            .values_list('name', 'id')
+        )
+
+    def copy_cities(self, city_rows: List[Tuple[str, str]]) -> None:
+        """
+        Streams cities into a temporary table with COPY and moves them
+        into the cities table in a single INSERT that skips existing ones.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for country_id, city_name in city_rows:
+            writer.writerow([Token.generate_uuid(), country_id, city_name])
+        buffer.seek(0)
+
+        city_table = connection.ops.quote_name(City._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMPORARY TABLE tmp_city_load "
+                "(id uuid, country_id uuid, name varchar(200))"
+            )
+            cursor.copy_expert(
+                "COPY tmp_city_load (id, country_id, name) FROM STDIN WITH CSV",
+                buffer
+            )
+            cursor.execute(
+                f"INSERT INTO {city_table} "
+                "(id, country_id, name, created_at, updated_at) "
+                "SELECT id, country_id, name, now(), now() FROM tmp_city_load "
+                "ON CONFLICT (name, country_id) DO NOTHING"
+            )
+            cursor.execute("DROP TABLE tmp_city_load")
+
+    def bulk_create_cities(
+        self,
+        city_rows: List[Tuple[str, str]],
+        batch_size: int
+    ) -> None:
+        """Inserts cities in batches, skipping already existing ones"""
+        City.objects.bulk_create(
+            [City(country_id=country_id, name=city_name)
+             for country_id, city_name in city_rows],
+            batch_size=batch_size,
+            ignore_conflicts=True
+        )
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.13 on 2026-10-19 09:17
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+LOCATION_REFERENCES = [
+    ('client_orders', 'Client', 'location'),
+    ('client_orders', 'ClientOrder', 'shipping_address'),
+    ('sales', 'Sale', 'shipping_address'),
+    ('supplier_orders', 'Supplier', 'location'),
+]
+
+
+def merge_duplicate_locations(apps, schema_editor):
+    """
+    Points every reference of a duplicated location to its oldest copy
+    and deletes the remaining copies before adding the unique constraint.
+    """
+    Location = apps.get_model('client_orders', 'Location')
+
+    canonical_ids = {}
+    duplicate_ids = {}
+    locations = (
+        Location.objects
+        .filter(country__isnull=False, city__isnull=False)
+        .order_by('created_at')
+        .values('id', 'added_by_id', 'country_id', 'city_id', 'street_address')
+    )
+    for location in locations:
+        key = (
+            location['added_by_id'],
+            location['country_id'],
+            location['city_id'],
+            location['street_address'] or '',
+        )
+        if key in canonical_ids:
+            duplicate_ids[location['id']] = canonical_ids[key]
+        else:
+            canonical_ids[key] = location['id']
+
+    if not duplicate_ids:
+        return
+
+    for app_label, model_name, field_name in LOCATION_REFERENCES:
+        model = apps.get_model(app_label, model_name)
+        for duplicate_id, canonical_id in duplicate_ids.items():
+            model.objects.filter(**{field_name: duplicate_id}).update(
+                **{field_name: canonical_id}
+            )
+
+    Location.objects.filter(id__in=list(duplicate_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0022_alter_clientorder_source'),
+        ('sales', '0006_remove_sale_from_order'),
+        ('supplier_orders', '0007_alter_supplierordereditem_item_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_locations,
+                             migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('added_by', models.Value('00000000-0000-0000-0000-000000000000', output_field=models.UUIDField())), models.F('country'), models.F('city'), django.db.models.functions.comparison.Coalesce('street_address', models.Value('')), name='unique_location_identity'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.13 on 2026-10-19 10:42
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.tokens
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('client_orders', '0024_clientorder_state_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientSegment',
+            fields=[
+                ('id', models.UUIDField(default=utils.tokens.Token.generate_uuid, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_order_at', models.DateTimeField(blank=True, null=True)),
+                ('frequency', models.PositiveIntegerField(default=0)),
+                ('monetary', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('recency_score', models.PositiveSmallIntegerField()),
+                ('frequency_score', models.PositiveSmallIntegerField()),
+                ('monetary_score', models.PositiveSmallIntegerField()),
+                ('segment', models.CharField(choices=[('champions', 'Champions'), ('loyal', 'Loyal'), ('new', 'New'), ('needs_attention', 'Needs Attention'), ('at_risk', 'At Risk'), ('lost', 'Lost')], max_length=20)),
+                ('client', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='segment', to='client_orders.client')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='client_segments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['created_by', 'segment'], name='client_segment_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.13 on 2026-10-19 14:02
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_unit_costs(apps, schema_editor):
+    """
+    Sets the unit cost of existing ordered items from their item's
+    current price, the closest cost known for past orders
+    """
+    Item = apps.get_model('inventory', 'Item')
+    ClientOrderedItem = apps.get_model('client_orders', 'ClientOrderedItem')
+    ClientOrderedItem.objects.update(unit_cost=Subquery(
+        Item.objects.filter(id=OuterRef('item_id')).values('price')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0023_alter_item_supplier'),
+        ('client_orders', '0025_clientsegment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientordereditem',
+            name='unit_cost',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=6, null=True),
+        ),
+        migrations.RunPython(populate_unit_costs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='clientordereditem',
+            name='unit_cost',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=6),
+        ),
+    ]
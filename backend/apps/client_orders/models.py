@@ -1,13 +1,17 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator
 from django.contrib.auth import get_user_model
 from shortuuid.django_fields import ShortUUIDField
 from decimal import Decimal
 from utils.models import BaseModel, get_default_order_status
+from utils.status import ORDER_STATE_CHOICES
 
 
 User = get_user_model()
 
+NIL_UUID = '00000000-0000-0000-0000-000000000000'
+
 
 class Country(BaseModel):
     """Country Model"""
@@ -42,6 +46,20 @@ class Location(BaseModel):
                              null=True, blank=True)
     street_address = models.CharField(max_length=200, blank=True, null=True)
 
+    class Meta(BaseModel.Meta):
+        constraints = [
+            # Null added_by and street_address values are coalesced so that
+            # identical locations always collide and can be upserted
+            models.UniqueConstraint(
+                Coalesce('added_by', models.Value(NIL_UUID,
+                                                  output_field=models.UUIDField())),
+                'country',
+                'city',
+                Coalesce('street_address', models.Value('')),
+                name='unique_location_identity'
+            )
+        ]
+
     def __str__(self) -> str:
         components = []
         if self.street_address:
@@ -104,12 +122,60 @@ class Client(BaseModel):
 
     @property
     def total_orders(self):
+        # Use the orders count annotated by the clients listing if any
+        if hasattr(self, 'orders_count'):
+            return self.orders_count
         return self.orders.all().count()
 
     def __str__(self) -> str:
         return self.name
 
 
+CLIENT_SEGMENT_CHOICES = [
+    ('champions', 'Champions'),
+    ('loyal', 'Loyal'),
+    ('new', 'New'),
+    ('needs_attention', 'Needs Attention'),
+    ('at_risk', 'At Risk'),
+    ('lost', 'Lost'),
+]
+
+
+class ClientSegment(BaseModel):
+    """
+    Client RFM Segment Model
+    Recency, frequency and monetary scores range from 1 to 5 and rank the
+    client among the other clients of the same user. Segments are computed
+    in batch by the compute_client_segments command.
+    """
+    client = models.OneToOneField(Client, on_delete=models.CASCADE,
+                                  related_name='segment')
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE,
+                                   related_name='client_segments',
+                                   null=True, blank=True)
+    last_order_at = models.DateTimeField(null=True, blank=True)
+    frequency = models.PositiveIntegerField(default=0)
+    monetary = models.DecimalField(max_digits=12, decimal_places=2,
+                                   default=Decimal('0.00'))
+    recency_score = models.PositiveSmallIntegerField()
+    frequency_score = models.PositiveSmallIntegerField()
+    monetary_score = models.PositiveSmallIntegerField()
+    segment = models.CharField(max_length=20, choices=CLIENT_SEGMENT_CHOICES)
+
+    @property
+    def rfm_score(self):
+        return f'{self.recency_score}{self.frequency_score}{self.monetary_score}'
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['created_by', 'segment'],
+                         name='client_segment_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.client.name}: {self.segment} ({self.rfm_score})'
+
+
 class OrderStatus(BaseModel):
     """Order Status Model"""
     name = models.CharField(max_length=50, unique=True)
@@ -142,6 +208,14 @@ class ClientOrder(BaseModel):
                                        related_name='client_payment_status',
                                        null=True, blank=True,
                                        default=get_default_order_status)
+    # Status codes kept in sync with delivery_status and payment_status
+    # so status filters don't need to join OrderStatus
+    delivery_state = models.PositiveSmallIntegerField(choices=ORDER_STATE_CHOICES,
+                                                      null=True, blank=True,
+                                                      editable=False)
+    payment_state = models.PositiveSmallIntegerField(choices=ORDER_STATE_CHOICES,
+                                                     null=True, blank=True,
+                                                     editable=False)
     tracking_number = models.CharField(max_length=50, null=True, blank=True,
                                        help_text="Tracking number for the shipment")
     shipping_address = models.ForeignKey(Location, on_delete=models.SET_NULL,
@@ -175,6 +249,13 @@ class ClientOrder(BaseModel):
     def linked_sale(self):
         return self.sale.id if self.sale else None
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['created_by', 'delivery_state',
+                                 'payment_state', 'created_at'],
+                         name='client_order_state_idx'),
+        ]
+
     def __str__(self) -> str:
         return self.reference_id
 
@@ -193,6 +274,10 @@ class ClientOrderedItem(BaseModel):
         decimal_places=2,
         validators=[MinValueValidator(Decimal('0.0'))]
     )
+    # Item's price at the time of order so profits don't change
+    # when the item is re-costed by later supplier receipts
+    unit_cost = models.DecimalField(max_digits=6, decimal_places=2,
+                                    editable=False)
 
     @property
     def total_price(self):
@@ -202,12 +287,17 @@ class ClientOrderedItem(BaseModel):
     def total_profit(self):
         return (
             (self.ordered_price * self.ordered_quantity) -
-            (self.ordered_quantity * self.item.price)
+            (self.ordered_quantity * self.unit_cost)
         )
 
     @property
     def unit_profit(self):
-        return (self.total_price / self.ordered_quantity) - self.item.price
+        return (self.total_price / self.ordered_quantity) - self.unit_cost
+
+    def save(self, *args, **kwargs):
+        if self.unit_cost is None and self.item_id:
+            self.unit_cost = self.item.price
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f'{self.order.client.name} ordered {self.ordered_quantity} of {self.item.name}'
@@ -13,6 +13,8 @@ from utils.serializers import (
     check_item_existence,
     validate_restricted_fields,
     validate_changes_for_delivered_parent_instance,
+    bulk_save_items_changes,
+    get_annotated_instance,
     decimal_to_float
 )
 from utils.status import (
@@ -20,6 +22,8 @@ from utils.status import (
     PAYMENT_STATUS_OPTIONS_LOWER
 )
 from utils.activity import register_activity
+from utils.locations import location_resolver, upsert_location
+from utils.status_registry import order_status_registry
 from .models import (
     Client,
     Country,
@@ -30,6 +34,7 @@ from .models import (
     OrderStatus,
     ClientOrder
 )
+from .utils import annotate_clients_stats
 from ..inventory.models import Item
 from ..base.models import User
 
@@ -60,61 +65,39 @@ class LocationSerializer(serializers.ModelSerializer):
     def validate_country(self, value):
         if value in [None, ""]:
             raise serializers.ValidationError("Country is required to add a location.")
-        else:
-            country = Country.objects.filter(name__iexact=value).exists()
-            if not country:
-                raise serializers.ValidationError("Invalid country.")
-            return value
+        return value
 
     def validate_city(self, value):
         if value in [None, ""]:
             raise serializers.ValidationError("City is required to add a location.")
-        else:
-            city = City.objects.filter(name__iexact=value).exists()
-            if not city:
-                raise serializers.ValidationError("Invalid city.")
-            return value
+        return value
 
     def validate(self, attrs):
         country_name = attrs.get('country', None)
         city_name = attrs.get('city', None)
         if country_name and city_name:
-            city = (
-                City.objects
-                .filter(
-                    name__iexact=city_name,
-                    country__name__iexact=country_name
-                ).first()
-            )
-            if not city:
-                raise serializers.ValidationError(
-                    {'city': 'City does not belong to the country provided.'}
-                )
+            if not location_resolver.resolve(country_name, city_name):
+                # Find out which part of the location is invalid
+                errors = {}
+                if not Country.objects.filter(name__iexact=country_name).exists():
+                    errors['country'] = 'Invalid country.'
+                if not City.objects.filter(name__iexact=city_name).exists():
+                    errors['city'] = 'Invalid city.'
+                if not errors:
+                    errors['city'] = 'City does not belong to the country provided.'
+                raise serializers.ValidationError(errors)
         return attrs
 
     def create(self, validated_data):
-        user = self.context.get('user')
-        if user:
-            validated_data['added_by'] = user
-
-        city_name = validated_data.pop('city', None)
-        country_name = validated_data.pop('country', None)
-        if country_name:
-            validated_data['country'] = Country.objects.get(
-                                        name__iexact=country_name)
-        if city_name:
-            validated_data['city'] = City.objects.get(
-                                     name__iexact=city_name)
-
-        # Define filter fields to determine which action to perform
-        filter_fields = ['added_by', 'country', 'city', 'street_address']
-        for field in filter_fields:
-            if field not in validated_data:
-                validated_data[field] = None
-
-        location, created = Location.objects.get_or_create(**validated_data)
-
-        return location
+        added_by = self.context.get('user') or validated_data.get('added_by')
+        country_id, city_id = location_resolver.resolve(
+            validated_data['country'],
+            validated_data['city']
+        )
+        return upsert_location(added_by,
+                               country_id,
+                               city_id,
+                               validated_data.get('street_address'))
 
     def to_representation(self, instance):
         location_repr = super().to_representation(instance)
@@ -230,10 +213,24 @@ class ClientSerializer(serializers.ModelSerializer):
         return client
 
     def to_representation(self, instance: Client):
-        client_repr = super().to_representation(instance)
+        # Orders stats, only queried if they weren't annotated
+        stats = get_annotated_instance(instance, annotate_clients_stats,
+                                       'lifetime_value')
+        client_repr = super().to_representation(stats)
         client_repr['created_by'] = instance.created_by.username
         client_repr['location'] = get_location(instance.location)
         client_repr['source'] = instance.source.name if instance.source else None
+        client_repr['lifetime_value'] = decimal_to_float(stats.lifetime_value)
+        client_repr['average_order_value'] = (
+            decimal_to_float(stats.average_order_value)
+            if stats.average_order_value is not None else None
+        )
+        client_repr['last_order_date'] = (
+            date_repr_format(stats.last_order_date)
+            if stats.last_order_date else None
+        )
+        segment = getattr(instance, 'segment', None)
+        client_repr['segment'] = segment.segment if segment else None
         client_repr['created_at'] = date_repr_format(instance.created_at)
         client_repr['updated_at'] = date_repr_format(instance.updated_at)
         return client_repr
@@ -263,17 +260,32 @@ class ClientOrderedItemSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # The order is already known when ordered items
+        # are validated as part of the order's update
+        if 'order' in self.context:
+            fields.pop('order')
+        return fields
+
     def validate_item(self, value):
-        # Get the request user from the context
-        user = get_user(self.context)
-        item = (
-            Item.objects
-            .filter(
-                created_by=user,
-                name__iexact=value,
-                in_inventory=True)
-            .first()
-        )
+        # Use the inventory items already loaded by the order's update
+        inventory_items = self.context.get('inventory_items', None)
+        if inventory_items is not None:
+            item = inventory_items.get(value.lower())
+            if item and not item.in_inventory:
+                item = None
+        else:
+            # Get the request user from the context
+            user = get_user(self.context)
+            item = (
+                Item.objects
+                .filter(
+                    created_by=user,
+                    name__iexact=value,
+                    in_inventory=True)
+                .first()
+            )
 
         if not item:
             raise serializers.ValidationError(
@@ -362,6 +374,9 @@ class ClientOrderedItemSerializer(serializers.ModelSerializer):
             item.quantity -= ordered_quantity
             item.save()
 
+            # Capture the new item's cost
+            validated_data['unit_cost'] = item.price
+
         # Case: Item instance remained the same
         else:
             item = item or instance.item
@@ -447,9 +462,14 @@ class ClientOrderSerializer(serializers.ModelSerializer):
         order: ClientOrder,
         ordered_items: List[dict]
     ) -> None:
+        # Create map of old/existing ordered items
+        existing_items = {
+            ordered_item.item.name.lower(): ordered_item
+            for ordered_item in order.ordered_items.select_related('item')
+        }
         # Filter inventory items by old and new ordered items
         names_query = Q()
-        items_names = [old_ordered_item.item.name for old_ordered_item in order.items]
+        items_names = list(existing_items)
         items_names.extend([new_ordered_item['item'] for new_ordered_item in ordered_items])
         for name in items_names:
             names_query |= Q(name__iexact=name)
@@ -458,9 +478,15 @@ class ClientOrderSerializer(serializers.ModelSerializer):
         inventory_items_map = {
             item.name.lower(): item for item in inventory_items
         }
-        # Create map of old/existing ordered items
-        existing_items = {
-            ordered_item.item.name.lower(): ordered_item for ordered_item in order.items
+
+        # Compute all the changes before applying them
+        changed_inventory_items = {}
+        items_to_update = []
+        items_to_create = []
+        item_context = {
+            'user': user,
+            'order': order,
+            'inventory_items': inventory_items_map
         }
 
         for new_item in ordered_items:
@@ -479,24 +505,51 @@ class ClientOrderSerializer(serializers.ModelSerializer):
                                                  "exceeds available stock."
                         }
                     })
-                else:
-                    inventory_item.quantity = item_new_quantity
-                    inventory_item.save()
-                    existing_item.ordered_quantity = new_item['ordered_quantity']
-                    existing_item.ordered_price = new_item['ordered_price']
-                    existing_item.save()        
+                inventory_item.quantity = item_new_quantity
+                changed_inventory_items[inventory_item.id] = inventory_item
+                existing_item.ordered_quantity = new_item['ordered_quantity']
+                existing_item.ordered_price = new_item['ordered_price']
+                items_to_update.append(existing_item)
             # Create new ordered item
             else:
-                self.create_ordered_items_for_client_order(user,
-                                                           order,
-                                                           [new_item])
+                serializer = ClientOrderedItemSerializer(data=new_item,
+                                                         context=item_context)
+                if not serializer.is_valid():
+                    raise serializers.ValidationError(serializer.errors)
+                validated_item = serializer.validated_data
+                inventory_item = validated_item.pop('item')
+
+                # Validate item's order delivery status
+                if not items_to_create:
+                    validate_changes_for_delivered_parent_instance(order)
+
+                #  Validate ordered quantity
+                if inventory_item.quantity < validated_item['ordered_quantity']:
+                    serializer.ordered_quantity_validation_error(inventory_item.name)
+
+                # Subtract the ordered quantity from item's inventory quantity
+                inventory_item.quantity -= validated_item['ordered_quantity']
+                changed_inventory_items[inventory_item.id] = inventory_item
+                items_to_create.append(ClientOrderedItem(order=order,
+                                                         item=inventory_item,
+                                                         unit_cost=inventory_item.price,
+                                                         created_by=user,
+                                                         **validated_item))
 
         # Delete remaining ordered items and update item's quantity in inventory
-        for item_to_delete in existing_items.values():
+        items_to_delete = list(existing_items.values())
+        for item_to_delete in items_to_delete:
             inventory_item = inventory_items_map.get(item_to_delete.item.name.lower())
             inventory_item.quantity += item_to_delete.ordered_quantity
-            inventory_item.save()
-            item_to_delete.delete()
+            changed_inventory_items[inventory_item.id] = inventory_item
+
+        bulk_save_items_changes(ClientOrderedItem,
+                                items_to_update,
+                                ['ordered_quantity', 'ordered_price'],
+                                items_to_create,
+                                items_to_delete,
+                                list(changed_inventory_items.values()),
+                                ['quantity'])
 
     def create_sale_from_order(self, order: ClientOrder) -> None:
         from ..sales.serializers import SaleSerializer
@@ -569,14 +622,14 @@ class ClientOrderSerializer(serializers.ModelSerializer):
         if value:
             if value.lower() not in DELIVERY_STATUS_OPTIONS_LOWER:
                 raise serializers.ValidationError("Invalid delivery status.")
-            return OrderStatus.objects.filter(name__iexact=value).first()
+            return order_status_registry.get(value)
         return None
 
     def validate_payment_status(self, value):
         if value:
             if value.lower() not in PAYMENT_STATUS_OPTIONS_LOWER:
                 raise serializers.ValidationError("Invalid payment status.")
-            return OrderStatus.objects.filter(name__iexact=value).first()
+            return order_status_registry.get(value)
         return None
 
     def validate(self, attrs):
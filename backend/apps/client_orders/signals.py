@@ -0,0 +1,69 @@
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
+from django.dispatch import receiver
+from utils.cache import invalidate_on_change
+from utils.locations import location_resolver
+from utils.status import ORDER_STATUS_CODES
+from utils.status_registry import order_status_registry
+from ..sales.models import Sale
+from ..supplier_orders.models import SupplierOrder
+from .models import (Country, City, Location, AcquisitionSource, Client,
+                     OrderStatus, ClientOrder, ClientOrderedItem)
+
+
+ORDER_MODELS = [ClientOrder, Sale, SupplierOrder]
+
+invalidate_on_change(Country, 'locations')
+invalidate_on_change(City, 'locations')
+invalidate_on_change(Location, 'locations', user_field='added_by_id')
+invalidate_on_change(AcquisitionSource, 'sources', user_field='added_by_id')
+invalidate_on_change(Client, 'clients', user_field='created_by_id')
+# Orders update the quantities of the ordered inventory items
+invalidate_on_change(ClientOrder, 'client_orders', 'items',
+                     user_field='created_by_id')
+invalidate_on_change(ClientOrderedItem, 'client_orders', 'items',
+                     user_field='created_by_id')
+# Renamed or deleted statuses change the state of every order
+invalidate_on_change(OrderStatus, 'order_statuses')
+
+
+@receiver([post_save, post_delete], sender=Country)
+@receiver([post_save, post_delete], sender=City)
+def clear_location_resolver(sender, **kwargs):
+    """Drops cached (country, city) pairs whenever countries or cities change"""
+    location_resolver.clear()
+
+
+@receiver([post_save, post_delete], sender=OrderStatus)
+def clear_order_status_registry(sender, **kwargs):
+    """Drops loaded order statuses whenever an order status changes"""
+    order_status_registry.clear()
+
+
+@receiver(pre_save, sender=ClientOrder)
+@receiver(pre_save, sender=Sale)
+@receiver(pre_save, sender=SupplierOrder)
+def sync_order_states(sender, instance, **kwargs):
+    """Sets the order's state codes from its delivery and payment statuses"""
+    instance.delivery_state = (
+        order_status_registry.get_code(instance.delivery_status_id))
+    instance.payment_state = (
+        order_status_registry.get_code(instance.payment_status_id))
+
+
+@receiver(post_save, sender=OrderStatus)
+def update_order_states(sender, instance, created, **kwargs):
+    """Updates the state codes of the orders using a renamed status"""
+    if created:
+        return
+    code = ORDER_STATUS_CODES.get(instance.name)
+    for model in ORDER_MODELS:
+        model.objects.filter(delivery_status=instance).update(delivery_state=code)
+        model.objects.filter(payment_status=instance).update(payment_state=code)
+
+
+@receiver(pre_delete, sender=OrderStatus)
+def clear_order_states(sender, instance, **kwargs):
+    """Clears the state codes of the orders using a deleted status"""
+    for model in ORDER_MODELS:
+        model.objects.filter(delivery_status=instance).update(delivery_state=None)
+        model.objects.filter(payment_status=instance).update(payment_state=None)
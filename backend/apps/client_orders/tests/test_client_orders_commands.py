@@ -0,0 +1,199 @@
+import pytest
+import json
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from apps.base.factories import UserFactory
+from apps.client_orders.models import Country, City, ClientOrder, ClientSegment
+from apps.client_orders.factories import (CountryFactory,
+                                          CityFactory,
+                                          ClientFactory,
+                                          ClientOrderFactory,
+                                          OrderStatusFactory)
+from apps.sales.factories import SaleFactory, SoldItemFactory
+
+
+@pytest.fixture
+def csv_dataset(tmp_path):
+    path = tmp_path / "locations.csv"
+    path.write_text(
+        "country,city\n"
+        "Morocco,Tetouan\n"
+        "Morocco,Rabat\n"
+        "Morocco,Rabat\n"
+        "Spain,Madrid\n"
+        " Spain , Sevilla \n"
+        "Portugal,\n",
+        encoding="utf-8"
+    )
+    return path
+
+@pytest.fixture
+def json_dataset(tmp_path):
+    path = tmp_path / "locations.json"
+    path.write_text(
+        json.dumps({
+            "Morocco": ["Tetouan", "Rabat"],
+            "Spain": ["Madrid"],
+            "Portugal": []
+        }),
+        encoding="utf-8"
+    )
+    return path
+
+
+@pytest.mark.django_db
+class TestLoadLocationsCommand:
+    """Tests for the load_locations management command"""
+
+    def test_load_locations_from_csv(self, csv_dataset):
+        out = StringIO()
+        call_command("load_locations", str(csv_dataset), stdout=out)
+
+        assert set(Country.objects.values_list("name", flat=True)) == {
+            "Morocco", "Spain", "Portugal"
+        }
+        assert set(
+            City.objects.values_list("country__name", "name")
+        ) == {
+            ("Morocco", "Tetouan"),
+            ("Morocco", "Rabat"),
+            ("Spain", "Madrid"),
+            ("Spain", "Sevilla"),
+        }
+        assert "3 new countries and 4 new cities" in out.getvalue()
+
+    def test_load_locations_from_json(self, json_dataset):
+        call_command("load_locations", str(json_dataset), stdout=StringIO())
+
+        assert Country.objects.count() == 3
+        assert City.objects.count() == 3
+        assert City.objects.filter(country__name="Morocco").count() == 2
+
+    def test_load_locations_is_idempotent(self, csv_dataset):
+        call_command("load_locations", str(csv_dataset), stdout=StringIO())
+
+        out = StringIO()
+        call_command("load_locations", str(csv_dataset), stdout=out)
+
+        assert Country.objects.count() == 3
+        assert City.objects.count() == 4
+        assert "0 new countries and 0 new cities" in out.getvalue()
+
+    def test_load_locations_keeps_existing_records(self, json_dataset):
+        morocco = CountryFactory.create(name="Morocco")
+        tetouan = CityFactory.create(country=morocco, name="Tetouan")
+
+        call_command("load_locations", str(json_dataset), stdout=StringIO())
+
+        assert str(Country.objects.get(name="Morocco").id) == str(morocco.id)
+        assert str(City.objects.get(name="Tetouan").id) == str(tetouan.id)
+        assert City.objects.count() == 3
+
+    def test_load_locations_fails_with_nonexistent_file(self, tmp_path):
+        with pytest.raises(CommandError, match="does not exist"):
+            call_command("load_locations", str(tmp_path / "missing.csv"))
+
+    def test_load_locations_fails_with_unsupported_format(self, tmp_path):
+        path = tmp_path / "locations.txt"
+        path.write_text("Morocco,Tetouan", encoding="utf-8")
+
+        with pytest.raises(CommandError, match="Unsupported dataset format"):
+            call_command("load_locations", str(path))
+
+
+@pytest.fixture
+def ranked_clients(user):
+    """
+    Five clients of the same user where each client orders more,
+    more recently and spends more than the previous one
+    """
+    delivered_status = OrderStatusFactory.create(name="Delivered")
+    paid_status = OrderStatusFactory.create(name="Paid")
+    clients = ClientFactory.create_batch(5, created_by=user)
+    now = timezone.now()
+    for rank, client in enumerate(clients, start=1):
+        orders = ClientOrderFactory.create_batch(rank,
+                                                 created_by=user,
+                                                 client=client)
+        ClientOrder.objects.filter(id__in=[order.id for order in orders]).update(
+            created_at=now - timedelta(days=10 - rank)
+        )
+        sale = SaleFactory.create(created_by=user,
+                                  client=client,
+                                  delivery_status=delivered_status,
+                                  payment_status=paid_status)
+        SoldItemFactory.create(sale=sale, sold_quantity=1, sold_price=rank * 100)
+    return clients
+
+
+@pytest.mark.django_db
+class TestComputeClientSegmentsCommand:
+    """Tests for the compute_client_segments management command"""
+
+    def test_compute_client_segments(self, user, ranked_clients):
+        inactive_client = ClientFactory.create(created_by=user)
+        out = StringIO()
+        call_command("compute_client_segments", stdout=out)
+
+        assert "Computed 5 client segments." in out.getvalue()
+        assert not ClientSegment.objects.filter(client=inactive_client).exists()
+
+        lowest = ClientSegment.objects.get(client=ranked_clients[0])
+        assert lowest.rfm_score == "111"
+        assert lowest.segment == "lost"
+        assert lowest.frequency == 2
+        assert float(lowest.monetary) == 100.0
+
+        highest = ClientSegment.objects.get(client=ranked_clients[-1])
+        assert highest.rfm_score == "555"
+        assert highest.segment == "champions"
+        assert highest.frequency == 6
+        assert float(highest.monetary) == 500.0
+        assert str(highest.created_by_id) == str(user.id)
+
+    def test_compute_client_segments_ranks_clients_per_user(self, ranked_clients):
+        other_user = UserFactory.create()
+        other_client = ClientFactory.create(created_by=other_user)
+        ClientOrderFactory.create(created_by=other_user, client=other_client)
+
+        call_command("compute_client_segments", stdout=StringIO())
+
+        # The only client of a user lands in the first quintile
+        segment = ClientSegment.objects.get(client=other_client)
+        assert segment.rfm_score == "111"
+        assert ClientSegment.objects.get(
+            client=ranked_clients[-1]).segment == "champions"
+
+    def test_compute_client_segments_replaces_previous_results(
+        self,
+        ranked_clients
+    ):
+        call_command("compute_client_segments", stdout=StringIO())
+        segment = ClientSegment.objects.get(client=ranked_clients[0])
+
+        # Removing a client's activity drops its segment on the next run
+        ClientOrder.objects.filter(client=ranked_clients[-1]).delete()
+        ranked_clients[-1].sales.all().delete()
+        call_command("compute_client_segments", stdout=StringIO())
+
+        assert ClientSegment.objects.count() == 4
+        assert not ClientSegment.objects.filter(client=ranked_clients[-1]).exists()
+        assert str(ClientSegment.objects.get(client=ranked_clients[0]).id) == str(segment.id)
+
+    def test_compute_client_segments_for_a_single_user(self, user, ranked_clients):
+        other_client = ClientFactory.create()
+        ClientOrderFactory.create(created_by=other_client.created_by,
+                                  client=other_client)
+
+        call_command("compute_client_segments", "--user", user.username,
+                     stdout=StringIO())
+
+        assert ClientSegment.objects.count() == 5
+        assert not ClientSegment.objects.filter(client=other_client).exists()
+
+    def test_compute_client_segments_fails_with_nonexistent_user(self):
+        with pytest.raises(CommandError, match="does not exist"):
+            call_command("compute_client_segments", "--user", "nobody")
@@ -18,6 +18,9 @@ from apps.client_orders.factories import (
     ClientOrderFactory,
     ClientOrderedItemFactory
 )
+from apps.client_orders.models import ClientOrder
+from utils.status import ORDER_STATUS_CODES
+from utils.status_registry import order_status_registry
 
 
 @pytest.mark.django_db
@@ -243,6 +246,68 @@ class TestOrderStatusModel:
         assert all(order.payment_status == pending_status for order in orders)
 
 
+@pytest.mark.django_db
+class TestOrderStatusRegistry:
+    """Tests for the in-memory Order Status registry"""
+
+    def test_registry_lookups_by_name_and_id(self, pending_status):
+        pending_id = str(pending_status.id)
+        assert str(order_status_registry.get("pending").id) == pending_id
+        assert str(order_status_registry.get(" Pending ").id) == pending_id
+        assert str(order_status_registry.get_by_id(pending_id).id) == pending_id
+        assert order_status_registry.get("Unknown") is None
+        assert [
+            str(status_id)
+            for status_id in order_status_registry.ids(["Pending", "Paid"])
+        ] == [pending_id]
+
+    def test_registry_loads_statuses_once(
+        self,
+        pending_status,
+        django_assert_num_queries
+    ):
+        order_status_registry.get("Pending")
+        with django_assert_num_queries(0):
+            order_status_registry.get("Pending")
+            order_status_registry.get_by_id(pending_status.id)
+            ClientOrder()
+
+    def test_registry_misses_reload_at_most_once_per_interval(
+        self,
+        pending_status,
+        monkeypatch,
+        django_assert_num_queries
+    ):
+        order_status_registry.get("Pending")
+        with django_assert_num_queries(0):
+            for _ in range(3):
+                assert order_status_registry.get("Unknown") is None
+
+        # Statuses created by other processes show up once the interval ends
+        OrderStatus.objects.bulk_create([OrderStatus(name="Shipped")])
+        assert order_status_registry.get("Shipped") is None
+        monkeypatch.setattr(order_status_registry, "reload_interval", 0)
+        with django_assert_num_queries(1):
+            assert order_status_registry.get("Shipped") is not None
+
+    def test_registry_reloads_on_status_changes(self, pending_status):
+        assert order_status_registry.get("Shipped") is None
+        shipped_status = OrderStatusFactory.create(name="Shipped")
+        assert (str(order_status_registry.get("Shipped").id)
+                == str(shipped_status.id))
+
+        pending_status.name = "Waiting"
+        pending_status.save()
+        assert order_status_registry.get("Pending") is None
+        assert (str(order_status_registry.get("Waiting").id)
+                == str(pending_status.id))
+
+    def test_default_order_status_uses_registry(self, pending_status):
+        order = ClientOrder()
+        assert str(order.delivery_status_id) == str(pending_status.id)
+        assert str(order.payment_status_id) == str(pending_status.id)
+
+
 @pytest.mark.django_db
 class TestClientOrderModel:
     """Tests for the Client Order Model"""
@@ -284,6 +349,45 @@ class TestClientOrderModel:
         )
         assert all(item.order == client_order for item in ordered_items)
 
+    def test_client_order_states_follow_statuses(
+        self,
+        client_order,
+        delivered_status
+    ):
+        assert client_order.delivery_state == ORDER_STATUS_CODES['Pending']
+        assert client_order.payment_state == ORDER_STATUS_CODES['Pending']
+
+        client_order.delivery_status = delivered_status
+        client_order.save()
+        client_order.refresh_from_db()
+
+        assert client_order.delivery_state == ORDER_STATUS_CODES['Delivered']
+        assert client_order.payment_state == ORDER_STATUS_CODES['Pending']
+
+    def test_client_order_states_follow_status_changes(
+        self,
+        client_order,
+        pending_status
+    ):
+        pending_status.name = "Shipped"
+        pending_status.save()
+        client_order.refresh_from_db()
+        assert client_order.delivery_state == ORDER_STATUS_CODES['Shipped']
+
+        pending_status.delete()
+        client_order.refresh_from_db()
+        assert client_order.delivery_status is None
+        assert client_order.delivery_state is None
+
+    def test_client_order_state_is_null_for_unknown_status(self):
+        custom_status = OrderStatusFactory.create(name="On Hold")
+        client_order = ClientOrderFactory.create(
+            delivery_status=custom_status,
+            payment_status=custom_status
+        )
+        assert client_order.delivery_state is None
+        assert client_order.payment_state is None
+
 
 @pytest.mark.django_db
 class TestClientOrderedItemModel:
@@ -320,6 +424,25 @@ class TestClientOrderedItemModel:
 
         assert str(ordered_item) == "Haitam ordered 4 of Projector"
 
+    def test_client_ordered_item_captures_item_cost(
+        self,
+        user,
+        client_order,
+        item
+    ):
+        ordered_item = ClientOrderedItemFactory.create(created_by=user,
+                                                       order=client_order,
+                                                       item=item,
+                                                       ordered_quantity=2)
+        assert ordered_item.unit_cost == item.price
+
+        # Re-costing the item does not change the ordered item's profit
+        total_profit = ordered_item.total_profit
+        item.price += 25
+        item.save()
+        ordered_item.refresh_from_db()
+        assert ordered_item.total_profit == total_profit
+
     def test_ordered_item_creation_fails_without_related_item(self):
         with pytest.raises(IntegrityError):
             ClientOrderedItemFactory.create(item=None)
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from unittest.mock import patch
 from rest_framework.exceptions import ValidationError
 from utils.serializers import (
@@ -35,6 +37,7 @@ from apps.client_orders.factories import (
     AcquisitionSourceFactory,
     ClientFactory,
     OrderStatusFactory,
+    ClientOrderFactory,
     ClientOrderedItemFactory
 )
 from utils.status import (
@@ -499,6 +502,64 @@ class TestLocationSerializer:
             default_datetime_str_format(location.updated_at)
         )
 
+    def test_location_create_retrieves_location_without_added_by_and_address(
+        self,
+        country,
+        city
+    ):
+        location_data = {"country": country.name, "city": city.name}
+
+        serializer_1 = LocationSerializer(data=location_data)
+        assert serializer_1.is_valid()
+        location_1 = serializer_1.save()
+
+        serializer_2 = LocationSerializer(data=location_data)
+        assert serializer_2.is_valid()
+        location_2 = serializer_2.save()
+
+        assert str(location_1.id) == str(location_2.id)
+        assert Location.objects.count() == 1
+
+    def test_location_resolution_is_cached_between_serializers(
+        self,
+        user,
+        location_data,
+        django_assert_num_queries
+    ):
+        serializer = LocationSerializer(
+            data=location_data,
+            context={'user': user}
+        )
+        assert serializer.is_valid()
+        location = serializer.save()
+
+        # Resolved country and city pairs are cached so the
+        # location is retrieved with a single upsert query
+        with django_assert_num_queries(1):
+            serializer = LocationSerializer(
+                data=location_data,
+                context={'user': user}
+            )
+            assert serializer.is_valid()
+            assert str(serializer.save().id) == str(location.id)
+
+    def test_location_resolution_cache_is_cleared_on_city_changes(
+        self,
+        country,
+        city,
+        location_data
+    ):
+        serializer = LocationSerializer(data=location_data)
+        assert serializer.is_valid()
+
+        # Rename the cached city
+        city.name = "Tangier"
+        city.save()
+
+        serializer = LocationSerializer(data=location_data)
+        assert not serializer.is_valid()
+        assert serializer.errors["city"] == ["Invalid city."]
+
 
 @pytest.mark.django_db
 class TestAcquisitionSourceSerializer:
@@ -2502,6 +2563,51 @@ class TestClientOrderSerializer:
         # the order's ordered items list
         assert str(ordered_item_2.item.id) not in updated_items_ids
 
+    def test_ordered_items_update_runs_a_constant_number_of_queries(
+        self,
+        user,
+        client
+    ):
+        queries_counts = []
+        for lines_count in [1, 4]:
+            order = ClientOrderFactory.create(created_by=user, client=client)
+            items = ItemFactory.create_batch(3 * lines_count,
+                                             created_by=user,
+                                             in_inventory=True,
+                                             quantity=10)
+            kept_items = items[:lines_count]
+            removed_items = items[lines_count:2 * lines_count]
+            added_items = items[2 * lines_count:]
+            for item in kept_items + removed_items:
+                ClientOrderedItemFactory.create(created_by=user,
+                                                order=order,
+                                                item=item,
+                                                ordered_quantity=2)
+
+            new_ordered_items = [
+                {"item": item.name, "ordered_quantity": 3, "ordered_price": 50}
+                for item in kept_items + added_items
+            ]
+            serializer = ClientOrderSerializer(context={"user": user})
+            with CaptureQueriesContext(connection) as queries:
+                serializer.update_ordered_items_for_client_order(
+                    user,
+                    order,
+                    new_ordered_items
+                )
+            queries_counts.append(len(queries))
+
+            assert order.ordered_items.count() == 2 * lines_count
+            assert not order.ordered_items.filter(item__in=removed_items).exists()
+            kept_item = Item.objects.get(id=kept_items[0].id)
+            removed_item = Item.objects.get(id=removed_items[0].id)
+            added_item = Item.objects.get(id=added_items[0].id)
+            assert kept_item.quantity == 9
+            assert removed_item.quantity == 12
+            assert added_item.quantity == 7
+
+        assert queries_counts[0] == queries_counts[1]
+
     def test_order_update_removes_optional_field_if_set_to_none(
         self,
         user,
@@ -15,7 +15,9 @@ from apps.client_orders.factories import (
     OrderStatusFactory,
     ClientOrderFactory,
     ClientOrderedItemFactory,
+    ClientSegmentFactory,
 )
+from apps.sales.factories import SaleFactory, SoldItemFactory
 from utils.serializers import (
     date_repr_format,
     default_datetime_str_format,
@@ -262,14 +264,106 @@ class TestCreateListClientsView:
         res = api_client.get(create_list_clients_url)
         assert res.status_code == 200
 
-        assert isinstance(res.data, list)
-        assert len(res.data) == 10
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == 10
 
         # Verify that all clients belong to the authenticated user
         assert all(client["created_by"] == str(user.username)
-                   for client in res.data)
+                   for client in res.data["results"])
         assert all(client["id"] in [str(client.id) for client in user_clients]
-                   for client in res.data)
+                   for client in res.data["results"])
+
+    def test_list_clients_with_orders_stats(
+        self,
+        user,
+        auth_client,
+        create_list_clients_url,
+        delivered_status
+    ):
+        paid_status = OrderStatusFactory.create(name="Paid")
+        top_client = ClientFactory.create(created_by=user)
+        other_client = ClientFactory.create(created_by=user)
+        ClientFactory.create(created_by=user)
+
+        ClientOrderFactory.create_batch(3, created_by=user, client=top_client)
+        ClientOrderFactory.create(created_by=user, client=other_client)
+
+        # Completed sales count towards the client's lifetime value
+        for client, prices in [(top_client, [100, 300]), (other_client, [50])]:
+            for price in prices:
+                sale = SaleFactory.create(created_by=user,
+                                          client=client,
+                                          delivery_status=delivered_status,
+                                          payment_status=paid_status)
+                SoldItemFactory.create(sale=sale, sold_quantity=2, sold_price=price)
+        # Sales that are not completed are excluded
+        pending_sale = SaleFactory.create(created_by=user, client=other_client)
+        SoldItemFactory.create(sale=pending_sale, sold_quantity=1, sold_price=999)
+
+        res = auth_client.get(create_list_clients_url,
+                              {"ordering": "-lifetime_value"})
+        assert res.status_code == 200
+        assert len(res.data["results"]) == 3
+
+        top_client_data, other_client_data, new_client_data = res.data["results"]
+        assert top_client_data["id"] == str(top_client.id)
+        assert top_client_data["total_orders"] == 3
+        assert top_client_data["lifetime_value"] == 800.0
+        assert top_client_data["average_order_value"] == 400.0
+        assert top_client_data["last_order_date"] is not None
+
+        assert other_client_data["id"] == str(other_client.id)
+        assert other_client_data["total_orders"] == 1
+        assert other_client_data["lifetime_value"] == 100.0
+
+        assert new_client_data["total_orders"] == 0
+        assert new_client_data["lifetime_value"] == 0.0
+        assert new_client_data["average_order_value"] is None
+        assert new_client_data["last_order_date"] is None
+
+        res = auth_client.get(create_list_clients_url,
+                              {"ordering": "lifetime_value"})
+        assert res.data["results"][0]["id"] == new_client_data["id"]
+
+    def test_list_clients_filtered_by_segment(
+        self,
+        user,
+        auth_client,
+        create_list_clients_url
+    ):
+        clients = ClientFactory.create_batch(3, created_by=user)
+        for client, segment in zip(clients, ["champions", "lost"]):
+            ClientSegmentFactory.create(client=client,
+                                        created_by=user,
+                                        segment=segment)
+
+        res = auth_client.get(create_list_clients_url, {"segment": "champions"})
+        assert res.status_code == 200
+        assert len(res.data["results"]) == 1
+        assert res.data["results"][0]["id"] == str(clients[0].id)
+        assert res.data["results"][0]["segment"] == "champions"
+
+        res = auth_client.get(create_list_clients_url)
+        assert len(res.data["results"]) == 3
+        assert {client["segment"] for client in res.data["results"]} == {
+            "champions", "lost", None
+        }
+
+    def test_list_clients_runs_a_constant_number_of_queries(
+        self,
+        user,
+        auth_client,
+        create_list_clients_url,
+        django_assert_max_num_queries
+    ):
+        ClientFactory.create_batch(10, created_by=user)
+        for client in Client.objects.filter(created_by=user)[:5]:
+            ClientOrderFactory.create(created_by=user, client=client)
+
+        with django_assert_max_num_queries(2):
+            res = auth_client.get(create_list_clients_url)
+        assert res.status_code == 200
+        assert len(res.data["results"]) == 10
 
 
 @pytest.mark.django_db
@@ -909,17 +1003,17 @@ class TestCreateListClientOrdersView:
         res = api_client.get(create_list_orders_url)
         assert res.status_code == 200
 
-        assert isinstance(res.data, list)
-        assert len(res.data) == 6
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == 6
 
         # Verify that all orders belong to the authenticated user
         assert all(order["created_by"] == str(user.username)
-                   for order in res.data)
+                   for order in res.data["results"])
     
         user_orders_ids = {str(order.id) for order in user_orders}
         assert all(
             order["id"] in user_orders_ids
-            for order in res.data
+            for order in res.data["results"]
         )
 
 
@@ -1827,20 +1921,20 @@ class TestCreateListClientOrderedItemsView:
         res = api_client.get(url)
         assert res.status_code == 200
 
-        assert isinstance(res.data, list)
-        assert len(res.data) == len(user_items)
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == len(user_items)
 
         # Verify that all ordered items belong to the correct order and user
         assert all(
             str(item["order"]) == str(client_order.id)
             and item["created_by"] == user.username
-            for item in res.data
+            for item in res.data["results"]
         )
 
         user_item_ids = {str(item.id) for item in user_items}
         assert all(
             str(item["id"]) in user_item_ids
-            for item in res.data
+            for item in res.data["results"]
         )
 
 
@@ -2610,10 +2704,10 @@ class TestBulkCreateListCitiesView:
         res = auth_client.get(bulk_create_list_cities_url)
 
         assert res.status_code == 200
-        assert isinstance(res.data, list)
-        assert len(res.data) == len(cities)
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == len(cities)
 
-        for city in res.data:
+        for city in res.data["results"]:
             assert "id" in city
             assert "name" in city
             assert "country" in city
@@ -2630,7 +2724,7 @@ class TestBulkCreateListCitiesView:
         res = auth_client.get(bulk_create_list_cities_url)
 
         assert res.status_code == 200
-        res_data = res.json()
+        res_data = res.json()["results"]
 
         assert isinstance(res_data, list)
         assert len(res_data) == len(cities)
@@ -2654,7 +2748,7 @@ class TestBulkCreateListCitiesView:
         res = auth_client.get(bulk_create_list_cities_url)
 
         assert res.status_code == 200
-        res_data = res.json()
+        res_data = res.json()["results"]
 
         assert isinstance(res_data, list)
         assert len(res_data) == 2
@@ -1,10 +1,26 @@
-from django.db.models import F
+from django.db.models import (F, Q, Count, Max, Sum, OuterRef, Subquery,
+                              Value, DecimalField, ExpressionWrapper, QuerySet)
+from django.db.models.functions import Coalesce, NullIf
+from django.db import connection, transaction
+from django.utils import timezone
 from rest_framework.exceptions import NotFound
-from typing import List
+from typing import List, Union
 from uuid import UUID
-from .models import ClientOrder, ClientOrderedItem
+from utils.status import ORDER_STATUS_CODES
+from .models import Client, ClientOrder, ClientOrderedItem, ClientSegment
 from ..base.models import User
 from ..inventory.models import Item
+from ..sales.models import Sale, SoldItem
+
+
+CLIENT_ORDERING_FIELDS = {
+    'name': 'name',
+    'created_at': 'created_at',
+    'total_orders': 'orders_count',
+    'lifetime_value': 'lifetime_value',
+    'last_order_date': 'last_order_date',
+    'average_order_value': 'average_order_value',
+}
 
 
 def validate_client_order(order_id: UUID, user: User):
@@ -18,3 +34,152 @@ def reset_client_ordered_items(ordered_items: List[ClientOrderedItem]):
         Item.objects.filter(id=ordered_item.item.id).update(
             quantity=F('quantity') + ordered_item.ordered_quantity
         )
+
+def annotate_clients_stats(queryset: QuerySet[Client]) -> QuerySet[Client]:
+    """
+    Annotates clients with their orders count, last order date,
+    lifetime value and average order value in a single grouped query.
+    The lifetime value is the revenue of the client's completed sales.
+    """
+    completed_sales = Q(delivery_state=ORDER_STATUS_CODES['Delivered'],
+                        payment_state=ORDER_STATUS_CODES['Paid'])
+    money_field = DecimalField(max_digits=12, decimal_places=2)
+
+    lifetime_value = (
+        SoldItem.objects
+        .filter(sale__client=OuterRef('pk'),
+                sale__delivery_state=ORDER_STATUS_CODES['Delivered'],
+                sale__payment_state=ORDER_STATUS_CODES['Paid'])
+        .values('sale__client')
+        .annotate(total=Sum(F('sold_quantity') * F('sold_price'),
+                            output_field=money_field))
+        .values('total')
+    )
+    completed_sales_count = (
+        Sale.objects
+        .filter(completed_sales, client=OuterRef('pk'))
+        .values('client')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+
+    return (
+        queryset
+        .annotate(
+            orders_count=Count('orders', distinct=True),
+            last_order_date=Max('orders__created_at'),
+            lifetime_value=Coalesce(Subquery(lifetime_value),
+                                    Value(0, output_field=money_field)),
+            completed_sales_count=Coalesce(Subquery(completed_sales_count),
+                                           Value(0)),
+        )
+        .annotate(
+            average_order_value=ExpressionWrapper(
+                F('lifetime_value') /
+                NullIf(F('completed_sales_count'), Value(0)),
+                output_field=money_field
+            )
+        )
+    )
+
+
+def compute_client_segments(user: Union[User, None] = None) -> int:
+    """
+    Computes the RFM segments of every client, or only the clients of the
+    given user, in a single set-based statement and returns their count.
+    Clients are ranked into quintiles among the clients of the same user
+    with NTILE: the most recent, frequent and valuable ones score 5.
+    Recency and frequency count client orders and sales not created from
+    an order, while the monetary value is the revenue of completed sales.
+    Clients without any order or sale are left unsegmented.
+    """
+    quote = connection.ops.quote_name
+    client_table = quote(Client._meta.db_table)
+    order_table = quote(ClientOrder._meta.db_table)
+    sale_table = quote(Sale._meta.db_table)
+    sold_item_table = quote(SoldItem._meta.db_table)
+    segment_table = quote(ClientSegment._meta.db_table)
+
+    user_filter = "c.created_by_id = %(user_id)s" if user else "TRUE"
+    sql = (
+        "WITH activity AS ("
+        f"  SELECT o.client_id, o.created_at FROM {order_table} o"
+        "   WHERE o.client_id IS NOT NULL"
+        "  UNION ALL"
+        f"  SELECT s.client_id, s.created_at FROM {sale_table} s"
+        "   WHERE s.client_id IS NOT NULL"
+        f"  AND NOT EXISTS (SELECT 1 FROM {order_table} o WHERE o.sale_id = s.id)"
+        "), revenue AS ("
+        "  SELECT s.client_id,"
+        "         SUM(i.sold_quantity * i.sold_price) AS monetary"
+        f"  FROM {sale_table} s JOIN {sold_item_table} i ON i.sale_id = s.id"
+        "   WHERE s.client_id IS NOT NULL"
+        "   AND s.delivery_state = %(delivered)s AND s.payment_state = %(paid)s"
+        "   GROUP BY s.client_id"
+        "), rfm AS ("
+        "  SELECT c.id AS client_id, c.created_by_id,"
+        "         MAX(a.created_at) AS last_order_at,"
+        "         COUNT(*) AS frequency,"
+        "         COALESCE(MAX(r.monetary), 0) AS monetary"
+        f"  FROM {client_table} c"
+        "   JOIN activity a ON a.client_id = c.id"
+        "   LEFT JOIN revenue r ON r.client_id = c.id"
+        f"  WHERE {user_filter}"
+        "   GROUP BY c.id, c.created_by_id"
+        "), scored AS ("
+        "  SELECT rfm.*,"
+        "         NTILE(5) OVER (PARTITION BY created_by_id"
+        "                        ORDER BY last_order_at, client_id) AS recency_score,"
+        "         NTILE(5) OVER (PARTITION BY created_by_id"
+        "                        ORDER BY frequency, client_id) AS frequency_score,"
+        "         NTILE(5) OVER (PARTITION BY created_by_id"
+        "                        ORDER BY monetary, client_id) AS monetary_score"
+        "  FROM rfm"
+        ") "
+        f"INSERT INTO {segment_table} "
+        "(id, created_at, updated_at, client_id, created_by_id, last_order_at, "
+        "frequency, monetary, recency_score, frequency_score, monetary_score, "
+        "segment) "
+        "SELECT gen_random_uuid(), %(now)s, %(now)s, client_id, created_by_id, "
+        "last_order_at, frequency, monetary, recency_score, frequency_score, "
+        "monetary_score, "
+        "CASE"
+        " WHEN recency_score >= 4 AND frequency_score >= 4"
+        "  AND monetary_score >= 4 THEN 'champions'"
+        " WHEN recency_score >= 3 AND frequency_score >= 4 THEN 'loyal'"
+        " WHEN recency_score >= 4 AND frequency_score <= 2 THEN 'new'"
+        " WHEN recency_score <= 2 AND frequency_score >= 3 THEN 'at_risk'"
+        " WHEN recency_score <= 2 THEN 'lost'"
+        " ELSE 'needs_attention' "
+        "END "
+        "FROM scored "
+        "ON CONFLICT (client_id) DO UPDATE SET "
+        "updated_at = EXCLUDED.updated_at, "
+        "created_by_id = EXCLUDED.created_by_id, "
+        "last_order_at = EXCLUDED.last_order_at, "
+        "frequency = EXCLUDED.frequency, "
+        "monetary = EXCLUDED.monetary, "
+        "recency_score = EXCLUDED.recency_score, "
+        "frequency_score = EXCLUDED.frequency_score, "
+        "monetary_score = EXCLUDED.monetary_score, "
+        "segment = EXCLUDED.segment"
+    )
+    params = {
+        'user_id': user.id if user else None,
+        'delivered': ORDER_STATUS_CODES['Delivered'],
+        'paid': ORDER_STATUS_CODES['Paid'],
+        'now': timezone.now(),
+    }
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        segments_count = cursor.rowcount
+        # Drop the segments of clients that no longer have any activity
+        stale_segments = ClientSegment.objects.filter(
+            updated_at__lt=params['now']
+        )
+        if user:
+            stale_segments = stale_segments.filter(client__created_by=user)
+        stale_segments.delete()
+
+    return segments_count
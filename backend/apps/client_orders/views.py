@@ -6,17 +6,21 @@ from django.db.models import Q, CharField
 from django.db.models.functions import Cast
 from utils.tokens import Token
 from utils.views import (CreatedByUserMixin,
+                         ExportListMixin,
+                         apply_ordering,
                          validate_linked_items_for_deletion,
                          validate_deletion_for_delivered_parent_instance)
 from utils.status import (DELIVERY_STATUS_OPTIONS,
                           PAYMENT_STATUS_OPTIONS,
-                          COMPLETED_STATUS,
-                          ACTIVE_DELIVERY_STATUS,
-                          FAILED_STATUS)
+                          get_status_summary)
 from utils.activity import register_activity
+from utils.cache import cache_view, invalidate_on_commit
 from ..base.auth import TokenVersionAuthentication
 from ..inventory.models import Item
-from .utils import validate_client_order, reset_client_ordered_items
+from .utils import (validate_client_order,
+                    reset_client_ordered_items,
+                    annotate_clients_stats,
+                    CLIENT_ORDERING_FIELDS)
 from . import serializers
 from .models import (Client,
                      ClientOrder,
@@ -26,13 +30,28 @@ from .models import (Client,
                      AcquisitionSource)
 
 
-class CreateListClients(CreatedByUserMixin,
+class CreateListClients(CreatedByUserMixin, ExportListMixin,
                        generics.ListCreateAPIView):
     """Handles Client Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.ClientSerializer
-    queryset = Client.objects.all()
+    queryset = Client.objects.select_related('created_by',
+                                             'location__added_by',
+                                             'location__country',
+                                             'location__city__country',
+                                             'source__added_by',
+                                             'segment')
+
+    def get_queryset(self):
+        queryset = annotate_clients_stats(super().get_queryset())
+        # Filter clients by their RFM segment, e.g. ?segment=champions
+        segment = self.request.GET.get('segment', None)
+        if segment:
+            queryset = queryset.filter(segment__segment=segment)
+        # Sort clients by the given field, e.g. ?ordering=-lifetime_value
+        return apply_ordering(queryset, self.request,
+                              CLIENT_ORDERING_FIELDS, '-created_at')
 
 
 class GetUpdateDeleteClients(CreatedByUserMixin,
@@ -41,7 +60,12 @@ class GetUpdateDeleteClients(CreatedByUserMixin,
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.ClientSerializer
-    queryset = Client.objects.all()
+    queryset = Client.objects.select_related('created_by',
+                                             'location__added_by',
+                                             'location__country',
+                                             'location__city__country',
+                                             'source__added_by',
+                                             'segment')
     lookup_field = 'id'
 
     def delete(self, request, *args, **kwargs):
@@ -156,7 +180,7 @@ class BulkDeleteClients(CreatedByUserMixin, generics.DestroyAPIView):
                          status=status.HTTP_200_OK)
 
 
-class CreateListClientOrders(CreatedByUserMixin,
+class CreateListClientOrders(CreatedByUserMixin, ExportListMixin,
                             generics.ListCreateAPIView):
     """Handles Client Order Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
@@ -255,7 +279,7 @@ class BulkDeleteClientOrders(CreatedByUserMixin, generics.DestroyAPIView):
                          status=status.HTTP_200_OK)
 
 
-class CreateListClientOrderedItems(CreatedByUserMixin,
+class CreateListClientOrderedItems(CreatedByUserMixin, ExportListMixin,
                                   generics.ListCreateAPIView):
     """Handles Client Ordered Item Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
@@ -359,7 +383,7 @@ class BulkDeleteClientOrderedItems(CreatedByUserMixin, generics.DestroyAPIView):
                          status=status.HTTP_200_OK)
 
 
-class BulkCreateListCities(generics.ListCreateAPIView):
+class BulkCreateListCities(ExportListMixin, generics.ListCreateAPIView):
     """Handles Location Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
@@ -371,7 +395,8 @@ class BulkCreateListCities(generics.ListCreateAPIView):
         cities = [City(**item) for item in city_data]
         # Perform a single SQL query to insert multiple records
         # instead of inserting each instance individually
-        City.objects.bulk_create(cities) 
+        City.objects.bulk_create(cities)
+        invalidate_on_commit('locations')
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, many=True)
@@ -385,14 +410,18 @@ class GetClientOrdersData(generics.GenericAPIView):
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
 
+    @cache_view('clients', 'client_orders', 'locations', 'sources',
+                'order_statuses')
     def get(self, request, *args, **kwargs):
         user = request.user
        
         # Clients
         clients = list(Client.objects.filter(created_by=user).values_list('name', flat=True))
        
-        # Orders Count
-        orders_count = ClientOrder.objects.filter(created_by=user).count()
+        # Orders count by status
+        orders_summary = get_status_summary(
+            ClientOrder.objects.filter(created_by=user)
+        )
        
         # Countries and Cities
         countries = []
@@ -409,42 +438,15 @@ class GetClientOrdersData(generics.GenericAPIView):
             .values_list('name', flat=True)
         )
 
-        # Completed orders
-        completed_orders = (
-            ClientOrder.objects
-            .filter(
-                created_by=user,
-                delivery_status__name__in=COMPLETED_STATUS)
-            .count()
-        )
-
-        # Active Orders
-        active_orders = (
-            ClientOrder.objects
-            .filter(
-                created_by=user,
-                delivery_status__name__in=ACTIVE_DELIVERY_STATUS)
-            .count()
-        )
-
-        # Failed Orders
-        failed_orders = (
-            ClientOrder.objects
-            .filter(
-                created_by=user,
-                delivery_status__name__in=FAILED_STATUS)
-            .count()
-        )
-
         # Orders Status
         orders_status = {'delivery_status': DELIVERY_STATUS_OPTIONS,
                          'payment_status': PAYMENT_STATUS_OPTIONS,
-                         'active': active_orders,
-                         'completed': completed_orders,
-                         'failed': failed_orders}
+                         'active': orders_summary['active'],
+                         'completed': orders_summary['completed'],
+                         'failed': orders_summary['failed']}
 
         return Response({'clients': {'count': len(clients), 'names': clients},
-                         'orders_count': orders_count,
+                         'orders_count': orders_summary['total'],
                          'countries': countries,
                          'acq_sources': acq_sources,
                          'order_status': orders_status},
@@ -0,0 +1,206 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from datetime import date, timedelta
+from typing import Dict, Tuple, Union
+import numpy as np
+from utils.status import get_status_codes
+from ..base.models import User
+from ..sales.models import SoldItem
+from .models import Item, ItemForecast
+
+
+# Sales that did not end up being delivered are not part of the demand
+UNFULFILLED_SALE_STATUS = ['Canceled', 'Failed', 'Returned']
+
+# Weekly seasonality of the daily sales
+SEASON_DAYS = 7
+
+
+# Forecast parameters counted in days, which must be at least 1
+FORECAST_DAYS_PARAMS = ['history_days', 'horizon_days', 'moving_average_days']
+
+
+def get_forecast_settings(**overrides) -> dict:
+    """
+    Returns the forecast parameters, falling back to the settings.
+    Raises ValueError if a number of days is not a positive integer.
+    """
+    params = {
+        'history_days': getattr(settings, 'FORECAST_HISTORY_DAYS', 90),
+        'horizon_days': getattr(settings, 'FORECAST_HORIZON_DAYS', 30),
+        'moving_average_days': getattr(settings, 'FORECAST_MOVING_AVERAGE_DAYS', 28),
+        'smoothing': getattr(settings, 'FORECAST_SMOOTHING', (0.3, 0.05, 0.2)),
+    }
+    params.update({key: value for key, value in overrides.items()
+                   if value is not None})
+    for param in FORECAST_DAYS_PARAMS:
+        value = params[param]
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"'{param}' must be a positive integer.")
+    return params
+
+
+def daily_sales_matrix(
+    sold_items: QuerySet[SoldItem],
+    item_rows: Dict[str, int],
+    start_date: date,
+    days: int
+) -> np.ndarray:
+    """
+    Returns an items by days matrix of the quantities sold from start_date.
+    The quantities are summed per item and day by a single grouped query,
+    rows follow item_rows and sold items of other items are ignored.
+    """
+    daily_sales = (
+        sold_items
+        .filter(sale__created_at__date__gte=start_date)
+        .annotate(day=TruncDate('sale__created_at'))
+        .values('item_id', 'day')
+        .annotate(quantity=Sum('sold_quantity'))
+        .values_list('item_id', 'day', 'quantity')
+    )
+    sold = np.zeros((len(item_rows), days))
+    rows, columns, quantities = [], [], []
+    for item_id, day, quantity in daily_sales:
+        row = item_rows.get(str(item_id))
+        column = (day - start_date).days
+        if row is not None and column < days:
+            rows.append(row)
+            columns.append(column)
+            quantities.append(quantity)
+    np.add.at(sold, (np.array(rows, dtype=int), np.array(columns, dtype=int)),
+              np.array(quantities, dtype=float))
+    return sold
+
+
+def moving_average_forecast(sold: np.ndarray, window: int) -> np.ndarray:
+    """Returns every item's average daily quantity over the last window days"""
+    return sold[:, -window:].mean(axis=1)
+
+
+def holt_winters_forecast(
+    sold: np.ndarray,
+    horizon: int,
+    alpha: float,
+    beta: float,
+    gamma: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fits additive Holt-Winters exponential smoothing with a weekly season
+    to every row of sold at once and returns the items by horizon matrix
+    of forecasts with the mean absolute one day ahead error of each item.
+    Only the days are iterated, every step updates all the items together.
+    Histories shorter than two seasons are smoothed without seasonality.
+    """
+    items_count, days = sold.shape
+    season = SEASON_DAYS if days >= 2 * SEASON_DAYS else 1
+
+    level = sold[:, :season].mean(axis=1)
+    trend = ((sold[:, season:2 * season].mean(axis=1) - level) / season
+             if days >= 2 * season else np.zeros(items_count))
+    seasonal = (sold[:, :season] - level[:, None]
+                if season > 1 else np.zeros((items_count, 1)))
+
+    errors = np.zeros(items_count)
+    for day in range(season, days):
+        observed = sold[:, day]
+        day_seasonal = seasonal[:, day % season]
+        errors += np.abs(observed - (level + trend + day_seasonal))
+        new_level = (alpha * (observed - day_seasonal) +
+                     (1 - alpha) * (level + trend))
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        if season > 1:
+            seasonal[:, day % season] = (gamma * (observed - new_level) +
+                                         (1 - gamma) * day_seasonal)
+        level = new_level
+
+    steps = np.arange(1, horizon + 1)
+    forecast = (level[:, None] + trend[:, None] * steps +
+                seasonal[:, (days - 1 + steps) % season])
+    mean_absolute_error = errors / max(days - season, 1)
+    return forecast.clip(min=0), mean_absolute_error
+
+
+@transaction.atomic
+def forecast_demand(
+    user: Union[User, None] = None,
+    history_days: Union[int, None] = None,
+    horizon_days: Union[int, None] = None
+) -> int:
+    """
+    Forecasts the daily demand of every inventory item, or only the items
+    of the given user, over the next horizon days and returns their count.
+    Daily sales over the history are loaded into an items by days matrix
+    that NumPy smooths for all the items at once, and the forecasts are
+    upserted with one statement per batch. Forecasts of items that left
+    the inventory are deleted.
+    """
+    params = get_forecast_settings(history_days=history_days,
+                                   horizon_days=horizon_days)
+    now = timezone.now()
+    today = now.date()
+    start_date = today - timedelta(days=params['history_days'] - 1)
+
+    items = Item.objects.filter(in_inventory=True).order_by('id')
+    sold_items = (
+        SoldItem.objects
+        .filter(item__in_inventory=True)
+        .exclude(sale__delivery_state__in=get_status_codes(UNFULFILLED_SALE_STATUS))
+    )
+    forecasts = ItemForecast.objects.all()
+    if user:
+        items = items.filter(created_by=user)
+        sold_items = sold_items.filter(item__created_by=user)
+        forecasts = forecasts.filter(created_by=user)
+
+    item_owners = list(items.values_list('id', 'created_by_id'))
+    item_rows = {str(item_id): row for row, (item_id, _) in enumerate(item_owners)}
+    sold = daily_sales_matrix(sold_items, item_rows,
+                              start_date, params['history_days'])
+
+    daily_forecast, mean_absolute_error = holt_winters_forecast(
+        sold, params['horizon_days'], *params['smoothing']
+    )
+    daily_forecast = daily_forecast.round(2)
+    totals = daily_forecast.sum(axis=1).round(2)
+    moving_averages = moving_average_forecast(
+        sold, params['moving_average_days']
+    ).round(2)
+    mean_absolute_error = mean_absolute_error.round(2)
+
+    item_forecasts = []
+    for row, (item_id, created_by_id) in enumerate(item_owners):
+        forecast = ItemForecast(
+            item_id=item_id,
+            created_by_id=created_by_id,
+            start_date=today + timedelta(days=1),
+            history_days=params['history_days'],
+            daily_quantities=daily_forecast[row].tolist(),
+            total_quantity=float(totals[row]),
+            moving_average=float(moving_averages[row]),
+            mean_absolute_error=float(mean_absolute_error[row]),
+        )
+        forecast.created_at = forecast.updated_at = now
+        item_forecasts.append(forecast)
+
+    ItemForecast.objects.bulk_create(
+        item_forecasts,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['item'],
+        update_fields=[
+            'updated_at',
+            'created_by',
+            'start_date',
+            'history_days',
+            'daily_quantities',
+            'total_quantity',
+            'moving_average',
+            'mean_absolute_error',
+        ]
+    )
+    forecasts.filter(updated_at__lt=now).delete()
+    return len(item_forecasts)
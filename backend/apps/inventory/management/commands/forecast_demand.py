@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.base.models import User
+from ...forecasting import forecast_demand
+
+
+class Command(BaseCommand):
+    """Forecasts the demand of inventory items"""
+    help = (
+        "Fits exponential smoothing on the recent daily sales of every "
+        "inventory item and stores its forecast for the coming days. "
+        "Meant to run nightly (e.g. with cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=str, default=None,
+                            help="Only forecast the items of the user "
+                                 "with this username")
+        parser.add_argument('--history-days', type=int, default=None,
+                            help="Days of sales the forecasts are fitted on")
+        parser.add_argument('--horizon-days', type=int, default=None,
+                            help="Days to forecast")
+
+    def handle(self, *args, **options):
+        for option in ['history_days', 'horizon_days']:
+            if options[option] is not None and options[option] < 1:
+                raise CommandError(
+                    f"--{option.replace('_', '-')} must be at least 1."
+                )
+
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if not user:
+                raise CommandError(f"User '{options['user']}' does not exist.")
+
+        try:
+            items_count = forecast_demand(user,
+                                          history_days=options['history_days'],
+                                          horizon_days=options['horizon_days'])
+        except ValueError as e:
+            # Invalid FORECAST_* settings
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Forecasted the demand of {items_count} items."
+        ))
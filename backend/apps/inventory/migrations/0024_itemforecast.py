@@ -0,0 +1,37 @@
+# Generated by Django 4.2.13 on 2026-10-19 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.tokens
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('inventory', '0023_alter_item_supplier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemForecast',
+            fields=[
+                ('id', models.UUIDField(default=utils.tokens.Token.generate_uuid, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('start_date', models.DateField()),
+                ('history_days', models.PositiveIntegerField()),
+                ('daily_quantities', models.JSONField(default=list)),
+                ('total_quantity', models.FloatField(default=0)),
+                ('moving_average', models.FloatField(default=0, help_text='Average daily quantity sold over the recent days')),
+                ('mean_absolute_error', models.FloatField(blank=True, help_text='In-sample one day ahead error of the forecast', null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='item_forecasts', to=settings.AUTH_USER_MODEL)),
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='forecast', to='inventory.item')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -117,3 +117,33 @@ class VariantOption(BaseModel):
             f'{self.item.created_by.username}- is available on '
             f'{self.variant.name}: {self.body}'
         )
+
+
+class ItemForecast(BaseModel):
+    """
+    Item Demand Forecast Model
+    Daily quantities expected to be sold from start_date, fitted on the
+    item's recent daily sales by the forecast_demand command.
+    """
+    item = models.OneToOneField(Item, on_delete=models.CASCADE,
+                                related_name='forecast')
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE,
+                                   related_name='item_forecasts',
+                                   null=True, blank=True)
+    start_date = models.DateField()
+    history_days = models.PositiveIntegerField()
+    daily_quantities = models.JSONField(default=list)
+    total_quantity = models.FloatField(default=0)
+    moving_average = models.FloatField(default=0,
+                                       help_text="Average daily quantity sold "
+                                                 "over the recent days")
+    mean_absolute_error = models.FloatField(null=True, blank=True,
+                                            help_text="In-sample one day ahead "
+                                                      "error of the forecast")
+
+    @property
+    def horizon_days(self):
+        return len(self.daily_quantities)
+
+    def __str__(self) -> str:
+        return f'{self.item.name}: {self.total_quantity} from {self.start_date}'
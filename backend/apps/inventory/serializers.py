@@ -11,7 +11,7 @@ from utils.serializers import (
 )
 from utils.activity import register_activity
 from ..base.models import User
-from .models import Item, Category, Variant, VariantOption
+from .models import Item, ItemForecast, Category, Variant, VariantOption
 from ..supplier_orders.models import Supplier
 
 
@@ -36,6 +36,27 @@ class VariantSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class ItemForecastSerializer(serializers.ModelSerializer):
+    """Item Demand Forecast Serializer"""
+    class Meta:
+        model = ItemForecast
+        fields = [
+            'start_date',
+            'horizon_days',
+            'history_days',
+            'daily_quantities',
+            'total_quantity',
+            'moving_average',
+            'mean_absolute_error',
+            'updated_at',
+        ]
+
+    def to_representation(self, instance: ItemForecast):
+        forecast_repr = super().to_representation(instance)
+        forecast_repr['updated_at'] = date_repr_format(instance.updated_at)
+        return forecast_repr
+
+
 class ItemSerializer(serializers.ModelSerializer):
     """Item Serializer"""
     category = serializers.CharField(allow_blank=True, required=False, allow_null=True)
@@ -0,0 +1,7 @@
+from utils.cache import invalidate_on_change
+from .models import Category, Item, Variant
+
+
+invalidate_on_change(Item, 'items', user_field='created_by_id')
+invalidate_on_change(Category, 'categories', 'items', user_field='created_by_id')
+invalidate_on_change(Variant, 'variants', user_field='created_by_id')
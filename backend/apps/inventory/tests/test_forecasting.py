@@ -0,0 +1,134 @@
+import pytest
+import numpy as np
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from apps.inventory.factories import ItemFactory
+from apps.inventory.forecasting import (holt_winters_forecast,
+                                        moving_average_forecast,
+                                        forecast_demand,
+                                        get_forecast_settings)
+from apps.inventory.models import ItemForecast
+from apps.sales.factories import SaleFactory, SoldItemFactory
+from apps.sales.models import Sale
+
+
+class TestForecastingModels:
+    """Tests for the vectorized forecasting models"""
+
+    def test_holt_winters_forecasts_every_item_at_once(self):
+        days = np.arange(56)
+        sold = np.vstack([
+            np.full(56, 3.0),
+            # Weekly pattern selling 7 units on the first day of the week
+            np.where(days % 7 == 0, 7.0, 0.0),
+            np.zeros(56),
+        ])
+
+        forecast, errors = holt_winters_forecast(sold, 14, 0.3, 0.05, 0.2)
+
+        assert forecast.shape == (3, 14)
+        np.testing.assert_allclose(forecast[0], 3.0)
+        np.testing.assert_allclose(forecast[1], np.where((56 + np.arange(14)) % 7 == 0, 7.0, 0.0),
+                                   atol=0.01)
+        np.testing.assert_allclose(forecast[2], 0.0)
+        np.testing.assert_allclose(errors[[0, 2]], 0.0, atol=1e-9)
+
+    def test_holt_winters_forecasts_are_not_negative(self):
+        sold = np.linspace(20, 0, 30)[None, :]
+        forecast, _ = holt_winters_forecast(sold, 30, 0.5, 0.5, 0.2)
+        assert (forecast >= 0).all()
+
+    def test_moving_average_forecast(self):
+        sold = np.array([[10.0, 0.0, 2.0, 4.0]])
+        assert moving_average_forecast(sold, 2).tolist() == [3.0]
+
+    def test_forecast_settings_overrides(self):
+        params = get_forecast_settings(history_days=21, horizon_days=None)
+        assert params["history_days"] == 21
+        assert params["horizon_days"] == 30
+
+    @pytest.mark.parametrize("overrides", [
+        {"history_days": 0},
+        {"horizon_days": -1},
+        {"moving_average_days": "7"},
+        {"history_days": True},
+    ])
+    def test_forecast_settings_reject_invalid_days(self, overrides):
+        with pytest.raises(ValueError, match="must be a positive integer"):
+            get_forecast_settings(**overrides)
+
+
+@pytest.mark.django_db
+class TestForecastDemand:
+    """Tests for the forecast_demand function and command"""
+
+    @pytest.fixture
+    def item_sales(self, user, item):
+        """Sells 2 units of item a day over the last 21 days"""
+        item.in_inventory = True
+        item.save()
+        now = timezone.now()
+        for days in range(21):
+            sale = SaleFactory.create(created_by=user)
+            Sale.objects.filter(id=sale.id).update(
+                created_at=now - timedelta(days=days)
+            )
+            SoldItemFactory.create(created_by=user,
+                                   sale=sale,
+                                   item=item,
+                                   sold_quantity=2)
+
+    def test_forecast_demand(self, user, item, item_sales):
+        other_item = ItemFactory.create(created_by=user, in_inventory=True)
+        ItemFactory.create(created_by=user, in_inventory=False)
+
+        assert forecast_demand(user, history_days=21, horizon_days=30) == 2
+
+        forecast = ItemForecast.objects.get(item=item)
+        assert forecast.start_date == timezone.now().date() + timedelta(days=1)
+        assert forecast.horizon_days == 30
+        assert forecast.daily_quantities == [2.0] * 30
+        assert forecast.total_quantity == 60.0
+        assert forecast.moving_average == 2.0
+        assert forecast.mean_absolute_error == 0.0
+
+        other_forecast = ItemForecast.objects.get(item=other_item)
+        assert other_forecast.total_quantity == 0
+
+    def test_forecast_demand_replaces_previous_forecasts(self, user, item, item_sales):
+        forecast_demand(user, history_days=21)
+        forecast_id = ItemForecast.objects.get(item=item).id
+
+        item.in_inventory = False
+        item.save()
+        new_item = ItemFactory.create(created_by=user, in_inventory=True)
+        forecast_demand(user, history_days=21)
+
+        assert not ItemForecast.objects.filter(id=forecast_id).exists()
+        assert ItemForecast.objects.filter(item=new_item).exists()
+
+    def test_forecast_demand_command(self, user, item, item_sales):
+        out = StringIO()
+        call_command("forecast_demand", "--user", user.username, stdout=out)
+
+        assert "Forecasted the demand of 1 items." in out.getvalue()
+        assert ItemForecast.objects.filter(item=item).exists()
+
+    def test_forecast_demand_command_fails_with_nonexistent_user(self):
+        with pytest.raises(CommandError, match="does not exist"):
+            call_command("forecast_demand", "--user", "nobody")
+
+    @pytest.mark.parametrize("option", ["--history-days", "--horizon-days"])
+    @pytest.mark.parametrize("value", ["0", "-3"])
+    def test_forecast_demand_command_fails_with_invalid_days(self, option, value):
+        with pytest.raises(CommandError, match=f"{option} must be at least 1."):
+            call_command("forecast_demand", option, value)
+        assert not ItemForecast.objects.exists()
+
+    def test_forecast_demand_command_fails_with_invalid_settings(self, settings):
+        settings.FORECAST_HISTORY_DAYS = 0
+        with pytest.raises(CommandError, match="'history_days' must be a positive integer."):
+            call_command("forecast_demand")
@@ -8,8 +8,9 @@ from datetime import datetime, timezone, timedelta
 from django.urls import reverse
 from rest_framework_simplejwt.tokens import AccessToken
 from apps.base.models import User, Activity
-from apps.inventory.models import Item, VariantOption
+from apps.inventory.models import Item, ItemForecast, VariantOption
 from apps.inventory.serializers import ItemSerializer
+from apps.inventory.views import CreateListItems
 from apps.inventory.factories import (
     CategoryFactory,
     VariantFactory,
@@ -436,7 +437,7 @@ class TestCreateListItemsView:
     ):
         res = auth_client.get(create_list_item_url)
         assert res.status_code == 200
-        assert isinstance(res.data, list)
+        assert isinstance(res.data["results"], list)
     
     def test_list_items_response_data_objects_structure(
         self,
@@ -448,9 +449,9 @@ class TestCreateListItemsView:
         res = auth_client.get(create_list_item_url)
 
         assert res.status_code == 200
-        assert len(res.data) == 10
+        assert len(res.data["results"]) == 10
 
-        item_1 = res.data[0]
+        item_1 = res.data["results"][0]
 
         assert type(item_1) == dict
     
@@ -464,9 +465,9 @@ class TestCreateListItemsView:
         res = auth_client.get(create_list_item_url)
 
         assert res.status_code == 200
-        assert len(res.data) == 10
+        assert len(res.data["results"]) == 10
 
-        item_1 = res.data[0]
+        item_1 = res.data["results"][0]
 
         assert type(item_1) == dict
 
@@ -503,9 +504,9 @@ class TestCreateListItemsView:
 
         res = api_client.get(create_list_item_url)
         assert res.status_code == 200
-        assert len(res.data) == 10
+        assert len(res.data["results"]) == 10
 
-        assert all(item["created_by"] == user.username for item in res.data)
+        assert all(item["created_by"] == user.username for item in res.data["results"])
 
     def test_items_sorted_desc_by_created_at(
         self,
@@ -532,8 +533,8 @@ class TestCreateListItemsView:
         res = auth_client.get(create_list_item_url)
 
         assert res.status_code == 200
-        assert len(res.data) == 10
-        response_items_ids = [item['id'] for item in res.data]
+        assert len(res.data["results"]) == 10
+        response_items_ids = [item['id'] for item in res.data["results"]]
 
         assert response_items_ids == list(sorted_items_ids)
     
@@ -545,8 +546,8 @@ class TestCreateListItemsView:
         res = auth_client.get(create_list_item_url)
 
         assert res.status_code == 200
-        assert isinstance(res.data, list)
-        assert len(res.data) == 0
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == 0
 
     def test_list_items_with_in_inventory_query_set_to_true(
         self,
@@ -569,7 +570,7 @@ class TestCreateListItemsView:
 
         res = auth_client.get(f'{create_list_item_url}?in_inventory=true')
         assert res.status_code == 200
-        assert len(res.data) == 9
+        assert len(res.data["results"]) == 9
 
     def test_list_items_with_in_inventory_query_set_to_false(
         self,
@@ -592,7 +593,7 @@ class TestCreateListItemsView:
 
         res = auth_client.get(f'{create_list_item_url}?in_inventory=false')
         assert res.status_code == 200
-        assert len(res.data) == 10
+        assert len(res.data["results"]) == 10
     
     def test_list_all_items_by_default(
         self,
@@ -615,7 +616,97 @@ class TestCreateListItemsView:
 
         res = auth_client.get(create_list_item_url)
         assert res.status_code == 200
-        assert len(res.data) == 10
+        assert len(res.data["results"]) == 10
+
+    def test_list_items_pages_follow_cursors(
+        self,
+        auth_client,
+        user,
+        create_list_item_url
+    ):
+        items = ItemFactory.create_batch(15, created_by=user)
+        now = datetime.now(timezone.utc)
+        for i, item in enumerate(items):
+            item.created_at = now - timedelta(seconds=i)
+        Item.objects.bulk_update(items, ['created_at'])
+
+        res = auth_client.get(create_list_item_url)
+        assert res.status_code == 200
+        assert res.data["previous"] is None
+        assert len(res.data["results"]) == 10
+        first_page_ids = [item["id"] for item in res.data["results"]]
+
+        res = auth_client.get(res.data["next"])
+        assert res.status_code == 200
+        assert res.data["next"] is None
+        assert len(res.data["results"]) == 5
+        second_page_ids = [item["id"] for item in res.data["results"]]
+
+        assert first_page_ids + second_page_ids == [str(item.id) for item in items]
+
+    def test_list_items_page_size_is_capped(
+        self,
+        auth_client,
+        user,
+        create_list_item_url
+    ):
+        ItemFactory.create_batch(5, created_by=user)
+
+        res = auth_client.get(create_list_item_url, {"page_size": 3})
+        assert len(res.data["results"]) == 3
+
+        res = auth_client.get(create_list_item_url, {"page_size": 1000})
+        assert len(res.data["results"]) == 5
+        assert res.data["next"] is None
+
+    def test_export_items_streams_every_item_as_json_lines(
+        self,
+        auth_client,
+        user,
+        create_list_item_url
+    ):
+        ItemFactory.create_batch(12, created_by=user, in_inventory=True)
+        ItemFactory.create(created_by=user, in_inventory=False)
+        ItemFactory.create_batch(2)
+
+        res = auth_client.get(create_list_item_url,
+                              {"export": "ndjson", "in_inventory": "true"})
+        assert res.status_code == 200
+        assert res.streaming
+        assert res["Content-Type"] == "application/x-ndjson"
+        assert "attachment" in res["Content-Disposition"]
+
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        assert len(lines) == 12
+        exported_items = [json.loads(line) for line in lines]
+        assert all(item["created_by"] == user.username for item in exported_items)
+        assert all(item["in_inventory"] for item in exported_items)
+
+    def test_export_items_is_fetched_in_chunks(
+        self,
+        auth_client,
+        user,
+        create_list_item_url,
+        monkeypatch
+    ):
+        monkeypatch.setattr(CreateListItems, "export_chunk_size", 4)
+        ItemFactory.create_batch(10, created_by=user)
+
+        res = auth_client.get(create_list_item_url, {"export": "ndjson"})
+        chunks = list(res.streaming_content)
+        assert len(chunks) == 3
+        assert sum(chunk.count(b"\n") for chunk in chunks) == 10
+
+    def test_export_items_with_unsupported_format(
+        self,
+        auth_client,
+        create_list_item_url
+    ):
+        res = auth_client.get(create_list_item_url, {"export": "xml"})
+        assert res.status_code == 400
+        assert res.data["error"] == (
+            "Unsupported export format 'xml'. Supported formats: ndjson."
+        )
 
 
 @pytest.mark.django_db
@@ -693,6 +784,28 @@ class TestGetUpdateDeleteItemsView:
         assert "created_at" in res.data
         assert "updated_at" in res.data
     
+    def test_get_item_with_forecast(self, auth_client, user, item):
+        url = item_url(item)
+
+        res = auth_client.get(url)
+        assert res.status_code == 200
+        assert res.data["forecast"] is None
+
+        forecast = ItemForecast.objects.create(item=item,
+                                               created_by=user,
+                                               start_date=datetime.now().date(),
+                                               history_days=90,
+                                               daily_quantities=[1.5, 2.5],
+                                               total_quantity=4.0,
+                                               moving_average=2.0)
+
+        res = auth_client.get(url)
+        assert res.status_code == 200
+        assert res.data["forecast"]["start_date"] == str(forecast.start_date)
+        assert res.data["forecast"]["horizon_days"] == 2
+        assert res.data["forecast"]["daily_quantities"] == [1.5, 2.5]
+        assert res.data["forecast"]["total_quantity"] == 4.0
+
     def test_get_item_with_inexistent_item_id(self, auth_client, random_uuid):
         url = reverse('get_update_delete_items', kwargs={'id': random_uuid})
 
@@ -1472,3 +1585,38 @@ class TestGetInventoryDataView:
 
         assert len(res.data["variants"]) == 1
         assert variant.name in res.data["variants"]
+
+    def test_inventory_data_is_cached_until_inventory_changes(
+        self,
+        auth_client,
+        user,
+        get_inventory_data_url,
+        django_assert_max_num_queries
+    ):
+        ItemFactory.create(created_by=user, in_inventory=True, quantity=3)
+        res = auth_client.get(get_inventory_data_url)
+        assert res.data["total_items"] == 1
+
+        with django_assert_max_num_queries(1):
+            cached_res = auth_client.get(get_inventory_data_url)
+        assert cached_res.data == res.data
+
+        ItemFactory.create(created_by=user, in_inventory=True, quantity=2)
+        res = auth_client.get(get_inventory_data_url)
+        assert res.data["total_items"] == 2
+        assert res.data["total_quantity"] == 5
+
+    def test_inventory_data_is_cached_per_user(
+        self,
+        auth_client,
+        api_client,
+        user,
+        get_inventory_data_url
+    ):
+        ItemFactory.create(created_by=user, in_inventory=True)
+        auth_client.get(get_inventory_data_url)
+
+        other_user = UserFactory.create()
+        api_client.force_authenticate(other_user)
+        res = api_client.get(get_inventory_data_url)
+        assert res.data["total_items"] == 0
@@ -6,15 +6,16 @@ from rest_framework import status
 from django.db.models import CharField, Q
 from django.db.models.functions import Cast
 from utils.tokens import Token
-from utils.views import CreatedByUserMixin
+from utils.views import CreatedByUserMixin, ExportListMixin
 from utils.activity import register_activity
+from utils.cache import cache_view
 from ..base.auth import TokenVersionAuthentication
 from . import serializers
-from .models import Item, Category, Variant
+from .models import Item, ItemForecast, Category, Variant
 from ..supplier_orders.models import Supplier
 
 
-class CreateListItems(CreatedByUserMixin,
+class CreateListItems(CreatedByUserMixin, ExportListMixin,
                       generics.ListCreateAPIView):
     """Handles Item Creation"""
     authentication_classes = (TokenVersionAuthentication,)
@@ -41,6 +42,17 @@ class GetUpdateDeleteItems(CreatedByUserMixin,
     parser_classes = (FormParser, MultiPartParser)
     lookup_field = 'id'
 
+    def retrieve(self, request, *args, **kwargs):
+        item = self.get_object()
+        item_data = self.get_serializer(item).data
+        # Demand forecast stored by the forecast_demand command if any
+        forecast = ItemForecast.objects.filter(item=item).first()
+        item_data['forecast'] = (
+            serializers.ItemForecastSerializer(forecast).data
+            if forecast else None
+        )
+        return Response(item_data, status=status.HTTP_200_OK)
+
     def delete(self, request, *args, **kwargs):
         item = self.get_object()
         if item.total_client_orders > 0 or item.total_supplier_orders > 0 :
@@ -160,6 +172,7 @@ class GetInventoryData(generics.GenericAPIView):
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
 
+    @cache_view('items', 'categories', 'suppliers', 'variants')
     def get(self, request, *args, **kwargs):
         user = request.user
 
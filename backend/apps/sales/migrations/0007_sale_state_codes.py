@@ -0,0 +1,51 @@
+# Generated by Django 4.2.13 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+ORDER_STATUS_CODES = {
+    'Pending': 1,
+    'Shipped': 2,
+    'Delivered': 3,
+    'Returned': 4,
+    'Canceled': 5,
+    'Failed': 6,
+    'Paid': 7,
+    'Refunded': 8
+}
+
+ORDER_STATE_CHOICES = [(code, name) for name, code in ORDER_STATUS_CODES.items()]
+
+
+def populate_states(apps, schema_editor):
+    """Sets the state codes of existing sales from their statuses"""
+    Sale = apps.get_model('sales', 'Sale')
+    for name, code in ORDER_STATUS_CODES.items():
+        Sale.objects.filter(delivery_status__name=name).update(delivery_state=code)
+        Sale.objects.filter(payment_status__name=name).update(payment_state=code)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_orders', '0023_location_identity_constraint'),
+        ('sales', '0006_remove_sale_from_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='delivery_state',
+            field=models.PositiveSmallIntegerField(blank=True, choices=ORDER_STATE_CHOICES, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='payment_state',
+            field=models.PositiveSmallIntegerField(blank=True, choices=ORDER_STATE_CHOICES, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_states, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['created_by', 'delivery_state', 'payment_state', 'created_at'], name='sale_state_idx'),
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.core.validators import MinValueValidator
 from shortuuid.django_fields import ShortUUIDField
 from decimal import Decimal
 from utils.models import BaseModel, get_default_order_status
+from utils.status import ORDER_STATE_CHOICES
 from ..inventory.models import Item
 from ..client_orders.models import (Client,
                                     AcquisitionSource,
@@ -33,6 +34,14 @@ class Sale(BaseModel):
                                        related_name='sale_payment_status',
                                        blank=True,
                                        default=get_default_order_status)
+    # Status codes kept in sync with delivery_status and payment_status
+    # so status filters don't need to join OrderStatus
+    delivery_state = models.PositiveSmallIntegerField(choices=ORDER_STATE_CHOICES,
+                                                      null=True, blank=True,
+                                                      editable=False)
+    payment_state = models.PositiveSmallIntegerField(choices=ORDER_STATE_CHOICES,
+                                                     null=True, blank=True,
+                                                     editable=False)
     source = models.ForeignKey(AcquisitionSource, on_delete=models.SET_NULL,
                                null=True, blank=True,
                                related_name="sales",
@@ -78,6 +87,13 @@ class Sale(BaseModel):
     def linked_order(self):
         return self.order.id if self.has_order else None
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['created_by', 'delivery_state',
+                                 'payment_state', 'created_at'],
+                         name='sale_state_idx'),
+        ]
+
     def __str__(self):
         return self.reference_id
 
@@ -96,6 +112,10 @@ class SoldItem(BaseModel):
         decimal_places=2,
         validators=[MinValueValidator(Decimal('0.0'))]
     )
+    # Item's price at the time of sale so profits don't change
+    # when the item is re-costed by later supplier receipts
+    unit_cost = models.DecimalField(max_digits=6, decimal_places=2,
+                                    editable=False)
 
     @property
     def total_price(self):
@@ -103,7 +123,7 @@ class SoldItem(BaseModel):
 
     @property
     def total_cost(self):
-        return self.sold_quantity * self.item.price
+        return self.sold_quantity * self.unit_cost
 
     @property
     def total_profit(self):
@@ -111,7 +131,12 @@ class SoldItem(BaseModel):
 
     @property
     def unit_profit(self):
-        return self.sold_price - self.item.price
+        return self.sold_price - self.unit_cost
+
+    def save(self, *args, **kwargs):
+        if self.unit_cost is None and self.item_id:
+            self.unit_cost = self.item.price
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.item.name
@@ -13,17 +13,19 @@ from utils.serializers import (
     update_field,
     check_item_existence,
     validate_restricted_fields,
-    validate_changes_for_delivered_parent_instance
+    validate_changes_for_delivered_parent_instance,
+    bulk_save_items_changes
 )
 from utils.status import (
     DELIVERY_STATUS_OPTIONS_LOWER,
     PAYMENT_STATUS_OPTIONS_LOWER
 )
 from utils.activity import register_activity
+from utils.status_registry import order_status_registry
 from .models import Sale, SoldItem
 from ..base.models import User
 from ..inventory.models import Item
-from ..client_orders.models import Client, OrderStatus
+from ..client_orders.models import Client
 from ..client_orders.serializers import LocationSerializer
 
 
@@ -51,16 +53,31 @@ class SoldItemSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # The sale is already known when sold items
+        # are validated as part of the sale's update
+        if 'sale' in self.context:
+            fields.pop('sale')
+        return fields
+
     def validate_item(self, value):
-        user = get_user(self.context)
-        item = (
-            Item.objects
-            .filter(
-                created_by=user,
-                name__iexact=value,
-                in_inventory=True)
-            .first()
-        )
+        # Use the inventory items already loaded by the sale's update
+        inventory_items = self.context.get('inventory_items', None)
+        if inventory_items is not None:
+            item = inventory_items.get(value.lower())
+            if item and not item.in_inventory:
+                item = None
+        else:
+            user = get_user(self.context)
+            item = (
+                Item.objects
+                .filter(
+                    created_by=user,
+                    name__iexact=value,
+                    in_inventory=True)
+                .first()
+            )
 
         if not item:
             raise serializers.ValidationError(
@@ -140,6 +157,9 @@ class SoldItemSerializer(serializers.ModelSerializer):
                 item.quantity -= sold_quantity
                 item.save()
 
+            # Capture the new item's cost
+            validated_data['unit_cost'] = item.price
+
         # Case: Related item instance remained the same
         else:
             item = item or instance.item
@@ -249,8 +269,12 @@ class SaleSerializer(serializers.ModelSerializer):
         sale: Sale,
         sold_items: List[dict]
     ) -> None:
+        # Create map of old/existing sold items
+        existing_items = {old_item.item.name.lower(): old_item
+                          for old_item in sale.sold_items.select_related('item')}
+
         # Filter inventory items by old and new sold items
-        item_names = [old_item.item.name for old_item in sale.items]
+        item_names = list(existing_items)
         item_names.extend([sold_item['item'] for sold_item in sold_items])
         names_query = Q()
         for name in item_names:
@@ -260,9 +284,15 @@ class SaleSerializer(serializers.ModelSerializer):
         # Create an inventory items map for all necessary items
         inventory_items_map = {item.name.lower(): item for item in inventory_items}
 
-        # Create map of old/existing sold items
-        existing_items = {old_item.item.name.lower(): old_item
-                          for old_item in sale.items}
+        # Compute all the changes before applying them
+        changed_inventory_items = {}
+        items_to_update = []
+        items_to_create = []
+        item_context = {
+            'user': user,
+            'sale': sale,
+            'inventory_items': inventory_items_map
+        }
 
         for sold_item in sold_items:
             existing_item = existing_items.pop(sold_item['item'].lower(), None)
@@ -280,24 +310,54 @@ class SaleSerializer(serializers.ModelSerializer):
                                                 "exceeds available stock."
                         }    
                     })
-                else:
-                    inventory_item.quantity = new_item_quantity
-                    inventory_item.save()
-                    existing_item.sold_quantity = sold_item['sold_quantity']
-                    existing_item.sold_price = sold_item['sold_price']
-                    existing_item.save()
-    
+                inventory_item.quantity = new_item_quantity
+                changed_inventory_items[inventory_item.id] = inventory_item
+                existing_item.sold_quantity = sold_item['sold_quantity']
+                existing_item.sold_price = sold_item['sold_price']
+                items_to_update.append(existing_item)
+
             # Create new sold item
             else:
-                self.create_sold_items_for_sale(user, sale, [sold_item])
+                serializer = SoldItemSerializer(data=sold_item,
+                                                context=item_context)
+                if not serializer.is_valid():
+                    raise serializers.ValidationError(
+                        {
+                            'sold_items': serializer.errors
+                        }
+                    )
+                validated_item = serializer.validated_data
+                item = validated_item.pop('item')
+
+                # Validate item's sale delivery status
+                if not items_to_create:
+                    validate_changes_for_delivered_parent_instance(sale)
+
+                # Validate item's quantity and subtract sold quantity from inventory
+                if item.quantity < validated_item['sold_quantity']:
+                    serializer.sold_quantity_validation_error(item.name)
+                item.quantity -= validated_item['sold_quantity']
+                changed_inventory_items[item.id] = item
+                items_to_create.append(SoldItem(sale=sale,
+                                                item=item,
+                                                unit_cost=item.price,
+                                                created_by=user,
+                                                **validated_item))
 
         # Delete remaining sold items and update item's quantity in inventory
+        items_to_delete = list(existing_items.values())
         for key, item_for_deletion in existing_items.items():
             inventory_item = inventory_items_map.get(key)
             inventory_item.quantity += item_for_deletion.sold_quantity
-            inventory_item.save()
-            item_for_deletion.delete()
+            changed_inventory_items[inventory_item.id] = inventory_item
 
+        bulk_save_items_changes(SoldItem,
+                                items_to_update,
+                                ['sold_quantity', 'sold_price'],
+                                items_to_create,
+                                items_to_delete,
+                                list(changed_inventory_items.values()),
+                                ['quantity'])
 
     def update_linked_order(self, sale: Sale) -> None:
         from ..client_orders.serializers import ClientOrderSerializer
@@ -321,7 +381,8 @@ class SaleSerializer(serializers.ModelSerializer):
                 created_by=sold_item.created_by,
                 item=sold_item.item,
                 sold_quantity=sold_item.ordered_quantity,
-                sold_price=sold_item.ordered_price
+                sold_price=sold_item.ordered_price,
+                unit_cost=sold_item.unit_cost
             )
             for sold_item in items
         ]
@@ -360,7 +421,7 @@ class SaleSerializer(serializers.ModelSerializer):
     def validate_delivery_status(self, value):
         if value:
             if value.lower() in DELIVERY_STATUS_OPTIONS_LOWER:
-                return OrderStatus.objects.filter(name__iexact=value).first()
+                return order_status_registry.get(value)
             else:
                 raise serializers.ValidationError('Invalid delivery status.')
         return None
@@ -368,7 +429,7 @@ class SaleSerializer(serializers.ModelSerializer):
     def validate_payment_status(self, value):
         if value:
             if value.lower() in PAYMENT_STATUS_OPTIONS_LOWER: 
-                return OrderStatus.objects.filter(name__iexact=value).first()
+                return order_status_registry.get(value)
             else:
                 raise serializers.ValidationError('Invalid payment status.')
         return None
@@ -0,0 +1,7 @@
+from utils.cache import invalidate_on_change
+from .models import Sale, SoldItem
+
+
+# Sales update the quantities of the sold inventory items
+invalidate_on_change(Sale, 'sales', 'items', user_field='created_by_id')
+invalidate_on_change(SoldItem, 'sales', 'items', user_field='created_by_id')
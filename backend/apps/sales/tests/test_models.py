@@ -2,6 +2,7 @@ import pytest
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError
 from apps.sales.factories import SaleFactory, SoldItemFactory
+from utils.status import ORDER_STATUS_CODES
 
 
 @pytest.mark.django_db
@@ -44,6 +45,16 @@ class TestSaleModel:
         assert all(item.sale == sale for item in sold_items)
         assert sale.sold_items.count() == len(sold_items)
 
+    def test_sale_states_follow_statuses(self, sale, delivered_status):
+        assert sale.delivery_state == ORDER_STATUS_CODES['Pending']
+
+        sale.delivery_status = delivered_status
+        sale.save()
+        sale.refresh_from_db()
+
+        assert sale.delivery_state == ORDER_STATUS_CODES['Delivered']
+        assert sale.payment_state == ORDER_STATUS_CODES['Pending']
+
 
 @pytest.mark.django_db
 class TestSoldItemModel:
@@ -65,6 +76,23 @@ class TestSoldItemModel:
 
         assert str(sold_item) == sold_item.item.name
 
+    def test_sold_item_captures_item_cost(self, user, sale, item):
+        sold_item = SoldItemFactory.create(created_by=user,
+                                           sale=sale,
+                                           item=item,
+                                           sold_quantity=2,
+                                           sold_price=150)
+        assert sold_item.unit_cost == item.price
+
+        # Re-costing the item does not change the sold item's profit
+        total_profit = sold_item.total_profit
+        item.price += 25
+        item.save()
+        sold_item.refresh_from_db()
+        assert sold_item.unit_cost == item.price - 25
+        assert sold_item.total_profit == total_profit
+        assert sold_item.unit_profit == sold_item.sold_price - sold_item.unit_cost
+
     def test_sold_item_creation_fails_without_sale(self):
         with pytest.raises(IntegrityError):
             SoldItemFactory.create(sale=None)
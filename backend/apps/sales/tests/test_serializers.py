@@ -1,15 +1,18 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from unittest.mock import patch
 from rest_framework.exceptions import ValidationError
 from apps.base.models import Activity
 from apps.base.factories import UserFactory
+from apps.inventory.models import Item
 from apps.inventory.factories import ItemFactory
 from apps.client_orders.models import Location, AcquisitionSource
 from apps.client_orders.serializers import ClientOrderSerializer
 from apps.client_orders.factories import AcquisitionSourceFactory, ClientFactory, LocationFactory, OrderStatusFactory
 from apps.sales.models import Sale, SoldItem
 from apps.sales.serializers import SaleSerializer, SoldItemSerializer
-from apps.sales.factories import SoldItemFactory
+from apps.sales.factories import SaleFactory, SoldItemFactory
 from utils.status import (
     DELIVERY_STATUS_OPTIONS_LOWER,
     PAYMENT_STATUS_OPTIONS_LOWER
@@ -1462,6 +1465,47 @@ class TestSaleSerializer:
         # the sale's sold items list
         assert str(sold_item_2.item.id) not in updated_items_ids
 
+    def test_sold_items_update_runs_a_constant_number_of_queries(
+        self,
+        user,
+        client
+    ):
+        queries_counts = []
+        for lines_count in [1, 4]:
+            sale = SaleFactory.create(created_by=user, client=client)
+            items = ItemFactory.create_batch(3 * lines_count,
+                                             created_by=user,
+                                             in_inventory=True,
+                                             quantity=10)
+            kept_items = items[:lines_count]
+            removed_items = items[lines_count:2 * lines_count]
+            added_items = items[2 * lines_count:]
+            for item in kept_items + removed_items:
+                SoldItemFactory.create(created_by=user,
+                                       sale=sale,
+                                       item=item,
+                                       sold_quantity=2)
+
+            new_sold_items = [
+                {"item": item.name, "sold_quantity": 3, "sold_price": 50}
+                for item in kept_items + added_items
+            ]
+            serializer = SaleSerializer(context={"user": user})
+            with CaptureQueriesContext(connection) as queries:
+                serializer.update_sold_items_for_sale(user, sale, new_sold_items)
+            queries_counts.append(len(queries))
+
+            assert sale.sold_items.count() == 2 * lines_count
+            assert not sale.sold_items.filter(item__in=removed_items).exists()
+            kept_item = Item.objects.get(id=kept_items[0].id)
+            removed_item = Item.objects.get(id=removed_items[0].id)
+            added_item = Item.objects.get(id=added_items[0].id)
+            assert kept_item.quantity == 9
+            assert removed_item.quantity == 12
+            assert added_item.quantity == 7
+
+        assert queries_counts[0] == queries_counts[1]
+
     def test_sale_update_removes_optional_field_if_set_to_none(
         self,
         user,
@@ -3,9 +3,12 @@ import uuid
 import random
 from typing import Union
 from django.urls import reverse
+from django.utils import timezone
 from apps.base.models import Activity
-from apps.inventory.factories import ItemFactory
-from apps.client_orders.factories import OrderStatusFactory
+from apps.inventory.factories import ItemFactory, CategoryFactory
+from apps.client_orders.factories import (OrderStatusFactory,
+                                          ClientOrderFactory,
+                                          ClientFactory)
 from apps.sales.models import Sale, SoldItem
 from apps.sales.factories import SaleFactory, SoldItemFactory
 from utils.serializers import decimal_to_float, date_repr_format
@@ -42,6 +45,10 @@ def bulk_delete_items_url(sale_id: str):
 def get_sales_data_url():
     return reverse('sales_data')
 
+@pytest.fixture
+def sales_report_url():
+    return reverse('sales_report')
+
 
 @pytest.mark.django_db
 class TestCreateListSalesView:
@@ -136,7 +143,7 @@ class TestCreateListSalesView:
         res = api_client.get(create_list_sales_url)
         assert res.status_code == 200
 
-        res_data = res.json()
+        res_data = res.json()["results"]
         assert len(res_data) == 6
 
         # Verify that all sales belong to the authenticated user
@@ -149,6 +156,25 @@ class TestCreateListSalesView:
             for sale in res_data
         )
 
+    def test_list_sales_runs_a_constant_number_of_queries(
+        self,
+        user,
+        auth_client,
+        create_list_sales_url,
+        django_assert_max_num_queries
+    ):
+        for sale in SaleFactory.create_batch(10, created_by=user):
+            SoldItemFactory.create_batch(2, created_by=user, sale=sale)
+        ClientOrderFactory.create(created_by=user,
+                                  sale=Sale.objects.filter(created_by=user).first())
+
+        with django_assert_max_num_queries(2):
+            res = auth_client.get(create_list_sales_url)
+        assert res.status_code == 200
+        assert len(res.data["results"]) == 10
+        assert all(len(sale["sold_items"]) == 2 for sale in res.data["results"])
+        assert sum(sale["linked_order"] is not None for sale in res.data["results"]) == 1
+
 
 @pytest.mark.django_db
 class TestGetUpdateDeleteSalesView:
@@ -970,20 +996,20 @@ class TestCreateListSoldItemsView:
         res = api_client.get(url)
         assert res.status_code == 200
 
-        assert isinstance(res.data, list)
-        assert len(res.data) == len(user_items)
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == len(user_items)
 
         # Verify that all sold items belong to the correct sale and user
         assert all(
             str(item["sale"]) == str(sale.id)
             and item["created_by"] == user.username
-            for item in res.data
+            for item in res.data["results"]
         )
 
         user_item_ids = {str(item.id) for item in user_items}
         assert all(
             str(item["id"]) in user_item_ids
-            for item in res.data
+            for item in res.data["results"]
         )
 
 
@@ -1656,6 +1682,20 @@ class TestGetSalesDataView:
 
         assert res_data["sales_count"] == len(user_sales)
 
+    def test_get_sales_data_counts_sales_in_a_single_query(
+        self,
+        user,
+        auth_client,
+        get_sales_data_url,
+        django_assert_num_queries
+    ):
+        SaleFactory.create_batch(3, created_by=user)
+
+        with django_assert_num_queries(1):
+            res = auth_client.get(get_sales_data_url)
+        assert res.status_code == 200
+        assert res.data["sales_count"] == 3
+
     def test_get_sales_data_sale_status_field_structure_and_value(
         self,
         user,
@@ -1725,3 +1765,208 @@ class TestGetSalesDataView:
         # Failed orders field
         assert "failed" in sale_status
         assert sale_status["failed"] == len(failed_sales)
+
+
+@pytest.mark.django_db
+class TestSalesReportView:
+    """Tests for the sales report view"""
+
+    @pytest.fixture
+    def report_sales(self, user, client, pending_status):
+        """
+        Sells 2 units of Projector (cost 100) at 150 and 1 unit of
+        Pack (cost 10) at 30 to client, and 1 Projector at 120 to Safuan
+        """
+        devices = CategoryFactory.create(created_by=user, name="Devices")
+        projector = ItemFactory.create(created_by=user, name="Projector",
+                                       category=devices, price=100)
+        pack = ItemFactory.create(created_by=user, name="Pack",
+                                  category=devices, price=10)
+        other_client = ClientFactory.create(created_by=user, name="Safuan")
+
+        sale = SaleFactory.create(created_by=user, client=client)
+        SoldItemFactory.create(created_by=user, sale=sale, item=projector,
+                               sold_quantity=2, sold_price=150)
+        SoldItemFactory.create(created_by=user, sale=sale, item=pack,
+                               sold_quantity=1, sold_price=30)
+        other_sale = SaleFactory.create(created_by=user, client=other_client)
+        SoldItemFactory.create(created_by=user, sale=other_sale, item=projector,
+                               sold_quantity=1, sold_price=120)
+        # Sales of other users are not reported
+        SoldItemFactory.create(sale=SaleFactory.create(), sold_quantity=9)
+
+    def test_sales_report_requires_auth(self, api_client, sales_report_url):
+        res = api_client.get(sales_report_url, {"dimensions": "item"})
+        assert res.status_code == 403
+
+    def test_sales_report_rolls_up_dimensions(
+        self,
+        client,
+        auth_client,
+        sales_report_url,
+        report_sales
+    ):
+        res = auth_client.get(sales_report_url, {
+            "dimensions": "client,item",
+            "measures": "revenue,profit,quantity,sales",
+        })
+        assert res.status_code == 200
+        assert res.data["dimensions"] == ["client", "item"]
+        assert res.data["truncated"] is False
+
+        rows = [
+            (row["client"], row["item"], row["rolled_up"],
+             row["revenue"], row["profit"], row["quantity"], row["sales"])
+            for row in res.data["rows"]
+        ]
+        assert rows == [
+            (client.name, "Pack", [], 30.0, 20.0, 1, 1),
+            (client.name, "Projector", [], 300.0, 100.0, 2, 1),
+            (client.name, None, ["item"], 330.0, 120.0, 3, 1),
+            ("Safuan", "Projector", [], 120.0, 20.0, 1, 1),
+            ("Safuan", None, ["item"], 120.0, 20.0, 1, 1),
+            (None, None, ["client", "item"], 450.0, 140.0, 4, 2),
+        ]
+
+    def test_sales_report_by_month(
+        self,
+        auth_client,
+        sales_report_url,
+        report_sales
+    ):
+        res = auth_client.get(sales_report_url, {
+            "dimensions": "category,month",
+            "measures": "cost",
+        })
+        assert res.status_code == 200
+        detail, subtotal, total = res.data["rows"]
+        assert detail["category"] == "Devices"
+        assert detail["month"] == timezone.now().date().replace(day=1).isoformat()
+        assert detail["cost"] == 310.0
+        assert subtotal["rolled_up"] == ["month"]
+        assert total["rolled_up"] == ["category", "month"]
+        assert total["cost"] == 310.0
+
+    def test_sales_report_enforces_row_limit(
+        self,
+        auth_client,
+        sales_report_url,
+        report_sales
+    ):
+        res = auth_client.get(sales_report_url,
+                              {"dimensions": "item", "limit": 2})
+        assert res.status_code == 200
+        assert [row["item"] for row in res.data["rows"]] == ["Pack", None]
+        assert res.data["truncated"] is True
+
+        res = auth_client.get(sales_report_url,
+                              {"dimensions": "item", "limit": 3})
+        assert len(res.data["rows"]) == 3
+        assert res.data["truncated"] is False
+
+    def test_truncated_sales_report_keeps_complete_groups_and_grand_total(
+        self,
+        client,
+        auth_client,
+        sales_report_url,
+        report_sales
+    ):
+        res = auth_client.get(sales_report_url, {
+            "dimensions": "client,item",
+            "measures": "revenue,quantity",
+            "limit": 4,
+        })
+        assert res.status_code == 200
+        assert res.data["truncated"] is True
+
+        rows = [
+            (row["client"], row["item"], row["rolled_up"],
+             row["revenue"], row["quantity"])
+            for row in res.data["rows"]
+        ]
+        # Safuan's rows are cut, but not the grand total summarizing them
+        assert rows == [
+            (client.name, "Pack", [], 30.0, 1),
+            (client.name, "Projector", [], 300.0, 2),
+            (client.name, None, ["item"], 330.0, 3),
+            (None, None, ["client", "item"], 450.0, 4),
+        ]
+
+    @pytest.mark.parametrize("limit", [1, 2, 5, 7])
+    def test_sales_report_limit_counts_subtotal_rows(
+        self,
+        user,
+        auth_client,
+        sales_report_url,
+        limit
+    ):
+        items = ItemFactory.create_batch(3, created_by=user)
+        for _ in range(3):
+            sale = SaleFactory.create(created_by=user,
+                                      client=ClientFactory.create(created_by=user))
+            for item in items:
+                SoldItemFactory.create(created_by=user, sale=sale, item=item,
+                                       sold_quantity=1, sold_price=10)
+
+        # 9 client and item rows, 3 client subtotals and the grand total
+        res = auth_client.get(sales_report_url, {
+            "dimensions": "client,item",
+            "measures": "quantity",
+            "limit": limit,
+        })
+        assert res.status_code == 200
+        assert len(res.data["rows"]) == limit
+        assert res.data["truncated"] is True
+        assert res.data["rows"][-1]["rolled_up"] == ["client", "item"]
+        assert res.data["rows"][-1]["quantity"] == 9
+
+        res = auth_client.get(sales_report_url, {
+            "dimensions": "client,item",
+            "measures": "quantity",
+            "limit": 13,
+        })
+        assert len(res.data["rows"]) == 13
+        assert res.data["truncated"] is False
+
+    def test_sales_report_without_sales(self, auth_client, sales_report_url):
+        res = auth_client.get(sales_report_url,
+                              {"dimensions": "item", "measures": "quantity"})
+        assert res.status_code == 200
+        assert res.data["truncated"] is False
+        assert [row["quantity"] for row in res.data["rows"]] == [0]
+
+    def test_sales_report_is_cached_by_request(
+        self,
+        user,
+        auth_client,
+        sales_report_url,
+        report_sales,
+        django_assert_num_queries
+    ):
+        params = {"dimensions": "item", "measures": "quantity"}
+        res = auth_client.get(sales_report_url, params)
+        assert res.status_code == 200
+
+        with django_assert_num_queries(0):
+            cached_res = auth_client.get(sales_report_url, params)
+        assert cached_res.data == res.data
+
+    @pytest.mark.parametrize("params, error", [
+        ({}, "At least one dimension is required."),
+        ({"dimensions": "item,id"}, "Invalid dimensions: id."),
+        ({"dimensions": "item,item"}, "Duplicate dimensions are not allowed."),
+        ({"dimensions": "item", "measures": "margin"}, "Invalid measures: margin."),
+        ({"dimensions": "item", "start_date": "2024-13-01"},
+         "'start_date' must be a date (YYYY-MM-DD)."),
+        ({"dimensions": "item", "limit": "0"}, "'limit' must be a positive integer."),
+    ])
+    def test_sales_report_fails_with_invalid_params(
+        self,
+        auth_client,
+        sales_report_url,
+        params,
+        error
+    ):
+        res = auth_client.get(sales_report_url, params)
+        assert res.status_code == 400
+        assert res.data["error"].startswith(error)
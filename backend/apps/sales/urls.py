@@ -10,6 +10,9 @@ urlpatterns = [
     path('bulk_delete/',
          views.BulkDeleteSales.as_view(),
          name='bulk_delete_sales'),
+    path('reports/',
+         views.SalesReport.as_view(),
+         name='sales_report'),
     path('<uuid:id>/',
          views.GetUpdateDeleteSales.as_view(),
          name='get_update_delete_sales'),
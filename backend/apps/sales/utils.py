@@ -1,12 +1,49 @@
-from django.db.models import F
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Sum, DecimalField, QuerySet
 from rest_framework.exceptions import NotFound
-from typing import List
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Union
 from uuid import UUID
+from utils.cache import make_key
+from utils.serializers import decimal_to_float
 from ..base.models import User
-from ..inventory.models import Item
+from ..client_orders.models import (AcquisitionSource, City, Client,
+                                    Country, Location)
+from ..inventory.models import Category, Item
 from .models import Sale, SoldItem
 
 
+# Report dimensions and measures are compiled into SQL from these
+# whitelists only, request values are never interpolated
+REPORT_DIMENSIONS = {
+    'item': 'i.name',
+    'category': 'cat.name',
+    'client': 'c.name',
+    'source': 'src.name',
+    'country': 'co.name',
+    'city': 'ci.name',
+    'week': "DATE_TRUNC('week', s.created_at)::date",
+    'month': "DATE_TRUNC('month', s.created_at)::date",
+}
+
+REPORT_MEASURES = {
+    'revenue': 'SUM(si.sold_quantity * si.sold_price)',
+    'cost': 'SUM(si.sold_quantity * si.unit_cost)',
+    'profit': 'SUM(si.sold_quantity * (si.sold_price - si.unit_cost))',
+    'quantity': 'SUM(si.sold_quantity)',
+    'sales': 'COUNT(DISTINCT s.id)',
+}
+
+REPORT_DEFAULT_MEASURES = ['revenue', 'profit', 'quantity']
+REPORT_MAX_DIMENSIONS = 4
+
+REPORT_CACHE_NAMESPACES = ['sales', 'items', 'categories', 'clients',
+                           'locations', 'sources']
+
+
 def validate_sale(sale_id: UUID, user: User):
     sale = Sale.objects.filter(id=sale_id, created_by=user).first()
     if not sale:
@@ -18,3 +55,137 @@ def reset_sold_items(sold_items: List[SoldItem]):
         Item.objects.filter(id=sold_item.item.id).update(
             quantity=F('quantity') + sold_item.sold_quantity
         )
+
+def get_sales_totals(sales: QuerySet[Sale]) -> Dict[str, Decimal]:
+    """
+    Returns the revenue, cost and profit of the given sales.
+    Costs come from the sold items' stored unit costs and the sales'
+    shipping costs, so no join to the inventory items is needed.
+    """
+    money_field = DecimalField(max_digits=12, decimal_places=2)
+    items_totals = SoldItem.objects.filter(sale__in=sales).aggregate(
+        revenue=Sum(F('sold_quantity') * F('sold_price'),
+                    output_field=money_field),
+        cost=Sum(F('sold_quantity') * F('unit_cost'),
+                 output_field=money_field),
+    )
+    shipping_cost = sales.aggregate(total=Sum('shipping_cost'))['total']
+
+    revenue = items_totals['revenue'] or 0
+    cost = (items_totals['cost'] or 0) + (shipping_cost or 0)
+    return {'revenue': revenue, 'cost': cost, 'profit': revenue - cost}
+
+def sales_report_cache_key(user: User, params: dict) -> str:
+    """
+    Returns the cache key of a report request made by user, which changes
+    whenever the user's sales or the data they are grouped by change
+    """
+    return make_key('sales_report', REPORT_CACHE_NAMESPACES, user.id, params)
+
+def build_sales_report(
+    user: User,
+    dimensions: List[str],
+    measures: List[str],
+    start_date: Union[date, None] = None,
+    end_date: Union[date, None] = None,
+    limit: Union[int, None] = None
+) -> dict:
+    """
+    Returns the given measures of the user's sold items grouped by the
+    given dimensions, with a subtotal row for every dimension prefix and
+    a grand total, computed by a single GROUP BY ROLLUP query.
+    Dimensions and measures must be keys of REPORT_DIMENSIONS and
+    REPORT_MEASURES. At most limit rows, subtotals included, are
+    returned: truncated reports keep their first rows, whose subtotals
+    only follow complete groups, and always end with the grand total so
+    it still summarizes the cut rows. Reports are cached by request for
+    SALES_REPORT_CACHE_TIMEOUT seconds.
+    """
+    max_rows = getattr(settings, 'SALES_REPORT_MAX_ROWS', 1000)
+    limit = min(limit or max_rows, max_rows)
+    params = {
+        'dimensions': dimensions,
+        'measures': measures,
+        'start_date': start_date,
+        'end_date': end_date,
+        'limit': limit,
+    }
+    cache_key = sales_report_cache_key(user, params)
+    report = cache.get(cache_key)
+    if report is not None:
+        return report
+
+    quote = connection.ops.quote_name
+    dimension_sql = [REPORT_DIMENSIONS[dimension] for dimension in dimensions]
+    select = [f'{sql} AS {quote(dimension)}'
+              for dimension, sql in zip(dimensions, dimension_sql)]
+    select += [f'GROUPING({sql}) AS {quote("grouping_" + dimension)}'
+               for dimension, sql in zip(dimensions, dimension_sql)]
+    select += [f'{REPORT_MEASURES[measure]} AS {quote(measure)}'
+               for measure in measures]
+    # Detail rows come before their subtotal and the grand total comes last
+    order_by = []
+    for dimension, sql in zip(dimensions, dimension_sql):
+        order_by += [f'GROUPING({sql})', f'{sql} NULLS LAST']
+    # Rows are ranked in report order, the grand total having every
+    # grouping bit set
+    grand_total_mask = (1 << len(dimensions)) - 1
+    select += [f"GROUPING({', '.join(dimension_sql)}) AS grouping_mask",
+               f'ROW_NUMBER() OVER (ORDER BY {", ".join(order_by)}) '
+               'AS report_rank']
+
+    where = ['s.created_by_id = %s']
+    where_params = [user.id]
+    if start_date:
+        where.append('s.created_at::date >= %s')
+        where_params.append(start_date)
+    if end_date:
+        where.append('s.created_at::date <= %s')
+        where_params.append(end_date)
+
+    sql = (
+        f"SELECT * FROM (SELECT {', '.join(select)} "
+        f"FROM {quote(SoldItem._meta.db_table)} si "
+        f"JOIN {quote(Sale._meta.db_table)} s ON s.id = si.sale_id "
+        f"JOIN {quote(Item._meta.db_table)} i ON i.id = si.item_id "
+        f"LEFT JOIN {quote(Category._meta.db_table)} cat ON cat.id = i.category_id "
+        f"LEFT JOIN {quote(Client._meta.db_table)} c ON c.id = s.client_id "
+        f"LEFT JOIN {quote(AcquisitionSource._meta.db_table)} src ON src.id = s.source_id "
+        f"LEFT JOIN {quote(Location._meta.db_table)} l ON l.id = s.shipping_address_id "
+        f"LEFT JOIN {quote(Country._meta.db_table)} co ON co.id = l.country_id "
+        f"LEFT JOIN {quote(City._meta.db_table)} ci ON ci.id = l.city_id "
+        f"WHERE {' AND '.join(where)} "
+        f"GROUP BY ROLLUP({', '.join(dimension_sql)})) report "
+        "WHERE report_rank < %s OR grouping_mask = %s "
+        "ORDER BY report_rank"
+    )
+    # The grand total comes last, so its rank is the report's row count
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*where_params, limit, grand_total_mask])
+        columns = [column[0] for column in cursor.description]
+        records = [dict(zip(columns, record)) for record in cursor.fetchall()]
+    truncated = bool(records) and records[-1]['report_rank'] > limit
+
+    rows = []
+    for record in records:
+        row = {}
+        for dimension in dimensions:
+            value = record[dimension]
+            row[dimension] = value.isoformat() if isinstance(value, date) else value
+        row['rolled_up'] = [dimension for dimension in dimensions
+                            if record[f'grouping_{dimension}']]
+        for measure in measures:
+            value = record[measure]
+            row[measure] = (decimal_to_float(value)
+                            if isinstance(value, Decimal) else value or 0)
+        rows.append(row)
+
+    report = {
+        'dimensions': dimensions,
+        'measures': measures,
+        'rows': rows,
+        'truncated': truncated,
+    }
+    cache.set(cache_key, report,
+              getattr(settings, 'SALES_REPORT_CACHE_TIMEOUT', 300))
+    return report
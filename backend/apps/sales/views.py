@@ -1,30 +1,53 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.utils.dateparse import parse_date
 from django.db.models.functions import Cast
-from django.db.models import CharField
+from django.db.models import CharField, Prefetch
 from utils.views import (CreatedByUserMixin,
+                         ExportListMixin,
                          validate_linked_items_for_deletion,
                          validate_deletion_for_delivered_parent_instance)
 from utils.tokens import Token
 from utils.activity import register_activity
+from utils.cache import cache_view
 from utils.status import (DELIVERY_STATUS_OPTIONS,
                           PAYMENT_STATUS_OPTIONS,
-                          ACTIVE_DELIVERY_STATUS,
-                          COMPLETED_STATUS,
-                          FAILED_STATUS)
-from .utils import validate_sale, reset_sold_items
+                          get_status_summary)
+from .utils import (validate_sale,
+                    reset_sold_items,
+                    build_sales_report,
+                    REPORT_DIMENSIONS,
+                    REPORT_MEASURES,
+                    REPORT_DEFAULT_MEASURES,
+                    REPORT_MAX_DIMENSIONS)
 from ..base.auth import TokenVersionAuthentication
 from . import serializers
 from .models import Sale, SoldItem
 
 
-class CreateListSales(CreatedByUserMixin, generics.ListCreateAPIView):
+class CreateListSales(CreatedByUserMixin, ExportListMixin,
+                      generics.ListCreateAPIView):
     """Handles Sale Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.SaleSerializer
-    queryset = Sale.objects.all()
+    queryset = (
+        Sale.objects
+        .select_related('created_by',
+                        'client',
+                        'delivery_status',
+                        'payment_status',
+                        'source__added_by',
+                        'shipping_address__added_by',
+                        'shipping_address__country',
+                        'shipping_address__city__country',
+                        'order')
+        .prefetch_related(
+            Prefetch('sold_items',
+                     queryset=SoldItem.objects.select_related('item'))
+        )
+    )
 
 
 class GetUpdateDeleteSales(CreatedByUserMixin,
@@ -33,7 +56,22 @@ class GetUpdateDeleteSales(CreatedByUserMixin,
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.SaleSerializer
-    queryset = Sale.objects.all()
+    queryset = (
+        Sale.objects
+        .select_related('created_by',
+                        'client',
+                        'delivery_status',
+                        'payment_status',
+                        'source__added_by',
+                        'shipping_address__added_by',
+                        'shipping_address__country',
+                        'shipping_address__city__country',
+                        'order')
+        .prefetch_related(
+            Prefetch('sold_items',
+                     queryset=SoldItem.objects.select_related('item'))
+        )
+    )
     lookup_field = 'id'
 
     def delete(self, request, *args, **kwargs):
@@ -110,7 +148,8 @@ class BulkDeleteSales(CreatedByUserMixin, generics.DestroyAPIView):
                          status=status.HTTP_200_OK)
 
 
-class CreateListSoldItems(CreatedByUserMixin, generics.ListCreateAPIView):
+class CreateListSoldItems(CreatedByUserMixin, ExportListMixin,
+                          generics.ListCreateAPIView):
     """Handles Sold Item Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
@@ -217,6 +256,7 @@ class GetSalesData(CreatedByUserMixin, generics.GenericAPIView):
     permission_classes = (IsAuthenticated,)
     queryset = Sale.objects.all()
 
+    @cache_view('sales', 'order_statuses')
     def get(self, request, *args, **kwargs):
         # User sales
         sales = self.get_queryset()
@@ -227,27 +267,91 @@ class GetSalesData(CreatedByUserMixin, generics.GenericAPIView):
             'payment_status': PAYMENT_STATUS_OPTIONS
         }
 
-        # Active sales
-        active_sales = (
-            sales.filter(delivery_status__name__in=ACTIVE_DELIVERY_STATUS)
-            .count()
-        )
-        sale_status['active'] = active_sales
-
-        # Completed sales
-        completed_sales = (
-            sales.filter(delivery_status__name__in=COMPLETED_STATUS)
-            .count()
-        )
-        sale_status['completed'] = completed_sales
-
-        # Completed sales
-        failed_sales = (
-            sales.filter(delivery_status__name__in=FAILED_STATUS)
-            .count()
-        )
-        sale_status['failed'] = failed_sales
+        # Sales count by status
+        sales_summary = get_status_summary(sales)
+        sale_status['active'] = sales_summary['active']
+        sale_status['completed'] = sales_summary['completed']
+        sale_status['failed'] = sales_summary['failed']
 
-        return Response({'sales_count': sales.count(),
+        return Response({'sales_count': sales_summary['total'],
                          'sale_status': sale_status},
                          status=status.HTTP_200_OK)
+
+
+class SalesReport(generics.GenericAPIView):
+    """
+    Returns the revenue, cost, profit, quantity or count of sales grouped
+    by up to four dimensions with subtotals, e.g.
+    ?dimensions=category,month&measures=revenue,profit
+    """
+    authentication_classes = (TokenVersionAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get_list_param(self, name: str, options: dict, default=None):
+        """Returns the validated comma separated values of the name param"""
+        value = self.request.GET.get(name, None)
+        if not value:
+            return default
+        values = [option.strip().lower() for option in value.split(',')]
+        invalid = [option for option in values if option not in options]
+        if invalid:
+            return Response(
+                {
+                    'error': f"Invalid {name}: {', '.join(invalid)}. "
+                             f"Available {name}: {', '.join(options)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(set(values)) != len(values):
+            return Response({'error': f'Duplicate {name} are not allowed.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return values
+
+    def get(self, request, *args, **kwargs):
+        dimensions = self.get_list_param('dimensions', REPORT_DIMENSIONS)
+        if isinstance(dimensions, Response):
+            return dimensions
+        if not dimensions:
+            return Response({'error': 'At least one dimension is required.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(dimensions) > REPORT_MAX_DIMENSIONS:
+            return Response(
+                {'error': f'A report can have at most {REPORT_MAX_DIMENSIONS} dimensions.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        measures = self.get_list_param('measures',
+                                       REPORT_MEASURES,
+                                       REPORT_DEFAULT_MEASURES)
+        if isinstance(measures, Response):
+            return measures
+
+        dates = {}
+        for param in ('start_date', 'end_date'):
+            value = request.GET.get(param, None)
+            if not value:
+                continue
+            try:
+                dates[param] = parse_date(value)
+            except ValueError:
+                dates[param] = None
+            if dates[param] is None:
+                return Response({'error': f"'{param}' must be a date (YYYY-MM-DD)."},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        limit = request.GET.get('limit', None)
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                return Response({'error': "'limit' must be a positive integer."},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        report = build_sales_report(request.user,
+                                    dimensions,
+                                    measures,
+                                    limit=limit,
+                                    **dates)
+        return Response(report, status=status.HTTP_200_OK)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SupplierOrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.supplier_orders'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...models import User
+from ...utils import compute_reorder_suggestions, draft_reorder_supplier_orders
+
+
+class Command(BaseCommand):
+    """Drafts supplier orders from reorder suggestions"""
+    help = (
+        "Computes reorder suggestions from each user's sales velocity and "
+        "drafts a pending supplier order per supplier. Meant to run nightly "
+        "(e.g. with cron). Quantities of active supplier orders count as "
+        "incoming stock, so reruns don't draft the same reorders twice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=str, default=None,
+                            help="Only draft the reorders of the user "
+                                 "with this username")
+        parser.add_argument('--window-days', type=int, default=None,
+                            help="Days of sales used to compute velocities")
+        parser.add_argument('--cover-days', type=int, default=None,
+                            help="Days of stock to reorder")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only print the suggestions")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(item__in_inventory=True).distinct()
+        if options['user']:
+            users = User.objects.filter(username=options['user'])
+            if not users.exists():
+                raise CommandError(f"User '{options['user']}' does not exist.")
+
+        orders_count = 0
+        for user in users:
+            suggestions = compute_reorder_suggestions(
+                user,
+                window_days=options['window_days'],
+                cover_days=options['cover_days']
+            )
+            if options['dry_run']:
+                for group in suggestions:
+                    items = ', '.join(f"{item['item']} x{item['suggested_quantity']}"
+                                      for item in group['items'])
+                    self.stdout.write(f"{user.username} - {group['supplier']}: {items}")
+                continue
+            orders_count += len(draft_reorder_supplier_orders(user, suggestions))
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Drafted {orders_count} supplier orders."
+            ))
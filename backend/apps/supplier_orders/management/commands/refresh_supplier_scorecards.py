@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...models import User, Supplier
+from ...utils import refresh_supplier_scorecard
+
+
+class Command(BaseCommand):
+    """Rebuilds the performance scorecards of suppliers"""
+    help = (
+        "Recomputes the scorecard of every supplier from its orders. "
+        "Scorecards are kept up to date as orders change, so this is only "
+        "needed to build them for existing data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=str, default=None,
+                            help="Only refresh the scorecards of the suppliers "
+                                 "of the user with this username")
+
+    def handle(self, *args, **options):
+        suppliers = Supplier.objects.all()
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if not user:
+                raise CommandError(f"User '{options['user']}' does not exist.")
+            suppliers = suppliers.filter(created_by=user)
+
+        supplier_ids = list(suppliers.values_list('id', flat=True))
+        for supplier_id in supplier_ids:
+            refresh_supplier_scorecard(supplier_id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {len(supplier_ids)} supplier scorecards."
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.13 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+DELIVERED_STATE = 3
+
+
+def populate_received_quantities(apps, schema_editor):
+    """Marks the ordered items of delivered orders as fully received"""
+    SupplierOrderedItem = apps.get_model('supplier_orders', 'SupplierOrderedItem')
+    SupplierOrderedItem.objects.filter(
+        order__delivery_state=DELIVERED_STATE
+    ).update(received_quantity=models.F('ordered_quantity'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplier_orders', '0008_supplierorder_state_codes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplierordereditem',
+            name='received_quantity',
+            field=models.PositiveIntegerField(default=0, help_text='Quantity of this line already added to the inventory'),
+        ),
+        migrations.RunPython(populate_received_quantities,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.13 on 2026-10-19 11:55
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.tokens
+
+
+DELIVERED_STATE = 3
+
+
+def populate_delivered_at(apps, schema_editor):
+    """Uses the last update of already delivered orders as their delivery date"""
+    SupplierOrder = apps.get_model('supplier_orders', 'SupplierOrder')
+    SupplierOrder.objects.filter(
+        delivery_state=DELIVERED_STATE
+    ).update(delivered_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplier_orders', '0009_supplierordereditem_received_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplierorder',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the order was marked as delivered', null=True),
+        ),
+        migrations.RunPython(populate_delivered_at,
+                             migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='SupplierScorecard',
+            fields=[
+                ('id', models.UUIDField(default=utils.tokens.Token.generate_uuid, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('orders_count', models.PositiveIntegerField(default=0)),
+                ('delivered_count', models.PositiveIntegerField(default=0)),
+                ('on_time_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0, help_text='Number of failed or returned orders')),
+                ('average_lead_time', models.DurationField(blank=True, help_text="Average time from an order's creation to its delivery", null=True)),
+                ('on_time_rate', models.FloatField(blank=True, null=True)),
+                ('failure_rate', models.FloatField(blank=True, null=True)),
+                ('total_spend', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('item_prices', models.JSONField(blank=True, default=list, help_text='Average and last unit price of every ordered item')),
+                ('last_order_date', models.DateTimeField(blank=True, null=True)),
+                ('supplier', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='scorecard', to='supplier_orders.supplier')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
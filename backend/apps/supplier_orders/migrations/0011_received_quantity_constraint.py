@@ -0,0 +1,27 @@
+# Generated by Django 4.2.13 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+def cap_received_quantities(apps, schema_editor):
+    """Caps received quantities to the ordered ones before the check"""
+    SupplierOrderedItem = apps.get_model('supplier_orders', 'SupplierOrderedItem')
+    SupplierOrderedItem.objects.filter(
+        received_quantity__gt=models.F('ordered_quantity')
+    ).update(received_quantity=models.F('ordered_quantity'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplier_orders', '0010_supplierscorecard'),
+    ]
+
+    operations = [
+        migrations.RunPython(cap_received_quantities,
+                             migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='supplierordereditem',
+            constraint=models.CheckConstraint(check=models.Q(('received_quantity__lte', models.F('ordered_quantity'))), name='received_quantity_lte_ordered_quantity'),
+        ),
+    ]
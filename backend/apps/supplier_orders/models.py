@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from shortuuid.django_fields import ShortUUIDField
 from decimal import Decimal
 from utils.models import BaseModel, get_default_order_status
+from utils.status import ORDER_STATE_CHOICES
 from ..client_orders.models import Location, OrderStatus
 
 
@@ -28,10 +29,15 @@ class Supplier(BaseModel):
 
     @property
     def total_items(self):
+        # Use the counts annotated by the suppliers listing if any
+        if hasattr(self, 'items_count'):
+            return self.items_count
         return self.items.all().count()
 
     @property
     def total_orders(self):
+        if hasattr(self, 'orders_count'):
+            return self.orders_count
         return self.orders.all().count()
 
     def __str__(self) -> str:
@@ -64,12 +70,28 @@ class SupplierOrder(BaseModel):
         related_name="supplier_payment_status",
         default=get_default_order_status
     )
+    # Status codes kept in sync with delivery_status and payment_status
+    # so status filters don't need to join OrderStatus
+    delivery_state = models.PositiveSmallIntegerField(
+        choices=ORDER_STATE_CHOICES,
+        null=True, blank=True,
+        editable=False
+    )
+    payment_state = models.PositiveSmallIntegerField(
+        choices=ORDER_STATE_CHOICES,
+        null=True, blank=True,
+        editable=False
+    )
     tracking_number = models.CharField(max_length=50,
                                        null=True,
                                        blank=True,
                                        help_text="Tracking number for the shipment")
     shipping_cost = models.DecimalField(max_digits=6, decimal_places=2,
                                         null=True, blank=True)
+    delivered_at = models.DateTimeField(
+        null=True, blank=True, editable=False,
+        help_text="When the order was marked as delivered"
+    )
     updated = models.BooleanField(default=False)
 
     @property
@@ -84,6 +106,13 @@ class SupplierOrder(BaseModel):
     def total_price(self):
         return sum(item.total_price for item in self.items)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['created_by', 'delivery_state',
+                                 'payment_state', 'created_at'],
+                         name='supplier_order_state_idx'),
+        ]
+
     def __str__(self) -> str:
         return self.reference_id
 
@@ -105,6 +134,22 @@ class SupplierOrderedItem(BaseModel):
         decimal_places=2,
         validators=[MinValueValidator(Decimal('0.0'))]
     )
+    received_quantity = models.PositiveIntegerField(
+        default=0,
+        help_text="Quantity of this line already added to the inventory"
+    )
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(received_quantity__lte=models.F('ordered_quantity')),
+                name='received_quantity_lte_ordered_quantity'
+            )
+        ]
+
+    @property
+    def remaining_quantity(self):
+        return max(self.ordered_quantity - self.received_quantity, 0)
 
     @property
     def in_inventory(self):
@@ -116,3 +161,36 @@ class SupplierOrderedItem(BaseModel):
 
     def __str__(self) -> str:
         return self.item.name
+
+
+class SupplierScorecard(BaseModel):
+    """
+    Supplier Scorecard Model
+    Precomputed supplier performance metrics, refreshed whenever
+    the supplier's orders change.
+    """
+    supplier = models.OneToOneField(Supplier, on_delete=models.CASCADE,
+                                    related_name='scorecard')
+    orders_count = models.PositiveIntegerField(default=0)
+    delivered_count = models.PositiveIntegerField(default=0)
+    on_time_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of failed or returned orders"
+    )
+    average_lead_time = models.DurationField(
+        null=True, blank=True,
+        help_text="Average time from an order's creation to its delivery"
+    )
+    on_time_rate = models.FloatField(null=True, blank=True)
+    failure_rate = models.FloatField(null=True, blank=True)
+    total_spend = models.DecimalField(max_digits=12, decimal_places=2,
+                                      default=Decimal('0.00'))
+    item_prices = models.JSONField(
+        default=list, blank=True,
+        help_text="Average and last unit price of every ordered item"
+    )
+    last_order_date = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f'{self.supplier.name} scorecard'
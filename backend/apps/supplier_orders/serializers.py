@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.db import transaction
+from django.db.models import F, Q
 from typing import List, Union
 from utils.serializers import (
     get_user,
@@ -8,18 +9,25 @@ from utils.serializers import (
     get_or_create_location,
     validate_restricted_fields,
     validate_changes_for_delivered_parent_instance,
+    bulk_save_items_changes,
+    get_annotated_instance,
     decimal_to_float
 )
 from utils.status import (DELIVERY_STATUS_OPTIONS_LOWER,
                           PAYMENT_STATUS_OPTIONS_LOWER)
 from utils.serializers import update_field, check_item_existence, decimal_to_float
 from utils.activity import register_activity
+from utils.status_registry import order_status_registry
 from ..base.models import User
 from ..inventory.models import Item
 from ..client_orders.serializers import LocationSerializer
-from ..client_orders.models import OrderStatus
-from .models import Supplier, SupplierOrderedItem, SupplierOrder
-from .utils import average_price
+from .models import (Supplier,
+                     SupplierOrderedItem,
+                     SupplierOrder,
+                     SupplierScorecard)
+from .utils import (receive_ordered_items,
+                    annotate_suppliers_stats,
+                    get_receipt_error)
 
 
 class SupplierSerializer(serializers.ModelSerializer):
@@ -35,6 +43,7 @@ class SupplierSerializer(serializers.ModelSerializer):
             'phone_number',
             'email',
             'location',
+            'total_items',
             'total_orders',
             'created_at',
             'updated_at',
@@ -95,14 +104,57 @@ class SupplierSerializer(serializers.ModelSerializer):
         return supplier
 
     def to_representation(self, instance: Supplier):
-        supplier_to_repr = super().to_representation(instance)
+        # Items and orders stats, only queried if they weren't annotated
+        stats = get_annotated_instance(instance, annotate_suppliers_stats,
+                                       'total_spend')
+        supplier_to_repr = super().to_representation(stats)
         supplier_to_repr['created_by'] = instance.created_by.username if instance.created_by else None
         supplier_to_repr['location'] = get_location(instance.location)
+        supplier_to_repr['total_spend'] = decimal_to_float(stats.total_spend)
+        supplier_to_repr['last_order_date'] = (
+            date_repr_format(stats.last_order_date)
+            if stats.last_order_date else None
+        )
         supplier_to_repr['created_at'] = date_repr_format(instance.created_at)
         supplier_to_repr['updated_at'] = date_repr_format(instance.updated_at)
         return supplier_to_repr
 
 
+class SupplierScorecardSerializer(serializers.ModelSerializer):
+    """Supplier Scorecard Serializer"""
+    class Meta:
+        model = SupplierScorecard
+        fields = [
+            'supplier',
+            'orders_count',
+            'delivered_count',
+            'on_time_count',
+            'failed_count',
+            'average_lead_time',
+            'on_time_rate',
+            'failure_rate',
+            'total_spend',
+            'item_prices',
+            'last_order_date',
+            'updated_at',
+        ]
+
+    def to_representation(self, instance: SupplierScorecard):
+        scorecard_repr = super().to_representation(instance)
+        scorecard_repr['supplier'] = instance.supplier.name
+        scorecard_repr['average_lead_time'] = (
+            round(instance.average_lead_time.total_seconds() / 86400, 2)
+            if instance.average_lead_time is not None else None
+        )
+        scorecard_repr['total_spend'] = decimal_to_float(instance.total_spend)
+        scorecard_repr['last_order_date'] = (
+            date_repr_format(instance.last_order_date)
+            if instance.last_order_date else None
+        )
+        scorecard_repr['updated_at'] = date_repr_format(instance.updated_at)
+        return scorecard_repr
+
+
 class SupplierOrderedItemSerializer(serializers.ModelSerializer):
     """Supplier Ordered Item Serializer"""
     order = serializers.PrimaryKeyRelatedField(
@@ -122,11 +174,22 @@ class SupplierOrderedItemSerializer(serializers.ModelSerializer):
             'item',
             'ordered_quantity',
             'ordered_price',
+            'received_quantity',
             'in_inventory',
             'total_price',
             'created_at',
             'updated_at'
         ]
+        read_only_fields = ['received_quantity']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # The order and its supplier are already known when ordered
+        # items are validated as part of the order's update
+        if 'order' in self.context:
+            fields.pop('order')
+            fields.pop('supplier')
+        return fields
 
     def _get_or_create_item_and_set_supplier(
         self,
@@ -208,6 +271,14 @@ class SupplierOrderedItemSerializer(serializers.ModelSerializer):
                 }
             )
 
+    def validate_ordered_quantity(self, value):
+        # Received quantities can't be ordered less
+        if self.instance and value < self.instance.received_quantity:
+            raise serializers.ValidationError(
+                f"{self.instance.received_quantity} units of this item "
+                "have already been received."
+            )
+        return value
 
     def validate_supplier(self, value):
         user = get_user(self.context)
@@ -342,6 +413,7 @@ class SupplierOrderSerializer(serializers.ModelSerializer):
                     'item': ordered_item.item.name,
                     'ordered_quantity': ordered_item.ordered_quantity,
                     'ordered_price': ordered_item.ordered_price,
+                    'received_quantity': ordered_item.received_quantity,
                     'total_price': ordered_item.total_price,
                     'in_inventory': ordered_item.in_inventory
                 })
@@ -371,52 +443,111 @@ class SupplierOrderSerializer(serializers.ModelSerializer):
         supplier: Supplier,
         ordered_items: List[SupplierOrderedItem]):
         existing_items = {
-            ordered_item.item.name.lower(): ordered_item for ordered_item in order.items
+            ordered_item.item.name.lower(): ordered_item
+            for ordered_item in order.ordered_items.select_related('item')
         }
 
+        # Filter inventory items by the names of the new ordered items
+        names_query = Q()
+        new_items_names = [
+            new_item['item'] for new_item in ordered_items
+            if new_item['item'].lower() not in existing_items
+        ]
+        for name in new_items_names:
+            names_query |= Q(name__iexact=name)
+        inventory_items_map = {}
+        if new_items_names:
+            inventory_items_map = {
+                item.name.lower(): item
+                for item in Item.objects.filter(names_query, created_by=user)
+            }
+
+        # Compute all the changes before applying them
+        inventory_items_to_create = []
+        inventory_items_to_update = []
+        items_to_update = []
+        items_to_create = []
+        item_context = {'user': user, 'order': order}
+
         for new_item in ordered_items:
             existing_item = existing_items.pop(new_item['item'].lower(), None)
             if existing_item:
+                # Received quantities can't be ordered less
+                if new_item['ordered_quantity'] < existing_item.received_quantity:
+                    raise serializers.ValidationError(
+                        {
+                            'ordered_items': f"Item '{existing_item.item.name}' "
+                                             "has already received "
+                                             f"{existing_item.received_quantity} "
+                                             "units."
+                        }
+                    )
                 # Update existing ordered item
                 existing_item.ordered_quantity = new_item['ordered_quantity']
                 existing_item.ordered_price = new_item['ordered_price']
-                existing_item.save()
-            else:
-                # Create new ordered item
-                self.create_ordered_items_for_supplier_order(user,
-                                                             order,
-                                                             supplier,
-                                                             [new_item])
+                items_to_update.append(existing_item)
+                continue
 
-        # Delete any remaining old items
-        for item_to_delete in existing_items.values():
-            item_to_delete.delete()
+            # Create new ordered item
+            serializer = SupplierOrderedItemSerializer(data=new_item,
+                                                       context=item_context)
+            if not serializer.is_valid():
+                raise serializers.ValidationError({'ordered_items': serializer.errors})
+            validated_item = serializer.validated_data
+            item_name = validated_item.pop('item')
+
+            if not items_to_create:
+                # Validate item's order delivery status
+                validate_changes_for_delivered_parent_instance(order)
+                # Ensure order's supplier matches the provided supplier
+                serializer.check_supplier_integrity(user, supplier, None, order)
+
+            item = inventory_items_map.get(item_name.lower())
+            # Check for existing item with a different supplier
+            if item and item.supplier_id and str(item.supplier_id) != str(supplier.id):
+                raise serializers.ValidationError(
+                    {
+                        'item': f"Item '{item_name}' is associated "
+                                 "with another supplier."
+                    }
+                )
+            # Create the item with the order's supplier
+            if not item:
+                item = Item(created_by=user,
+                            supplier=supplier,
+                            name=item_name,
+                            quantity=validated_item['ordered_quantity'],
+                            price=validated_item['ordered_price'])
+                inventory_items_to_create.append(item)
+            # Set item's supplier to the order's supplier for already existing item
+            elif item.supplier_id is None:
+                item.supplier = supplier
+                inventory_items_to_update.append(item)
+
+            items_to_create.append(SupplierOrderedItem(created_by=user,
+                                                       order=order,
+                                                       supplier=supplier,
+                                                       item=item,
+                                                       **validated_item))
+
+        if inventory_items_to_create:
+            Item.objects.bulk_create(inventory_items_to_create)
+
+        # Update, create and delete any remaining old ordered items
+        bulk_save_items_changes(SupplierOrderedItem,
+                                items_to_update,
+                                ['ordered_quantity', 'ordered_price'],
+                                items_to_create,
+                                list(existing_items.values()),
+                                inventory_items_to_update,
+                                ['supplier'])
 
     def update_ordered_items_inventory_state(
         self,
         user: User,
         instance: SupplierOrder):
-        item_ids = [ordered_item.item.id for ordered_item in instance.items]
-        items = Item.objects.filter(created_by=user, id__in=item_ids)
-        item_map = {item.id: item for item in items}
-        for ordered_item in instance.items:
-            item = item_map.get(ordered_item.item.id)
-            # Update Item details in the inventory
-            if item.in_inventory:
-                if item.price == ordered_item.ordered_price:
-                    # Update only item's quantity
-                    item.quantity += ordered_item.ordered_quantity
-                else:
-                    # Calculate item's new price and update quantity
-                    item.price = average_price(item, ordered_item)
-                    item.quantity += ordered_item.ordered_quantity
-            # Add Item to the inventory with the ordered item details
-            else:
-                # Add item to inventory
-                item.quantity = ordered_item.ordered_quantity
-                item.price = ordered_item.ordered_price
-                item.in_inventory = True
-            item.save()
+        # Receive the remaining quantity of every ordered item
+        receive_ordered_items(user, instance)
 
     def validate_supplier(self, value):
         user = get_user(self.context)
@@ -451,14 +582,14 @@ class SupplierOrderSerializer(serializers.ModelSerializer):
         if value:
             if value.lower() not in DELIVERY_STATUS_OPTIONS_LOWER:
                 raise serializers.ValidationError('Invalid delivery status.')
-            return OrderStatus.objects.filter(name__iexact=value).first()
+            return order_status_registry.get(value)
         return None
 
     def validate_payment_status(self, value):
         if value:
             if value.lower() not in PAYMENT_STATUS_OPTIONS_LOWER:
                 raise serializers.ValidationError('Invalid payment status.')
-            return OrderStatus.objects.filter(name__iexact=value).first()
+            return order_status_registry.get(value)
         return None
 
     @transaction.atomic
@@ -569,3 +700,77 @@ class SupplierOrderSerializer(serializers.ModelSerializer):
         order_repr['updated_at'] = date_repr_format(instance.updated_at)
 
         return order_repr
+
+
+class SupplierOrderReceiptSerializer(serializers.Serializer):
+    """Supplier Order Partial Receipt Serializer"""
+    ordered_items = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False
+    )
+
+    def validate_ordered_items(self, value):
+        order = self.context['order']
+        lines = {str(line.id): line for line in order.ordered_items.all()}
+        quantities = {}
+        for i, receipt in enumerate(value):
+            line = lines.get(str(receipt.get('id')))
+            if not line:
+                raise serializers.ValidationError(
+                    f"Item at position {i + 1} is not part of this order."
+                )
+            if str(line.id) in quantities:
+                raise serializers.ValidationError(
+                    f"Item '{line.item.name}' has been selected multiple times."
+                )
+            quantity = receipt.get('received_quantity')
+            if not isinstance(quantity, int) or isinstance(quantity, bool) \
+                or quantity < 1:
+                raise serializers.ValidationError(
+                    f"Received quantity of item '{line.item.name}' "
+                    "must be a positive integer."
+                )
+            if quantity > line.remaining_quantity:
+                raise serializers.ValidationError(
+                    f"Only {line.remaining_quantity} units of item "
+                    f"'{line.item.name}' remain to be received."
+                )
+            quantities[str(line.id)] = quantity
+        return quantities
+
+    @transaction.atomic
+    def create(self, validated_data):
+        user = get_user(self.context)
+        # Other receipts may have been saved since the order was validated
+        order = SupplierOrder.objects.select_for_update().get(
+            pk=self.context['order'].pk
+        )
+        error = get_receipt_error(order)
+        if error:
+            raise serializers.ValidationError({'error': error})
+        lines = {str(line.id): line
+                 for line in order.ordered_items.select_related('item')}
+        for line_id, quantity in validated_data['ordered_items'].items():
+            line = lines.get(line_id)
+            if not line:
+                raise serializers.ValidationError({'ordered_items': [
+                    "Some of the received items are no longer part of this order."
+                ]})
+            if quantity > line.remaining_quantity:
+                raise serializers.ValidationError({'ordered_items': [
+                    f"Only {line.remaining_quantity} units of item "
+                    f"'{line.item.name}' remain to be received."
+                ]})
+        receive_ordered_items(user, order, validated_data['ordered_items'])
+
+        # The order is delivered once every ordered item is fully received
+        if not order.ordered_items.filter(
+            received_quantity__lt=F('ordered_quantity')
+        ).exists():
+            order.delivery_status = order_status_registry.get('Delivered')
+        order.updated = True
+        order.save()
+
+        register_activity(user, "updated", "supplier order", [order.reference_id])
+
+        return order
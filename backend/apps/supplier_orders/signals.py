@@ -0,0 +1,77 @@
+from django.db.models.signals import post_init, post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from utils.cache import invalidate_on_change
+from utils.status import ORDER_STATUS_CODES
+from utils.status_registry import order_status_registry
+from .models import Supplier, SupplierOrder, SupplierOrderedItem
+from .utils import schedule_scorecard_refresh
+
+
+invalidate_on_change(Supplier, 'suppliers', user_field='created_by_id')
+# Received orders add to the quantities of the inventory items
+invalidate_on_change(SupplierOrder, 'supplier_orders', 'items',
+                     user_field='created_by_id')
+invalidate_on_change(SupplierOrderedItem, 'supplier_orders', 'items',
+                     user_field='created_by_id')
+
+
+@receiver(pre_save, sender=SupplierOrder)
+def set_delivered_at(sender, instance, **kwargs):
+    """Records when the order is marked as delivered"""
+    code = order_status_registry.get_code(instance.delivery_status_id)
+    if code != ORDER_STATUS_CODES['Delivered']:
+        instance.delivered_at = None
+    elif not instance.delivered_at:
+        instance.delivered_at = timezone.now()
+
+
+# Fields the scorecards are computed from
+SCORECARD_FIELDS = {
+    SupplierOrder: ['supplier_id', 'delivery_state', 'delivered_at'],
+    SupplierOrderedItem: ['supplier_id', 'order_id', 'item_id',
+                          'ordered_quantity', 'ordered_price'],
+}
+
+
+def get_scorecard_values(instance) -> dict:
+    """
+    Returns the loaded scorecard fields of instance, read from its
+    __dict__ so that deferred fields are left out instead of fetched
+    """
+    return {field: instance.__dict__[field]
+            for field in SCORECARD_FIELDS[type(instance)]
+            if field in instance.__dict__}
+
+
+@receiver(post_init, sender=SupplierOrder)
+@receiver(post_init, sender=SupplierOrderedItem)
+def record_scorecard_values(sender, instance, **kwargs):
+    """Records the scorecard fields an order or order line was loaded with"""
+    instance._scorecard_values = get_scorecard_values(instance)
+
+
+@receiver(post_save, sender=SupplierOrder)
+@receiver(post_save, sender=SupplierOrderedItem)
+def refresh_scorecard_on_order_save(sender, instance, created, **kwargs):
+    """
+    Refreshes the scorecard of the supplier of a created order, or of a
+    saved order whose scorecard fields changed, and the scorecard of its
+    previous supplier when the order was moved
+    """
+    previous = instance._scorecard_values
+    current = get_scorecard_values(instance)
+    instance._scorecard_values = current
+    fields = SCORECARD_FIELDS[sender]
+    if created or any(field not in previous or field not in current
+                      or previous[field] != current[field]
+                      for field in fields):
+        schedule_scorecard_refresh(instance.supplier_id,
+                                   previous.get('supplier_id'))
+
+
+@receiver(post_delete, sender=SupplierOrder)
+@receiver(post_delete, sender=SupplierOrderedItem)
+def refresh_scorecard_on_order_delete(sender, instance, **kwargs):
+    """Refreshes the scorecard of the supplier of a deleted order"""
+    schedule_scorecard_refresh(instance.supplier_id)
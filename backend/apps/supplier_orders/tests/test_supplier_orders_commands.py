@@ -0,0 +1,79 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.base.factories import UserFactory
+from apps.sales.factories import SaleFactory, SoldItemFactory
+from apps.supplier_orders.models import SupplierOrder, SupplierScorecard
+from apps.supplier_orders.factories import (SupplierFactory,
+                                            SupplierOrderFactory,
+                                            SupplierOrderedItemFactory)
+
+
+@pytest.mark.django_db
+class TestRefreshSupplierScorecardsCommand:
+    """Tests for the refresh_supplier_scorecards management command"""
+
+    def test_refresh_supplier_scorecards(self, user, supplier, item):
+        order = SupplierOrderFactory.create(created_by=user, supplier=supplier)
+        SupplierOrderedItemFactory.create(created_by=user,
+                                          order=order,
+                                          supplier=supplier,
+                                          item=item,
+                                          ordered_quantity=2,
+                                          ordered_price=10)
+        SupplierFactory.create(created_by=user)
+
+        out = StringIO()
+        call_command("refresh_supplier_scorecards", stdout=out)
+
+        assert "Refreshed 2 supplier scorecards." in out.getvalue()
+        scorecard = SupplierScorecard.objects.get(supplier=supplier)
+        assert scorecard.orders_count == 1
+        assert float(scorecard.total_spend) == 20.0
+
+    def test_refresh_supplier_scorecards_for_a_single_user(self, user, supplier):
+        SupplierFactory.create(created_by=UserFactory.create())
+
+        call_command("refresh_supplier_scorecards", "--user", user.username,
+                     stdout=StringIO())
+
+        assert SupplierScorecard.objects.count() == 1
+        assert SupplierScorecard.objects.filter(supplier=supplier).exists()
+
+    def test_refresh_supplier_scorecards_fails_with_nonexistent_user(self):
+        with pytest.raises(CommandError, match="does not exist"):
+            call_command("refresh_supplier_scorecards", "--user", "nobody")
+
+
+@pytest.mark.django_db
+class TestDraftReordersCommand:
+    """Tests for the draft_reorders management command"""
+
+    @pytest.fixture
+    def item_sales(self, user, item):
+        for _ in range(3):
+            SoldItemFactory.create(created_by=user,
+                                   sale=SaleFactory.create(created_by=user),
+                                   item=item,
+                                   sold_quantity=30)
+
+    def test_draft_reorders(self, user, supplier, item, item_sales, pending_status):
+        out = StringIO()
+        call_command("draft_reorders", stdout=out)
+
+        assert "Drafted 1 supplier orders." in out.getvalue()
+        order = SupplierOrder.objects.get(created_by=user)
+        assert str(order.supplier.id) == str(supplier.id)
+        assert order.ordered_items.get().ordered_quantity > 0
+
+    def test_draft_reorders_dry_run(self, user, supplier, item, item_sales):
+        out = StringIO()
+        call_command("draft_reorders", "--dry-run", stdout=out)
+
+        assert f"{user.username} - {supplier.name}: {item.name} x" in out.getvalue()
+        assert not SupplierOrder.objects.exists()
+
+    def test_draft_reorders_fails_with_nonexistent_user(self):
+        with pytest.raises(CommandError, match="does not exist"):
+            call_command("draft_reorders", "--user", "nobody")
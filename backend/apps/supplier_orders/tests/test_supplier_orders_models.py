@@ -1,16 +1,24 @@
 import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError
+from apps.client_orders.factories import OrderStatusFactory
 from apps.supplier_orders.models import (
     Supplier,
     SupplierOrder,
-    SupplierOrderedItem
+    SupplierOrderedItem,
+    SupplierScorecard
 )
 from apps.supplier_orders.factories import (
     SupplierFactory,
     SupplierOrderFactory,
     SupplierOrderedItemFactory
 )
+from apps.supplier_orders.utils import refresh_supplier_scorecard
+from utils.status import ORDER_STATUS_CODES
 
 
 @pytest.mark.django_db
@@ -94,6 +102,41 @@ class TestSupplierOrderModel:
         assert supplier_order.items.count() == 2
         assert all(item.order == supplier_order for item in items)
 
+    def test_supplier_order_states_follow_statuses(
+        self,
+        supplier_order,
+        delivered_status
+    ):
+        assert supplier_order.delivery_state == ORDER_STATUS_CODES['Pending']
+
+        supplier_order.delivery_status = delivered_status
+        supplier_order.save()
+        supplier_order.refresh_from_db()
+
+        assert supplier_order.delivery_state == ORDER_STATUS_CODES['Delivered']
+        assert supplier_order.payment_state == ORDER_STATUS_CODES['Pending']
+
+    def test_supplier_order_delivered_at_follows_delivery_status(
+        self,
+        supplier_order,
+        pending_status,
+        delivered_status
+    ):
+        assert supplier_order.delivered_at is None
+
+        supplier_order.delivery_status = delivered_status
+        supplier_order.save()
+        delivered_at = supplier_order.delivered_at
+        assert delivered_at is not None
+
+        # Saving a delivered order keeps its delivery date
+        supplier_order.save()
+        assert supplier_order.delivered_at == delivered_at
+
+        supplier_order.delivery_status = pending_status
+        supplier_order.save()
+        assert supplier_order.delivered_at is None
+
 
 @pytest.mark.django_db
 class TestSupplierOrderedItemModel:
@@ -154,3 +197,187 @@ class TestSupplierOrderedItemModel:
         ordered_item = SupplierOrderedItemFactory.create(ordered_price=-1)
         with pytest.raises(ValidationError):
             ordered_item.full_clean()
+
+    def test_ordered_item_cannot_receive_more_than_ordered(self):
+        ordered_item = SupplierOrderedItemFactory.create(ordered_quantity=3)
+        with pytest.raises(IntegrityError):
+            SupplierOrderedItem.objects.filter(id=ordered_item.id).update(
+                received_quantity=4
+            )
+
+
+@pytest.mark.django_db
+class TestSupplierScorecardModel:
+    """Tests for SupplierScorecard model"""
+
+    def test_scorecard_metrics(
+        self,
+        user,
+        supplier,
+        item,
+        item_2,
+        delivered_status
+    ):
+        failed_status = OrderStatusFactory.create(name="Failed")
+        orders = SupplierOrderFactory.create_batch(4,
+                                                   created_by=user,
+                                                   supplier=supplier,
+                                                   delivery_status=delivered_status)
+        failed_order = SupplierOrderFactory.create(created_by=user,
+                                                   supplier=supplier,
+                                                   delivery_status=failed_status)
+        # Deliveries took 2, 4, 10 and 12 days
+        for order, days in zip(orders, [2, 4, 10, 12]):
+            SupplierOrder.objects.filter(id=order.id).update(
+                created_at=order.delivered_at - timedelta(days=days)
+            )
+        for order, price in zip(orders[:2], [100, 130]):
+            SupplierOrderedItemFactory.create(created_by=user,
+                                              order=order,
+                                              supplier=supplier,
+                                              item=item,
+                                              ordered_quantity=5,
+                                              ordered_price=price)
+        SupplierOrderedItemFactory.create(created_by=user,
+                                          order=orders[2],
+                                          supplier=supplier,
+                                          item=item_2,
+                                          ordered_quantity=2,
+                                          ordered_price=50)
+        # Failed orders don't count towards spend and prices
+        SupplierOrderedItemFactory.create(created_by=user,
+                                          order=failed_order,
+                                          supplier=supplier,
+                                          item=item,
+                                          ordered_quantity=10,
+                                          ordered_price=999)
+
+        refresh_supplier_scorecard(supplier.id)
+        scorecard = SupplierScorecard.objects.get(supplier=supplier)
+
+        assert scorecard.orders_count == 5
+        assert scorecard.delivered_count == 4
+        assert scorecard.on_time_count == 2
+        assert scorecard.failed_count == 1
+        assert scorecard.average_lead_time == timedelta(days=7)
+        assert scorecard.on_time_rate == 0.5
+        assert scorecard.failure_rate == 0.2
+        assert float(scorecard.total_spend) == 1250.0
+        assert scorecard.item_prices == [
+            {"item": item_2.name, "quantity": 2,
+             "average_price": 50.0, "last_price": 50.0},
+            {"item": item.name, "quantity": 10,
+             "average_price": 115.0, "last_price": 130.0},
+        ]
+
+    def test_scorecard_is_refreshed_once_when_orders_change(
+        self,
+        user,
+        supplier,
+        item,
+        delivered_status,
+        django_capture_on_commit_callbacks
+    ):
+        with patch("apps.supplier_orders.utils.refresh_supplier_scorecard",
+                   wraps=refresh_supplier_scorecard) as refresh, \
+             django_capture_on_commit_callbacks(execute=True):
+            order = SupplierOrderFactory.create(created_by=user,
+                                                supplier=supplier)
+            SupplierOrderedItemFactory.create_batch(3,
+                                                    created_by=user,
+                                                    order=order,
+                                                    supplier=supplier)
+            order.delivery_status = delivered_status
+            order.save()
+
+        refresh.assert_called_once_with(str(supplier.id))
+        scorecard = SupplierScorecard.objects.get(supplier=supplier)
+        assert scorecard.orders_count == 1
+        assert scorecard.delivered_count == 1
+        assert scorecard.average_lead_time is not None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            order.delete()
+
+        scorecard.refresh_from_db()
+        assert scorecard.orders_count == 0
+        assert scorecard.total_spend == 0
+
+    def test_scorecards_of_both_suppliers_are_refreshed_when_order_moves(
+        self,
+        user,
+        supplier,
+        django_capture_on_commit_callbacks
+    ):
+        other_supplier = SupplierFactory.create(created_by=user)
+        with django_capture_on_commit_callbacks(execute=True):
+            order = SupplierOrderFactory.create(created_by=user,
+                                                supplier=supplier)
+            SupplierOrderedItemFactory.create(created_by=user,
+                                              order=order,
+                                              supplier=supplier)
+        assert SupplierScorecard.objects.get(supplier=supplier).orders_count == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            order.supplier = other_supplier
+            order.save()
+            order.items.update(supplier=other_supplier)
+
+        assert SupplierScorecard.objects.get(supplier=supplier).orders_count == 0
+        assert SupplierScorecard.objects.get(
+            supplier=other_supplier
+        ).orders_count == 1
+
+    def test_scorecard_is_not_refreshed_when_other_fields_change(
+        self,
+        user,
+        supplier,
+        django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            order = SupplierOrderFactory.create(created_by=user,
+                                                supplier=supplier)
+            ordered_item = SupplierOrderedItemFactory.create(created_by=user,
+                                                             order=order,
+                                                             supplier=supplier)
+        order = SupplierOrder.objects.get(id=order.id)
+        ordered_item = SupplierOrderedItem.objects.get(id=ordered_item.id)
+
+        with patch("apps.supplier_orders.utils.refresh_supplier_scorecard",
+                   wraps=refresh_supplier_scorecard) as refresh, \
+             django_capture_on_commit_callbacks(execute=True), \
+             CaptureQueriesContext(connection) as context:
+            order.tracking_number = "TRACK-1"
+            order.save()
+            ordered_item.save()
+        refresh.assert_not_called()
+        # The previous supplier is known without querying the saved rows
+        assert not any(query['sql'].startswith('SELECT')
+                       for query in context.captured_queries)
+
+        with patch("apps.supplier_orders.utils.refresh_supplier_scorecard",
+                   wraps=refresh_supplier_scorecard) as refresh, \
+             django_capture_on_commit_callbacks(execute=True):
+            ordered_item.ordered_quantity += 1
+            ordered_item.save()
+        refresh.assert_called_once_with(str(supplier.id))
+
+    def test_refreshes_of_rolled_back_savepoints_are_not_kept(
+        self,
+        user,
+        supplier,
+        django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    SupplierOrderFactory.create(created_by=user,
+                                                supplier=supplier)
+                    raise ValueError
+            except ValueError:
+                pass
+            # The batch of the rolled back savepoint is dropped with it
+            SupplierOrderFactory.create(created_by=user, supplier=supplier)
+
+        scorecard = SupplierScorecard.objects.get(supplier=supplier)
+        assert scorecard.orders_count == 1
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 import copy
 from unittest.mock import patch
 from rest_framework.exceptions import ValidationError
@@ -1660,6 +1662,139 @@ class TestSupplierOrderSerializer:
         # Verify that ordered_item_2 has been removed from the order ordered items
         assert str(ordered_item_2.item.id) not in updated_items_ids
     
+    def test_ordered_items_update_runs_a_constant_number_of_queries(
+        self,
+        user,
+        supplier
+    ):
+        queries_counts = []
+        for lines_count in [1, 4]:
+            order = SupplierOrderFactory.create(created_by=user,
+                                                supplier=supplier)
+            items = ItemFactory.create_batch(3 * lines_count,
+                                             created_by=user,
+                                             supplier=None)
+            kept_items = items[:lines_count]
+            removed_items = items[lines_count:2 * lines_count]
+            added_items = items[2 * lines_count:]
+            for item in kept_items + removed_items:
+                SupplierOrderedItemFactory.create(created_by=user,
+                                                  order=order,
+                                                  supplier=supplier,
+                                                  item=item)
+
+            new_ordered_items = [
+                {"item": item.name, "ordered_quantity": 3, "ordered_price": 50}
+                for item in kept_items + added_items
+            ]
+            new_ordered_items.extend(
+                {"item": f"New item {lines_count}-{i}",
+                 "ordered_quantity": 3,
+                 "ordered_price": 50}
+                for i in range(lines_count)
+            )
+            serializer = SupplierOrderSerializer(context={"user": user})
+            with CaptureQueriesContext(connection) as queries:
+                serializer.update_ordered_items_for_supplier_order(
+                    user,
+                    order,
+                    supplier,
+                    new_ordered_items
+                )
+            queries_counts.append(len(queries))
+
+            assert order.ordered_items.count() == 3 * lines_count
+            assert not order.ordered_items.filter(item__in=removed_items).exists()
+            assert all(
+                ordered_item.ordered_quantity == 3
+                for ordered_item in order.ordered_items.all()
+            )
+            # New items are created and existing ones are
+            # linked to the order's supplier
+            assert Item.objects.filter(
+                created_by=user,
+                name__startswith=f"New item {lines_count}-",
+                supplier=supplier
+            ).count() == lines_count
+            added_item = Item.objects.get(id=added_items[0].id)
+            assert str(added_item.supplier.id) == str(supplier.id)
+
+        assert queries_counts[0] == queries_counts[1]
+
+    def test_ordered_items_inventory_state_update_locks_order_and_runs_one_update(
+        self,
+        user,
+        supplier
+    ):
+        order = SupplierOrderFactory.create(created_by=user, supplier=supplier)
+        stocked_items = ItemFactory.create_batch(25,
+                                                 created_by=user,
+                                                 supplier=supplier,
+                                                 quantity=10,
+                                                 price=100,
+                                                 in_inventory=True)
+        new_items = ItemFactory.create_batch(25,
+                                             created_by=user,
+                                             supplier=supplier,
+                                             quantity=5,
+                                             in_inventory=False)
+        for item in stocked_items + new_items:
+            SupplierOrderedItemFactory.create(created_by=user,
+                                              order=order,
+                                              supplier=supplier,
+                                              item=item,
+                                              ordered_quantity=5,
+                                              ordered_price=130)
+
+        serializer = SupplierOrderSerializer(context={"user": user})
+        with CaptureQueriesContext(connection) as queries:
+            serializer.update_ordered_items_inventory_state(user, order)
+        # The order is locked before a single statement receives its items
+        assert len(queries) == 2
+        assert queries[0]['sql'].endswith('FOR UPDATE')
+
+        # Stocked items get the weighted average price of both costs
+        for item in Item.objects.filter(id__in=[item.id for item in stocked_items]):
+            assert item.quantity == 15
+            assert float(item.price) == 110.0
+        # Items not in inventory get the ordered quantity and price
+        for item in Item.objects.filter(id__in=[item.id for item in new_items]):
+            assert item.in_inventory
+            assert item.quantity == 5
+            assert float(item.price) == 130.0
+        assert all(
+            ordered_item.received_quantity == 5
+            for ordered_item in order.ordered_items.all()
+        )
+
+        # Fully received items are not received twice
+        serializer.update_ordered_items_inventory_state(user, order)
+        assert Item.objects.get(id=stocked_items[0].id).quantity == 15
+
+    def test_ordered_items_update_fails_below_received_quantity(
+        self,
+        user,
+        supplier,
+        item
+    ):
+        order = SupplierOrderFactory.create(created_by=user, supplier=supplier)
+        SupplierOrderedItemFactory.create(created_by=user,
+                                          order=order,
+                                          supplier=supplier,
+                                          item=item,
+                                          ordered_quantity=10,
+                                          received_quantity=6)
+
+        serializer = SupplierOrderSerializer(context={"user": user})
+        with pytest.raises(ValidationError) as errors:
+            serializer.update_ordered_items_for_supplier_order(
+                user,
+                order,
+                supplier,
+                [{"item": item.name, "ordered_quantity": 5, "ordered_price": 50}]
+            )
+        assert "has already received 6 units" in str(errors.value)
+
     def test_order_update_removes_optional_fields_if_set_to_none(
         self,
         user,
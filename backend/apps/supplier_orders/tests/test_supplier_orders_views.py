@@ -1,15 +1,25 @@
 import pytest
+import json
 import uuid
 import random
+from datetime import timedelta
 from typing import Union
+from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from apps.base.models import Activity
 from apps.inventory.factories import ItemFactory
 from apps.client_orders.factories import OrderStatusFactory
+from apps.sales.models import Sale
+from apps.sales.factories import SaleFactory, SoldItemFactory
+from apps.supplier_orders import serializers
 from apps.supplier_orders.models import (
     Supplier,
     SupplierOrder,
-    SupplierOrderedItem
+    SupplierOrderedItem,
+    SupplierScorecard
 )
 from apps.supplier_orders.factories import (
     SupplierFactory,
@@ -33,6 +43,10 @@ def create_list_supplier_url():
 def bulk_delete_suppliers_url():
     return reverse('bulk_delete_suppliers')
 
+@pytest.fixture
+def list_scorecards_url():
+    return reverse('list_supplier_scorecards')
+
 def supplier_url(supplier_id: str):
     return reverse('get_update_delete_suppliers', kwargs={"id": supplier_id})
 
@@ -44,9 +58,16 @@ def create_list_orders_url():
 def bulk_delete_orders_url():
     return reverse('bulk_delete_supplier_orders')
 
+@pytest.fixture
+def reorder_suggestions_url():
+    return reverse('reorder_suggestions')
+
 def order_url(order_id: str):
     return reverse('get_update_delete_supplier_orders', kwargs={"id": order_id})
 
+def receive_order_url(order_id: str):
+    return reverse('receive_supplier_ordered_items', kwargs={"id": order_id})
+
 def ordered_item_url(order_id: str, item_id: Union[str, None]=None):
     """
     Returns the URL for the create_list_supplier_ordered_items or
@@ -237,18 +258,81 @@ class TestCreateListSuppliersView:
         res = api_client.get(create_list_supplier_url)
         assert res.status_code == 200
 
-        assert isinstance(res.data, list)
-        assert len(res.data) == 7
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == 7
 
         # Verify that all suppliers belong to the authenticated user
         assert all(supplier["created_by"] == str(user.username)
-                   for supplier in res.data)
+                   for supplier in res.data["results"])
 
         user_supplier_ids = set(str(supplier.id) for supplier in user_suppliers)
         assert all(
             supplier["id"] in user_supplier_ids
-            for supplier in res.data
+            for supplier in res.data["results"]
+        )
+
+    def test_list_suppliers_with_stats(
+        self,
+        user,
+        auth_client,
+        create_list_supplier_url,
+        supplier,
+        item
+    ):
+        other_supplier = SupplierFactory.create(created_by=user)
+        order = SupplierOrderFactory.create(created_by=user, supplier=supplier)
+        SupplierOrderedItemFactory.create(created_by=user,
+                                          order=order,
+                                          supplier=supplier,
+                                          item=item,
+                                          ordered_quantity=4,
+                                          ordered_price=10)
+        # Canceled orders are counted but not spent on
+        canceled_order = SupplierOrderFactory.create(
+            created_by=user,
+            supplier=supplier,
+            delivery_status=OrderStatusFactory.create(name="Canceled")
         )
+        SupplierOrderedItemFactory.create(created_by=user,
+                                          order=canceled_order,
+                                          supplier=supplier,
+                                          item=item,
+                                          ordered_quantity=2,
+                                          ordered_price=10)
+
+        res = auth_client.get(create_list_supplier_url,
+                              {"ordering": "-total_spend"})
+        assert res.status_code == 200
+        assert [data["id"] for data in res.data["results"]] == [str(supplier.id),
+                                                      str(other_supplier.id)]
+
+        supplier_data, other_supplier_data = res.data["results"]
+        assert supplier_data["total_items"] == 1
+        assert supplier_data["total_orders"] == 2
+        assert supplier_data["total_spend"] == 40.0
+        canceled_order.refresh_from_db()
+        assert supplier_data["last_order_date"] == date_repr_format(
+            canceled_order.created_at)
+
+        assert other_supplier_data["total_items"] == 0
+        assert other_supplier_data["total_orders"] == 0
+        assert other_supplier_data["total_spend"] == 0.0
+        assert other_supplier_data["last_order_date"] is None
+
+    def test_list_suppliers_runs_a_constant_number_of_queries(
+        self,
+        user,
+        auth_client,
+        create_list_supplier_url,
+        django_assert_max_num_queries
+    ):
+        for supplier in SupplierFactory.create_batch(10, created_by=user)[:5]:
+            SupplierOrderFactory.create(created_by=user, supplier=supplier)
+
+        with django_assert_max_num_queries(2):
+            res = auth_client.get(create_list_supplier_url)
+        assert res.status_code == 200
+        assert len(res.data["results"]) == 10
 
 
 @pytest.mark.django_db
@@ -519,6 +603,122 @@ class TestGetUpdateDeleteSuppliersView:
         )
 
 
+@pytest.mark.django_db
+class TestListSupplierScorecardsView:
+    """Tests for the supplier scorecards listing view"""
+
+    @pytest.fixture
+    def scorecards(self, user):
+        return [
+            SupplierScorecard.objects.create(
+                supplier=SupplierFactory.create(created_by=user, name=name),
+                orders_count=orders_count,
+                on_time_rate=on_time_rate,
+                failure_rate=failure_rate,
+                total_spend=total_spend
+            )
+            for name, orders_count, on_time_rate, failure_rate, total_spend in [
+                ("Acme", 10, 0.9, 0.0, 1000),
+                ("Globex", 4, 0.5, 0.25, 300),
+                ("Initech", 0, None, None, 0),
+            ]
+        ]
+
+    def test_list_scorecards(self, auth_client, list_scorecards_url, scorecards):
+        SupplierScorecard.objects.create(supplier=SupplierFactory.create())
+
+        res = auth_client.get(list_scorecards_url)
+        assert res.status_code == 200
+        assert {scorecard["supplier"] for scorecard in res.data["results"]} == {
+            "Acme", "Globex", "Initech"
+        }
+
+    def test_list_scorecards_sorted(
+        self,
+        auth_client,
+        list_scorecards_url,
+        scorecards
+    ):
+        res = auth_client.get(list_scorecards_url, {"ordering": "-on_time_rate"})
+        assert [scorecard["supplier"] for scorecard in res.data["results"]] == [
+            "Acme", "Globex", "Initech"
+        ]
+
+        res = auth_client.get(list_scorecards_url, {"ordering": "total_spend"})
+        assert [scorecard["supplier"] for scorecard in res.data["results"]] == [
+            "Initech", "Globex", "Acme"
+        ]
+
+    def test_list_scorecards_sorted_are_paged_by_offset(
+        self,
+        auth_client,
+        list_scorecards_url,
+        scorecards
+    ):
+        res = auth_client.get(list_scorecards_url, {"ordering": "-on_time_rate",
+                                                    "page_size": 2})
+        assert res.status_code == 200
+        assert res.data["count"] == 3
+        assert [scorecard["supplier"] for scorecard in res.data["results"]] == [
+            "Acme", "Globex"
+        ]
+
+        res = auth_client.get(res.data["next"])
+        assert [scorecard["supplier"] for scorecard in res.data["results"]] == [
+            "Initech"
+        ]
+
+    def test_export_scorecards_keeps_filters_and_ordering(
+        self,
+        auth_client,
+        list_scorecards_url,
+        scorecards
+    ):
+        res = auth_client.get(list_scorecards_url, {"ordering": "total_spend",
+                                                    "max_failure_rate": "0.3",
+                                                    "export": "ndjson"})
+        assert res.status_code == 200
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        assert [json.loads(line)["supplier"] for line in lines] == [
+            "Globex", "Acme"
+        ]
+
+    def test_list_scorecards_filtered(
+        self,
+        auth_client,
+        list_scorecards_url,
+        scorecards
+    ):
+        res = auth_client.get(list_scorecards_url, {"min_on_time_rate": "0.8"})
+        assert [scorecard["supplier"] for scorecard in res.data["results"]] == ["Acme"]
+
+        res = auth_client.get(list_scorecards_url, {"max_failure_rate": "0.3",
+                                                    "supplier": "glo"})
+        assert [scorecard["supplier"] for scorecard in res.data["results"]] == ["Globex"]
+
+    def test_list_scorecards_fails_with_invalid_rate(
+        self,
+        auth_client,
+        list_scorecards_url
+    ):
+        res = auth_client.get(list_scorecards_url, {"min_on_time_rate": "high"})
+        assert res.status_code == 400
+        assert res.data["error"] == "'min_on_time_rate' must be a number."
+
+    def test_list_scorecards_does_not_query_orders(
+        self,
+        auth_client,
+        list_scorecards_url,
+        scorecards,
+        django_assert_max_num_queries
+    ):
+        with django_assert_max_num_queries(1) as queries:
+            res = auth_client.get(list_scorecards_url)
+        assert len(res.data["results"]) == 3
+        assert all("supplierorder" not in query["sql"]
+                   for query in queries.captured_queries)
+
+
 @pytest.mark.django_db
 class TestBulkDeleteSuppliersView:
     """Tests for the bulk delete suppliers view."""
@@ -944,17 +1144,17 @@ class TestCreateListSupplierOrdersView:
         res = api_client.get(create_list_orders_url)
         assert res.status_code == 200
 
-        assert isinstance(res.data, list)
-        assert len(res.data) == 7
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == 7
 
         # Verify that all orders belong to the authenticated user
         assert all(order["created_by"] == str(user.username)
-                   for order in res.data)
+                   for order in res.data["results"])
 
         user_orders_ids = {str(order.id) for order in user_orders}
         assert all(
             order["id"] in user_orders_ids
-            for order in res.data
+            for order in res.data["results"]
         )
 
 
@@ -1367,6 +1567,331 @@ class TestGetUpdateDeleteSupplierOrdersView:
         ).exists()
 
 
+@pytest.mark.django_db
+class TestReceiveSupplierOrderedItemsView:
+    """Tests for the supplier ordered items partial receipts view"""
+
+    @pytest.fixture
+    def order_lines(self, user, supplier, supplier_order, item, item_2):
+        item.price = 100
+        item.save()
+        return [
+            SupplierOrderedItemFactory.create(created_by=user,
+                                              order=supplier_order,
+                                              supplier=supplier,
+                                              item=ordered_item,
+                                              ordered_quantity=10,
+                                              ordered_price=130)
+            for ordered_item in [item, item_2]
+        ]
+
+    def test_receive_ordered_items_partially(
+        self,
+        auth_client,
+        supplier_order,
+        order_lines,
+        item,
+        delivered_status
+    ):
+        res = auth_client.post(
+            receive_order_url(supplier_order.id),
+            {"ordered_items": [{"id": str(order_lines[0].id),
+                                "received_quantity": 5}]},
+            format="json"
+        )
+        assert res.status_code == 200
+        assert res.data["delivery_status"] != "Delivered"
+        received = {str(line["id"]): line["received_quantity"]
+                    for line in res.data["ordered_items"]}
+        assert received == {str(order_lines[0].id): 5,
+                            str(order_lines[1].id): 0}
+
+        # Received units are added at their weighted average cost
+        item.refresh_from_db()
+        assert item.quantity == 10
+        assert float(item.price) == 115.0
+
+    def test_receive_remaining_ordered_items_delivers_order(
+        self,
+        auth_client,
+        supplier_order,
+        order_lines,
+        item,
+        item_2,
+        delivered_status
+    ):
+        url = receive_order_url(supplier_order.id)
+        auth_client.post(url,
+                         {"ordered_items": [{"id": str(order_lines[0].id),
+                                             "received_quantity": 4}]},
+                         format="json")
+        res = auth_client.post(
+            url,
+            {"ordered_items": [
+                {"id": str(order_lines[0].id), "received_quantity": 6},
+                {"id": str(order_lines[1].id), "received_quantity": 10},
+            ]},
+            format="json"
+        )
+        assert res.status_code == 200
+        assert res.data["delivery_status"] == "Delivered"
+        item.refresh_from_db()
+        item_2.refresh_from_db()
+        assert item.quantity == 15
+        assert item_2.quantity == 15
+
+        # Delivered orders can't receive anything else
+        res = auth_client.post(url,
+                               {"ordered_items": [{"id": str(order_lines[0].id),
+                                                   "received_quantity": 1}]},
+                               format="json")
+        assert res.status_code == 400
+        assert "already been delivered" in res.data["error"]
+
+    @pytest.mark.parametrize("status_name", ["Canceled", "Failed", "Returned"])
+    def test_receive_ordered_items_fails_for_unfulfilled_orders(
+        self,
+        auth_client,
+        supplier_order,
+        order_lines,
+        item,
+        status_name
+    ):
+        supplier_order.delivery_status = OrderStatusFactory.create(name=status_name)
+        supplier_order.save()
+
+        res = auth_client.post(
+            receive_order_url(supplier_order.id),
+            {"ordered_items": [{"id": str(order_lines[0].id),
+                                "received_quantity": 5}]},
+            format="json"
+        )
+        assert res.status_code == 400
+        assert res.data["error"] == (
+            f"Cannot receive items of order '{supplier_order.reference_id}' "
+            f"marked as {status_name}."
+        )
+        order_lines[0].refresh_from_db()
+        assert order_lines[0].received_quantity == 0
+        item.refresh_from_db()
+        assert item.quantity == 5
+        assert float(item.price) == 100.0
+
+    def test_receive_ordered_items_fails_above_remaining_quantity(
+        self,
+        auth_client,
+        supplier_order,
+        order_lines,
+        item
+    ):
+        res = auth_client.post(
+            receive_order_url(supplier_order.id),
+            {"ordered_items": [{"id": str(order_lines[0].id),
+                                "received_quantity": 11}]},
+            format="json"
+        )
+        assert res.status_code == 400
+        assert "Only 10 units" in str(res.data["ordered_items"])
+        item.refresh_from_db()
+        assert item.quantity == 5
+
+    def test_receive_ordered_items_fails_with_items_of_another_order(
+        self,
+        user,
+        auth_client,
+        supplier_order,
+        order_lines
+    ):
+        other_line = SupplierOrderedItemFactory.create(created_by=user)
+        res = auth_client.post(
+            receive_order_url(supplier_order.id),
+            {"ordered_items": [{"id": str(other_line.id),
+                                "received_quantity": 1}]},
+            format="json"
+        )
+        assert res.status_code == 400
+        assert "is not part of this order" in str(res.data["ordered_items"])
+
+    def test_receive_ordered_items_revalidates_the_locked_order(
+        self,
+        auth_client,
+        supplier_order,
+        order_lines,
+        item
+    ):
+        validate = serializers.SupplierOrderReceiptSerializer.validate_ordered_items
+
+        def validate_then_receive_elsewhere(serializer, value):
+            quantities = validate(serializer, value)
+            # Another receipt is saved once this one has been validated
+            SupplierOrderedItem.objects.filter(id=order_lines[0].id).update(
+                received_quantity=8
+            )
+            return quantities
+
+        with patch.object(serializers.SupplierOrderReceiptSerializer,
+                          'validate_ordered_items',
+                          validate_then_receive_elsewhere), \
+             CaptureQueriesContext(connection) as context:
+            res = auth_client.post(
+                receive_order_url(supplier_order.id),
+                {"ordered_items": [{"id": str(order_lines[0].id),
+                                    "received_quantity": 5}]},
+                format="json"
+            )
+        assert res.status_code == 400
+        assert "Only 2 units" in str(res.data["ordered_items"])
+        assert any(query['sql'].endswith('FOR UPDATE')
+                   for query in context.captured_queries)
+        item.refresh_from_db()
+        assert item.quantity == 5
+
+
+@pytest.mark.django_db
+class TestReorderSuggestionsView:
+    """Tests for the reorder suggestions view"""
+
+    @pytest.fixture
+    def item_sales(self, user, item, item_2):
+        """Sells 2 units of item a day over the last 10 days"""
+        now = timezone.now()
+        for days in range(10):
+            sale = SaleFactory.create(created_by=user)
+            Sale.objects.filter(id=sale.id).update(
+                created_at=now - timedelta(days=days)
+            )
+            SoldItemFactory.create(created_by=user,
+                                   sale=sale,
+                                   item=item,
+                                   sold_quantity=2)
+        # Canceled sales are not part of the demand
+        canceled_sale = SaleFactory.create(
+            created_by=user,
+            delivery_status=OrderStatusFactory.create(name="Canceled")
+        )
+        SoldItemFactory.create(created_by=user,
+                               sale=canceled_sale,
+                               item=item_2,
+                               sold_quantity=50)
+
+    def test_reorder_suggestions(
+        self,
+        auth_client,
+        reorder_suggestions_url,
+        supplier,
+        item,
+        item_sales
+    ):
+        res = auth_client.get(reorder_suggestions_url, {"window_days": 10})
+        assert res.status_code == 200
+        assert len(res.data) == 1
+
+        group = res.data[0]
+        assert group["supplier"] == supplier.name
+        assert group["lead_time_days"] == 7
+        assert group["items"] == [{
+            "item": item.name,
+            "quantity": 5,
+            "on_order": 0,
+            "daily_velocity": 2.0,
+            "days_of_cover": 2.5,
+            # 2 units a day over 7 days of lead time and 30 days of cover
+            "suggested_quantity": 69,
+            "unit_price": float(item.price),
+        }]
+        assert group["total_cost"] == round(float(item.price) * 69, 2)
+
+    def test_reorder_suggestions_count_incoming_quantities(
+        self,
+        user,
+        auth_client,
+        reorder_suggestions_url,
+        supplier,
+        supplier_order,
+        item,
+        item_sales
+    ):
+        SupplierOrderedItemFactory.create(created_by=user,
+                                          order=supplier_order,
+                                          supplier=supplier,
+                                          item=item,
+                                          ordered_quantity=20)
+
+        res = auth_client.get(reorder_suggestions_url,
+                              {"window_days": 10, "cover_days": 10})
+        item_suggestion = res.data[0]["items"][0]
+        assert item_suggestion["on_order"] == 20
+        assert item_suggestion["suggested_quantity"] == 9
+
+    def test_reorder_suggestions_fails_with_invalid_params(
+        self,
+        auth_client,
+        reorder_suggestions_url
+    ):
+        res = auth_client.get(reorder_suggestions_url, {"window_days": "0"})
+        assert res.status_code == 400
+        assert res.data["error"] == "'window_days' must be a positive integer."
+
+    def test_draft_reorder_supplier_orders(
+        self,
+        user,
+        auth_client,
+        reorder_suggestions_url,
+        supplier,
+        item,
+        item_sales,
+        pending_status
+    ):
+        res = auth_client.post(reorder_suggestions_url,
+                               {"window_days": 10},
+                               format="json")
+        assert res.status_code == 201
+        assert len(res.data) == 1
+        assert res.data[0]["supplier"] == supplier.name
+        assert res.data[0]["delivery_status"] == "Pending"
+
+        order = SupplierOrder.objects.get(id=res.data[0]["id"])
+        assert order.delivery_state == 1
+        ordered_item = order.ordered_items.get()
+        assert str(ordered_item.item.id) == str(item.id)
+        assert ordered_item.ordered_quantity == 69
+
+        # Drafted quantities are now incoming so nothing is left to draft
+        res = auth_client.post(reorder_suggestions_url,
+                               {"window_days": 10},
+                               format="json")
+        assert res.status_code == 400
+        assert res.data["error"] == "No reorder suggestions to draft."
+
+    def test_draft_reorder_supplier_orders_for_given_suppliers(
+        self,
+        auth_client,
+        reorder_suggestions_url,
+        item_sales
+    ):
+        res = auth_client.post(reorder_suggestions_url,
+                               {"window_days": 10, "suppliers": ["Other"]},
+                               format="json")
+        assert res.status_code == 400
+        assert SupplierOrder.objects.count() == 0
+
+    @pytest.mark.parametrize("suppliers", ["Supplier", [1, 2], [["Supplier"]],
+                                           [None], [{"name": "Supplier"}]])
+    def test_draft_reorder_supplier_orders_fails_with_invalid_suppliers(
+        self,
+        auth_client,
+        reorder_suggestions_url,
+        item_sales,
+        suppliers
+    ):
+        res = auth_client.post(reorder_suggestions_url,
+                               {"window_days": 10, "suppliers": suppliers},
+                               format="json")
+        assert res.status_code == 400
+        assert res.data["error"] == "'suppliers' must be a list of supplier names."
+        assert SupplierOrder.objects.count() == 0
+
+
 @pytest.mark.django_db
 class TestBulkDeleteSupplierOrdersView:
     """Tests for the bulk delete supplier orders view."""
@@ -1772,20 +2297,20 @@ class TestCreateListSupplierOrderedItemsView:
         res = api_client.get(url)
         assert res.status_code == 200
 
-        assert isinstance(res.data, list)
-        assert len(res.data) == len(user_items)
+        assert isinstance(res.data["results"], list)
+        assert len(res.data["results"]) == len(user_items)
 
         # Verify that all ordered items belong to the correct order and user
         assert all(
             str(item["order"]) == str(supplier_order.id)
             and item["created_by"] == user.username
-            for item in res.data
+            for item in res.data["results"]
         )
 
         user_item_ids = {str(item.id) for item in user_items}
         assert all(
             item["id"] in user_item_ids
-            for item in res.data
+            for item in res.data["results"]
         )
 
 
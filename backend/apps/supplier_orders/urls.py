@@ -7,6 +7,9 @@ urlpatterns = [
     path('suppliers/',
         views.CreateListSuppliers.as_view(),
         name='create_list_suppliers'),
+    path('suppliers/scorecards/',
+        views.ListSupplierScorecards.as_view(),
+        name='list_supplier_scorecards'),
     path('suppliers/bulk_delete/',
         views.BulkDeleteSuppliers.as_view(),
         name='bulk_delete_suppliers'),
@@ -18,12 +21,18 @@ urlpatterns = [
     path('',
         views.CreateListSupplierOrders.as_view(),
         name='create_list_supplier_orders'),
+    path('reorder_suggestions/',
+        views.ReorderSuggestions.as_view(),
+        name='reorder_suggestions'),
     path('bulk_delete/',
         views.BulkDeleteSupplierOrders.as_view(),
         name='bulk_delete_supplier_orders'),
     path('<uuid:id>/',
         views.GetUpdateDeleteSupplierOrders.as_view(),
         name='get_update_delete_supplier_orders'),
+    path('<uuid:id>/receive/',
+        views.ReceiveSupplierOrderedItems.as_view(),
+        name='receive_supplier_ordered_items'),
     
     # Supplier Ordered Items
     path('<uuid:order_id>/items/',
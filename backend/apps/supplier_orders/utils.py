@@ -1,9 +1,55 @@
 from rest_framework.exceptions import NotFound
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (F, Q, Avg, Count, Max, Sum, OuterRef, Subquery,
+                              Value, DecimalField, ExpressionWrapper, QuerySet)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from datetime import timedelta
 from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Union
 from uuid import UUID
+import numpy as np
+from utils.activity import register_activity
+from utils.cache import invalidate_on_commit
+from utils.transactions import on_commit_batch
+from utils.serializers import decimal_to_float
+from utils.status import (ORDER_STATUS_CODES,
+                          ACTIVE_DELIVERY_STATUS,
+                          get_status_codes)
+from utils.status_registry import order_status_registry
 from ..base.models import User
+from ..inventory.forecasting import daily_sales_matrix
 from ..inventory.models import Item
-from .models import SupplierOrder, SupplierOrderedItem
+from ..sales.models import SoldItem
+from .models import (Supplier,
+                     SupplierOrder,
+                     SupplierOrderedItem,
+                     SupplierScorecard)
+
+
+# Orders that did not end up being supplied
+UNFULFILLED_STATUS = ['Canceled', 'Failed', 'Returned']
+
+SCORECARD_ORDERING_FIELDS = {
+    'supplier': 'supplier__name',
+    'orders_count': 'orders_count',
+    'average_lead_time': 'average_lead_time',
+    'on_time_rate': 'on_time_rate',
+    'failure_rate': 'failure_rate',
+    'total_spend': 'total_spend',
+    'last_order_date': 'last_order_date',
+}
+
+
+SUPPLIER_ORDERING_FIELDS = {
+    'name': 'name',
+    'created_at': 'created_at',
+    'total_items': 'items_count',
+    'total_orders': 'orders_count',
+    'total_spend': 'total_spend',
+    'last_order_date': 'last_order_date',
+}
 
 
 def validate_supplier_order(order_id: UUID, user: User):
@@ -12,7 +58,443 @@ def validate_supplier_order(order_id: UUID, user: User):
         raise NotFound(f"Order with id '{order_id}' does not exist.")
     return order
 
+
+def get_receipt_error(order: SupplierOrder) -> Union[str, None]:
+    """Returns why the order's items cannot be received if they can't"""
+    if order.delivery_state == ORDER_STATUS_CODES['Delivered']:
+        return f"Order '{order.reference_id}' has already been delivered."
+    # Canceled, failed or returned orders never reach the inventory
+    if order.delivery_state in get_status_codes(UNFULFILLED_STATUS):
+        return (f"Cannot receive items of order '{order.reference_id}' "
+                f"marked as {order.delivery_status.name}.")
+    return None
+
+
 def average_price(item: Item, ordered_item: SupplierOrderedItem):
     total_quantity = item.quantity + ordered_item.ordered_quantity
     av_price = (item.total_price + ordered_item.total_price) / total_quantity
     return av_price.quantize(Decimal('.01'), rounding=ROUND_HALF_UP)
+
+
+def annotate_suppliers_stats(queryset: QuerySet[Supplier]) -> QuerySet[Supplier]:
+    """
+    Annotates suppliers with their items and orders counts, total spend
+    and last order date in a single grouped query.
+    As on the scorecards, the spend only accounts for orders that were
+    not canceled, failed or returned.
+    """
+    money_field = DecimalField(max_digits=12, decimal_places=2)
+
+    items_count = (
+        Item.objects
+        .filter(supplier=OuterRef('pk'))
+        .values('supplier')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    total_spend = (
+        SupplierOrderedItem.objects
+        .filter(order__supplier=OuterRef('pk'))
+        .exclude(order__delivery_state__in=get_status_codes(UNFULFILLED_STATUS))
+        .values('order__supplier')
+        .annotate(total=Sum(F('ordered_quantity') * F('ordered_price'),
+                            output_field=money_field))
+        .values('total')
+    )
+
+    return queryset.annotate(
+        items_count=Coalesce(Subquery(items_count), Value(0)),
+        orders_count=Count('orders', distinct=True),
+        total_spend=Coalesce(Subquery(total_spend),
+                             Value(0, output_field=money_field)),
+        last_order_date=Max('orders__created_at'),
+    )
+
+
+def receive_ordered_items(
+    user: User,
+    order: SupplierOrder,
+    quantities: Union[Dict[str, int], None] = None
+) -> int:
+    """
+    Adds the received quantities of the order's ordered items to the
+    inventory and returns the number of updated inventory items.
+    quantities maps ordered item ids to the received quantity of partial
+    receipts; every line's remaining quantity is received when omitted.
+    Received quantities are capped to what remains to be received and
+    item prices become the weighted average of the stock and received
+    costs. Lines and items are updated in a single statement, once the
+    order is locked so concurrent receipts of it run one after the other
+    and each one reads the remaining quantities the previous one left.
+    Must be called inside a transaction.
+    """
+    if quantities is not None and not quantities:
+        return 0
+
+    SupplierOrder.objects.select_for_update().only('id').get(pk=order.pk)
+
+    quote = connection.ops.quote_name
+    item_table = quote(Item._meta.db_table)
+    line_table = quote(SupplierOrderedItem._meta.db_table)
+    params = {
+        'order_id': order.id,
+        'user_id': user.id,
+        'now': timezone.now(),
+    }
+
+    remaining = "l.ordered_quantity - l.received_quantity"
+    if quantities is None:
+        receipts = f"SELECT l.id, l.item_id, {remaining} AS quantity, " \
+                   f"l.ordered_price AS price FROM {line_table} l"
+    else:
+        values = []
+        for i, (line_id, quantity) in enumerate(quantities.items()):
+            values.append(f"(%(line_{i})s::uuid, %(quantity_{i})s::integer)")
+            params[f'line_{i}'] = str(line_id)
+            params[f'quantity_{i}'] = quantity
+        receipts = (
+            f"SELECT l.id, l.item_id, LEAST(v.quantity, {remaining}) AS quantity, "
+            f"l.ordered_price AS price FROM {line_table} l "
+            f"JOIN (VALUES {', '.join(values)}) AS v (line_id, quantity) "
+            "ON v.line_id = l.id"
+        )
+
+    sql = (
+        f"WITH receipts AS ({receipts} "
+        "  WHERE l.order_id = %(order_id)s"
+        "  AND l.received_quantity < l.ordered_quantity"
+        "), received_lines AS ("
+        f"  UPDATE {line_table} l"
+        "   SET received_quantity = l.received_quantity + r.quantity,"
+        "       updated_at = %(now)s"
+        "   FROM receipts r WHERE l.id = r.id AND r.quantity > 0"
+        ") "
+        f"UPDATE {item_table} i SET "
+        "quantity = CASE WHEN i.in_inventory"
+        " THEN i.quantity + r.quantity ELSE r.quantity END, "
+        "price = CASE WHEN i.in_inventory AND i.quantity > 0"
+        " THEN ROUND((i.quantity * i.price + r.quantity * r.price)"
+        "            / (i.quantity + r.quantity), 2)"
+        " ELSE r.price END, "
+        "in_inventory = TRUE, "
+        "updated_at = %(now)s "
+        "FROM receipts r "
+        "WHERE i.id = r.item_id AND i.created_by_id = %(user_id)s "
+        "AND r.quantity > 0"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def refresh_supplier_scorecard(supplier_id: UUID) -> SupplierScorecard:
+    """
+    Recomputes the scorecard of the given supplier from its orders.
+    Orders delivered within SUPPLIER_ON_TIME_DAYS of their creation are
+    on time. Spend and unit prices only account for orders that were
+    not canceled, failed or returned.
+    """
+    delivered = Q(delivery_state=ORDER_STATUS_CODES['Delivered'],
+                  delivered_at__isnull=False)
+    on_time_delay = timedelta(days=getattr(settings, 'SUPPLIER_ON_TIME_DAYS', 7))
+    money_field = DecimalField(max_digits=12, decimal_places=2)
+
+    orders_stats = SupplierOrder.objects.filter(supplier_id=supplier_id).aggregate(
+        orders_count=Count('id'),
+        delivered_count=Count('id', filter=delivered),
+        on_time_count=Count('id', filter=delivered & Q(
+            delivered_at__lte=F('created_at') + on_time_delay)),
+        failed_count=Count('id', filter=Q(
+            delivery_state__in=get_status_codes(['Failed', 'Returned']))),
+        average_lead_time=Avg(F('delivered_at') - F('created_at'),
+                              filter=delivered),
+        last_order_date=Max('created_at'),
+    )
+
+    supplied_lines = (
+        SupplierOrderedItem.objects
+        .filter(order__supplier_id=supplier_id)
+        .exclude(order__delivery_state__in=get_status_codes(UNFULFILLED_STATUS))
+    )
+    last_price = (
+        supplied_lines
+        .filter(item_id=OuterRef('item_id'))
+        .order_by('-created_at')
+        .values('ordered_price')[:1]
+    )
+    items_stats = list(
+        supplied_lines
+        .values('item_id', 'item__name')
+        .annotate(quantity=Sum('ordered_quantity'),
+                  spend=Sum(ExpressionWrapper(
+                      F('ordered_quantity') * F('ordered_price'),
+                      output_field=money_field)),
+                  last_price=Subquery(last_price))
+        .order_by('item__name')
+    )
+
+    delivered_count = orders_stats['delivered_count']
+    orders_count = orders_stats['orders_count']
+    scorecard = SupplierScorecard(
+        supplier_id=supplier_id,
+        orders_count=orders_count,
+        delivered_count=delivered_count,
+        on_time_count=orders_stats['on_time_count'],
+        failed_count=orders_stats['failed_count'],
+        average_lead_time=orders_stats['average_lead_time'],
+        on_time_rate=(orders_stats['on_time_count'] / delivered_count
+                      if delivered_count else None),
+        failure_rate=(orders_stats['failed_count'] / orders_count
+                      if orders_count else None),
+        total_spend=sum((item['spend'] for item in items_stats), Decimal('0.00')),
+        item_prices=[
+            {
+                'item': item['item__name'],
+                'quantity': item['quantity'],
+                'average_price': decimal_to_float(
+                    (item['spend'] / item['quantity']).quantize(
+                        Decimal('.01'), rounding=ROUND_HALF_UP)
+                ),
+                'last_price': decimal_to_float(item['last_price']),
+            }
+            for item in items_stats
+        ],
+        last_order_date=orders_stats['last_order_date'],
+    )
+    scorecard.created_at = scorecard.updated_at = timezone.now()
+    SupplierScorecard.objects.bulk_create(
+        [scorecard],
+        update_conflicts=True,
+        unique_fields=['supplier'],
+        update_fields=[
+            'updated_at',
+            'orders_count',
+            'delivered_count',
+            'on_time_count',
+            'failed_count',
+            'average_lead_time',
+            'on_time_rate',
+            'failure_rate',
+            'total_spend',
+            'item_prices',
+            'last_order_date',
+        ]
+    )
+    return scorecard
+
+
+def refresh_supplier_scorecards(supplier_ids: set) -> None:
+    """Refreshes the scorecards of the given suppliers"""
+    for supplier_id in supplier_ids:
+        refresh_supplier_scorecard(supplier_id)
+
+
+def schedule_scorecard_refresh(*supplier_ids: Union[UUID, None]) -> None:
+    """
+    Refreshes the suppliers' scorecards once the current transaction
+    commits. Every supplier is only refreshed once per transaction.
+    """
+    supplier_ids = {str(supplier_id) for supplier_id in supplier_ids
+                    if supplier_id}
+    if not supplier_ids:
+        return
+    # A failed refresh must not fail the already committed request
+    on_commit_batch('scorecard_refresh', refresh_supplier_scorecards,
+                    supplier_ids, robust=True)
+
+
+def get_reorder_settings(**overrides) -> Dict[str, int]:
+    """
+    Returns the reorder suggestions parameters in days, read from the
+    REORDER_* settings unless overridden:
+        - window_days: sales history used to compute the daily velocity
+        - cover_days: stock to hold once the reorder is received
+        - lead_time_days: supplier lead time used when the supplier's
+          scorecard has no delivered orders
+    """
+    reorder_settings = {
+        'window_days': getattr(settings, 'REORDER_VELOCITY_WINDOW_DAYS', 30),
+        'cover_days': getattr(settings, 'REORDER_COVER_DAYS', 30),
+        'lead_time_days': getattr(settings, 'REORDER_LEAD_TIME_DAYS', 7),
+    }
+    reorder_settings.update(
+        (key, value) for key, value in overrides.items() if value is not None
+    )
+    return reorder_settings
+
+
+def compute_reorder_suggestions(
+    user: User,
+    window_days: Union[int, None] = None,
+    cover_days: Union[int, None] = None,
+    lead_time_days: Union[int, None] = None,
+) -> List[dict]:
+    """
+    Returns reorder suggestions for the user's inventory items, grouped by
+    supplier. Daily sold quantities over the window are loaded with a
+    single grouped query into an items by days matrix, from which NumPy
+    derives every item's daily velocity and days of cover at once.
+    The suggested quantity covers the supplier's lead time plus the cover
+    days, minus the stock on hand and still to be received.
+    """
+    params = get_reorder_settings(window_days=window_days,
+                                  cover_days=cover_days,
+                                  lead_time_days=lead_time_days)
+    items = list(
+        Item.objects
+        .filter(created_by=user, in_inventory=True)
+        .select_related('supplier__scorecard')
+        .order_by('name')
+    )
+    if not items:
+        return []
+    item_rows = {str(item.id): row for row, item in enumerate(items)}
+
+    # Sold quantities per item and day over the window
+    today = timezone.now().date()
+    start_date = today - timedelta(days=params['window_days'] - 1)
+    sold = daily_sales_matrix(
+        SoldItem.objects
+        .filter(sale__created_by=user)
+        .exclude(sale__delivery_state__in=get_status_codes(UNFULFILLED_STATUS)),
+        item_rows,
+        start_date,
+        params['window_days']
+    )
+
+    # Quantities of active supplier orders still to be received
+    incoming = np.zeros(len(items))
+    on_order = (
+        SupplierOrderedItem.objects
+        .filter(order__created_by=user,
+                order__delivery_state__in=get_status_codes(ACTIVE_DELIVERY_STATUS))
+        .values('item_id')
+        .annotate(quantity=Sum(F('ordered_quantity') - F('received_quantity')))
+        .values_list('item_id', 'quantity')
+    )
+    for item_id, quantity in on_order:
+        row = item_rows.get(str(item_id))
+        if row is not None:
+            incoming[row] = quantity
+
+    # Lead time of each item's supplier
+    lead_times = np.array([
+        item.supplier.scorecard.average_lead_time.total_seconds() / 86400
+        if (item.supplier and hasattr(item.supplier, 'scorecard')
+            and item.supplier.scorecard.average_lead_time is not None)
+        else params['lead_time_days']
+        for item in items
+    ])
+
+    stock = np.array([item.quantity for item in items], dtype=float)
+    available = stock + incoming
+    velocity = sold.mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_of_cover = np.where(velocity > 0, available / velocity, np.inf)
+    suggested = np.ceil(
+        velocity * (lead_times + params['cover_days']) - available
+    ).clip(min=0).astype(int)
+
+    groups = {}
+    for row in np.flatnonzero(suggested):
+        item = items[row]
+        supplier_name = item.supplier.name if item.supplier else None
+        group = groups.setdefault(supplier_name, {
+            'supplier': supplier_name,
+            'lead_time_days': round(float(lead_times[row]), 2),
+            'items': [],
+            'total_cost': Decimal('0.00'),
+        })
+        group['items'].append({
+            'item': item.name,
+            'quantity': item.quantity,
+            'on_order': int(incoming[row]),
+            'daily_velocity': round(float(velocity[row]), 2),
+            'days_of_cover': (round(float(days_of_cover[row]), 1)
+                              if np.isfinite(days_of_cover[row]) else None),
+            'suggested_quantity': int(suggested[row]),
+            'unit_price': decimal_to_float(item.price),
+        })
+        group['total_cost'] += item.price * int(suggested[row])
+
+    # Items without a supplier come last
+    suggestions = sorted(groups.values(),
+                         key=lambda group: (group['supplier'] is None,
+                                            group['supplier'] or ''))
+    for group in suggestions:
+        group['total_cost'] = decimal_to_float(group['total_cost'])
+    return suggestions
+
+
+@transaction.atomic
+def draft_reorder_supplier_orders(
+    user: User,
+    suggestions: List[dict],
+    supplier_names: Union[List[str], None] = None,
+) -> List[SupplierOrder]:
+    """
+    Creates a pending supplier order per supplier of the given reorder
+    suggestions, optionally limited to supplier_names, and returns them.
+    Orders and their ordered items are inserted with two bulk queries.
+    """
+    if supplier_names is not None:
+        supplier_names = {name.lower() for name in supplier_names}
+    suggestions = [
+        group for group in suggestions
+        if group['supplier'] and (supplier_names is None
+                                  or group['supplier'].lower() in supplier_names)
+    ]
+    if not suggestions:
+        return []
+
+    suppliers = {
+        supplier.name: supplier
+        for supplier in Supplier.objects.filter(
+            created_by=user,
+            name__in=[group['supplier'] for group in suggestions]
+        )
+    }
+    item_names = [item['item'] for group in suggestions for item in group['items']]
+    items = {
+        item.name: item
+        for item in Item.objects.filter(created_by=user, name__in=item_names)
+    }
+
+    # Bulk inserts skip the save signals that sync order states
+    pending_status = order_status_registry.get('Pending')
+    pending_state = ORDER_STATUS_CODES['Pending']
+    orders = []
+    ordered_items = []
+    for group in suggestions:
+        supplier = suppliers.get(group['supplier'])
+        if not supplier:
+            continue
+        order = SupplierOrder(created_by=user,
+                              supplier=supplier,
+                              delivery_status=pending_status,
+                              payment_status=pending_status,
+                              delivery_state=pending_state,
+                              payment_state=pending_state)
+        orders.append(order)
+        ordered_items.extend(
+            SupplierOrderedItem(created_by=user,
+                                order=order,
+                                supplier=supplier,
+                                item=items[suggestion['item']],
+                                ordered_quantity=suggestion['suggested_quantity'],
+                                ordered_price=items[suggestion['item']].price)
+            for suggestion in group['items']
+            if suggestion['item'] in items
+        )
+
+    SupplierOrder.objects.bulk_create(orders)
+    SupplierOrderedItem.objects.bulk_create(ordered_items)
+    invalidate_on_commit('supplier_orders', 'items', user_id=user.id)
+    for order in orders:
+        schedule_scorecard_refresh(order.supplier_id)
+
+    register_activity(user, "created", "supplier order",
+                      [order.reference_id for order in orders])
+
+    return orders
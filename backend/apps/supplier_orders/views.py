@@ -4,30 +4,50 @@ from rest_framework.response import Response
 from django.db.models import CharField, Q
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.db.models.functions import Cast
+from typing import Union
 from utils.tokens import Token
 from utils.views import (CreatedByUserMixin,
+                         ExportListMixin,
+                         apply_ordering,
                          validate_linked_items_for_deletion,
                          validate_deletion_for_delivered_parent_instance)
 from utils.status import (DELIVERY_STATUS_OPTIONS,
                           PAYMENT_STATUS_OPTIONS,
-                          COMPLETED_STATUS,
-                          ACTIVE_DELIVERY_STATUS,
-                          FAILED_STATUS)
+                          get_status_summary)
 from utils.activity import register_activity
+from utils.cache import cache_view
 from ..base.auth import TokenVersionAuthentication
 from ..inventory.models import Item
-from .utils import validate_supplier_order
+from .utils import (validate_supplier_order,
+                    get_receipt_error,
+                    annotate_suppliers_stats,
+                    compute_reorder_suggestions,
+                    draft_reorder_supplier_orders,
+                    SUPPLIER_ORDERING_FIELDS,
+                    SCORECARD_ORDERING_FIELDS)
 from . import serializers
-from .models import Supplier, SupplierOrder, SupplierOrderedItem
+from .models import (Supplier,
+                     SupplierOrder,
+                     SupplierOrderedItem,
+                     SupplierScorecard)
 
 
-class CreateListSuppliers(CreatedByUserMixin,
+class CreateListSuppliers(CreatedByUserMixin, ExportListMixin,
                          generics.ListCreateAPIView):
     """Handles Supplier Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.SupplierSerializer
-    queryset = Supplier.objects.all()
+    queryset = Supplier.objects.select_related('created_by',
+                                               'location__added_by',
+                                               'location__country',
+                                               'location__city__country')
+
+    def get_queryset(self):
+        queryset = annotate_suppliers_stats(super().get_queryset())
+        # Sort suppliers by the given field, e.g. ?ordering=-total_spend
+        return apply_ordering(queryset, self.request,
+                              SUPPLIER_ORDERING_FIELDS, '-created_at')
 
 
 class GetUpdateDeleteSuppliers(CreatedByUserMixin,
@@ -36,7 +56,10 @@ class GetUpdateDeleteSuppliers(CreatedByUserMixin,
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.SupplierSerializer
-    queryset = Supplier.objects.all()
+    queryset = Supplier.objects.select_related('created_by',
+                                               'location__added_by',
+                                               'location__country',
+                                               'location__city__country')
     lookup_field = 'id'
 
     def destroy(self, request, *args, **kwargs):
@@ -55,6 +78,44 @@ class GetUpdateDeleteSuppliers(CreatedByUserMixin,
         return super().destroy(request, *args, **kwargs)
 
 
+class ListSupplierScorecards(ExportListMixin, generics.ListAPIView):
+    """Lists the precomputed performance scorecards of user's suppliers"""
+    authentication_classes = (TokenVersionAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    serializer_class = serializers.SupplierScorecardSerializer
+    queryset = SupplierScorecard.objects.select_related('supplier')
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(
+            supplier__created_by=self.request.user
+        )
+        # Filter scorecards, e.g. ?supplier=acme&min_on_time_rate=0.9
+        supplier_name = self.request.GET.get('supplier', None)
+        if supplier_name:
+            queryset = queryset.filter(supplier__name__icontains=supplier_name)
+        for param, lookup in [('min_on_time_rate', 'on_time_rate__gte'),
+                              ('max_failure_rate', 'failure_rate__lte')]:
+            if self.rate_filters.get(param) is not None:
+                queryset = queryset.filter(**{lookup: self.rate_filters[param]})
+        # Sort scorecards by the given field, e.g. ?ordering=-on_time_rate
+        return apply_ordering(queryset, self.request,
+                              SCORECARD_ORDERING_FIELDS, 'supplier__name')
+
+    def list(self, request, *args, **kwargs):
+        # Validate rate filters
+        self.rate_filters = {}
+        for param in ['min_on_time_rate', 'max_failure_rate']:
+            value = request.GET.get(param, None)
+            if value is None:
+                continue
+            try:
+                self.rate_filters[param] = float(value)
+            except ValueError:
+                return Response({'error': f"'{param}' must be a number."},
+                                status=status.HTTP_400_BAD_REQUEST)
+        return super().list(request, *args, **kwargs)
+
+
 class BulkDeleteSuppliers(CreatedByUserMixin, generics.DestroyAPIView):
     """Handles Supplier Bulk Deletion"""
     authentication_classes = (TokenVersionAuthentication,)
@@ -151,7 +212,7 @@ class BulkDeleteSuppliers(CreatedByUserMixin, generics.DestroyAPIView):
                          status=status.HTTP_200_OK)
 
 
-class CreateListSupplierOrders(CreatedByUserMixin,
+class CreateListSupplierOrders(CreatedByUserMixin, ExportListMixin,
                               generics.ListCreateAPIView):
     """Handles Supplier Order Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
@@ -182,6 +243,93 @@ class GetUpdateDeleteSupplierOrders(CreatedByUserMixin,
         return super().destroy(request, *args, **kwargs)
 
 
+class ReceiveSupplierOrderedItems(CreatedByUserMixin, generics.GenericAPIView):
+    """Handles Partial Receipts of Supplier Ordered Items"""
+    authentication_classes = (TokenVersionAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    queryset = SupplierOrder.objects.all()
+    lookup_field = 'id'
+
+    def post(self, request, *args, **kwargs):
+        order = self.get_object()
+        error = get_receipt_error(order)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = serializers.SupplierOrderReceiptSerializer(
+            data=request.data,
+            context={'request': request, 'order': order}
+        )
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save()
+
+        order_serializer = serializers.SupplierOrderSerializer(
+            order,
+            context={'request': request}
+        )
+        return Response(order_serializer.data, status=status.HTTP_200_OK)
+
+
+class ReorderSuggestions(generics.GenericAPIView):
+    """
+    Returns reorder suggestions grouped by supplier
+    and drafts supplier orders from them
+    """
+    authentication_classes = (TokenVersionAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    reorder_params = ['window_days', 'cover_days', 'lead_time_days']
+
+    def get_reorder_params(self, data) -> Union[dict, Response]:
+        """Returns the validated reorder parameters from data"""
+        params = {}
+        for param in self.reorder_params:
+            value = data.get(param, None)
+            if value is None:
+                continue
+            try:
+                params[param] = int(value)
+            except (TypeError, ValueError):
+                params[param] = 0
+            if params[param] < 1:
+                return Response({'error': f"'{param}' must be a positive integer."},
+                                status=status.HTTP_400_BAD_REQUEST)
+        return params
+
+    def get(self, request, *args, **kwargs):
+        params = self.get_reorder_params(request.GET)
+        if isinstance(params, Response):
+            return params
+        suggestions = compute_reorder_suggestions(request.user, **params)
+        return Response(suggestions, status=status.HTTP_200_OK)
+
+    def post(self, request, *args, **kwargs):
+        params = self.get_reorder_params(request.data)
+        if isinstance(params, Response):
+            return params
+        supplier_names = request.data.get('suppliers', None)
+        if supplier_names is not None and (
+            not isinstance(supplier_names, list)
+            or not all(isinstance(name, str) for name in supplier_names)
+        ):
+            return Response({'error': "'suppliers' must be a list of supplier names."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        suggestions = compute_reorder_suggestions(request.user, **params)
+        orders = draft_reorder_supplier_orders(request.user,
+                                               suggestions,
+                                               supplier_names)
+        if not orders:
+            return Response({'error': 'No reorder suggestions to draft.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = serializers.SupplierOrderSerializer(
+            orders,
+            many=True,
+            context={'request': request}
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class BulkDeleteSupplierOrders(CreatedByUserMixin, generics.DestroyAPIView):
     """Handles Supplier Order Bulk Deletion"""
     authentication_classes = (TokenVersionAuthentication,)
@@ -243,7 +391,7 @@ class BulkDeleteSupplierOrders(CreatedByUserMixin, generics.DestroyAPIView):
                          status=status.HTTP_200_OK)
  
 
-class CreateListSupplierOrderedItems(CreatedByUserMixin,
+class CreateListSupplierOrderedItems(CreatedByUserMixin, ExportListMixin,
                                     generics.ListCreateAPIView):
     """Handles Supplier Ordered Item Creation and Listing"""
     authentication_classes = (TokenVersionAuthentication,)
@@ -348,6 +496,7 @@ class GetSupplierOrdersData(generics.GenericAPIView):
     authentication_classes = (TokenVersionAuthentication,)
     permission_classes = (IsAuthenticated,)
 
+    @cache_view('suppliers', 'supplier_orders', 'items', 'order_statuses')
     def get(self, request, *args, **kwargs):
         user = request.user
 
@@ -374,46 +523,21 @@ class GetSupplierOrdersData(generics.GenericAPIView):
             .values_list('name', flat=True)
         )
 
-        # Total supplier orders count
-        orders_count = SupplierOrder.objects.filter(created_by=user).count()
-
-        # Completed orders
-        completed_orders = (
-            SupplierOrder.objects
-            .filter(
-                created_by=user,
-                delivery_status__name__in=COMPLETED_STATUS)
-            .count()
-        )
-
-        # Active Orders
-        active_orders = (
-            SupplierOrder.objects
-            .filter(
-                created_by=user,
-                delivery_status__name__in=ACTIVE_DELIVERY_STATUS)
-            .count()
-        )
-
-        # Failed Orders
-        failed_orders = (
-            SupplierOrder.objects
-            .filter(
-                created_by=user,
-                delivery_status__name__in=FAILED_STATUS)
-            .count()
+        # Supplier orders count by status
+        orders_summary = get_status_summary(
+            SupplierOrder.objects.filter(created_by=user)
         )
 
         # Orders Status
         orders_status = {'delivery_status': DELIVERY_STATUS_OPTIONS,
                          'payment_status': PAYMENT_STATUS_OPTIONS,
-                         'active': active_orders,
-                         'completed': completed_orders,
-                         'failed': failed_orders}
+                         'active': orders_summary['active'],
+                         'completed': orders_summary['completed'],
+                         'failed': orders_summary['failed']}
 
-        return Response({'suppliers': suppliers,
-                         'no_supplier_items': no_supplier_items,
+        return Response({'suppliers': list(suppliers),
+                         'no_supplier_items': list(no_supplier_items),
                          'suppliers_count': suppliers.count() or 0,
-                         'orders_count': orders_count,
+                         'orders_count': orders_summary['total'],
                          'order_status': orders_status},
                          status=status.HTTP_200_OK)
@@ -0,0 +1,28 @@
+import pytest
+from django.core.cache import cache
+from utils.activity import activity_buffer
+from utils.db_metrics import pool_metrics
+from utils.locations import location_resolver
+from utils.status_registry import order_status_registry
+from utils.user_cache import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """
+    Clears in-process caches between tests, since rolled back test
+    transactions leave them pointing to records that no longer exist.
+    """
+    location_resolver.clear()
+    order_status_registry.clear()
+    user_cache.clear()
+    cache.clear()
+    activity_buffer.discard()
+    pool_metrics.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def send_queued_emails_inline(settings):
+    """Sends queued emails in the commit callback instead of a thread"""
+    settings.EMAIL_QUEUE_DISPATCH = 'inline'
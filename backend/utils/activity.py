@@ -1,5 +1,153 @@
-from apps.base.models import Activity, User
+import logging
+from contextlib import contextmanager
+from queue import Queue
+from threading import Condition, Lock, Thread, local
 from typing import List, Literal, Union
+from django.conf import settings
+from django.db import close_old_connections, connections
+from apps.base.models import Activity, User
+from .cache import invalidate_on_commit
+
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityBuffer:
+    """
+    Collects the activities registered while a buffer is open in the
+    current thread and writes them with a single bulk insert when it is
+    flushed. Buffers are opened per request by ActivityBufferMiddleware
+    or explicitly with buffered_activities().
+    Flushed activities are written inline, or handed off to a single
+    background writer so they keep the order they were registered in.
+    Every handed off batch gets a sequence number, so readers only wait
+    for the batches queued for their user before they read.
+    """
+    def __init__(self, flush_mode: str = 'inline', wait_timeout: float = 5):
+        self.flush_mode = flush_mode
+        self.wait_timeout = wait_timeout
+        self._local = local()
+        self._queue = None
+        self._lock = Lock()
+        self._written = Condition()
+        self._queued_seq = 0
+        self._written_seq = 0
+        # Sequence number of the last batch queued for every user
+        self._user_seqs = {}
+
+    @property
+    def active(self) -> bool:
+        """Whether a buffer is open in the current thread"""
+        return getattr(self._local, 'activities', None) is not None
+
+    def start(self) -> bool:
+        """Opens a buffer unless one is already open and returns if it did"""
+        if self.active:
+            return False
+        self._local.activities = []
+        return True
+
+    def add(self, activity: Activity) -> bool:
+        """Buffers activity and returns False if no buffer is open"""
+        if not self.active:
+            return False
+        self._local.activities.append(activity)
+        return True
+
+    def discard(self) -> None:
+        """Closes the buffer and drops its activities"""
+        self._local.activities = None
+
+    def flush(self) -> None:
+        """Closes the buffer and writes its activities"""
+        activities = self._local.activities or []
+        self._local.activities = None
+        if not activities:
+            return
+        if self.flush_mode == 'thread':
+            queue = self._get_queue()
+            with self._written:
+                self._queued_seq += 1
+                for activity in activities:
+                    self._user_seqs[activity.user_id] = self._queued_seq
+                queue.put((self._queued_seq, activities))
+        else:
+            self._bulk_create(activities)
+
+    def _bulk_create(self, activities: List[Activity]) -> None:
+        """Inserts activities and invalidates the cached feeds of their users"""
+        Activity.objects.bulk_create(activities)
+        for user_id in {activity.user_id for activity in activities}:
+            invalidate_on_commit('activities', user_id=user_id)
+
+    def _get_queue(self) -> Queue:
+        """Returns the writer queue, starting the writer thread once"""
+        with self._lock:
+            if self._queue is None:
+                self._queue = Queue()
+                Thread(target=self._write, daemon=True).start()
+            return self._queue
+
+    def _write(self) -> None:
+        """Writes the queued activities in order until the process exits"""
+        while True:
+            seq, activities = self._queue.get()
+            try:
+                close_old_connections()
+                self._bulk_create(activities)
+            except Exception:
+                logger.exception("Failed to write %s activities", len(activities))
+            finally:
+                with self._written:
+                    self._written_seq = seq
+                    for user_id in {activity.user_id for activity in activities}:
+                        if self._user_seqs.get(user_id) == seq:
+                            del self._user_seqs[user_id]
+                    self._written.notify_all()
+                if self._queue.empty():
+                    connections.close_all()
+
+    def wait(self, user_id=None, timeout: Union[float, None] = None) -> bool:
+        """
+        Blocks until the activities handed off to the writer before the
+        call are written, only those of user_id if given, and returns
+        whether they were written before the timeout, which defaults to
+        wait_timeout. Batches queued after the call are not waited for.
+        """
+        if timeout is None:
+            timeout = self.wait_timeout
+        with self._written:
+            if user_id is None:
+                target = self._queued_seq
+            else:
+                target = self._user_seqs.get(user_id, 0)
+            return self._written.wait_for(
+                lambda: self._written_seq >= target, timeout
+            )
+
+
+activity_buffer = ActivityBuffer(
+    flush_mode=getattr(settings, 'ACTIVITY_BUFFER_FLUSH', 'inline'),
+    wait_timeout=getattr(settings, 'ACTIVITY_BUFFER_WAIT_TIMEOUT', 5)
+)
+
+
+@contextmanager
+def buffered_activities():
+    """
+    Buffers the activities registered in the block and writes them once
+    it exits, or drops them if it raises. Nested blocks share the
+    outermost buffer.
+    """
+    started = activity_buffer.start()
+    try:
+        yield
+    except Exception:
+        if started:
+            activity_buffer.discard()
+        raise
+    if started:
+        activity_buffer.flush()
 
 
 def register_activity(
@@ -8,10 +156,16 @@ def register_activity(
     model_name: str,
     object_ref: List[str],
 ) -> Activity:
-    """Registers and returns a new activity instance"""
-    return Activity.objects.create(
+    """
+    Registers and returns a new activity instance.
+    The activity is only saved once the open buffer is flushed, if any.
+    """
+    activity = Activity(
         user=user,
         action=action,
         model_name=model_name,
         object_ref=object_ref
     )
+    if not activity_buffer.add(activity):
+        activity.save()
+    return activity
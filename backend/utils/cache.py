@@ -0,0 +1,145 @@
+import hashlib
+import json
+import time
+from functools import wraps
+from typing import Iterable, List, Union
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from rest_framework import status
+from rest_framework.response import Response
+from .transactions import on_commit_batch
+
+
+KEY_PREFIX = 'stocker'
+
+MISSING = object()
+
+
+def version_key(namespace: str, user_id=None) -> str:
+    """Returns the key holding the version of a namespace of user_id"""
+    return f'{KEY_PREFIX}:version:{namespace}:{user_id or "all"}'
+
+
+def get_versions(namespaces: Iterable[str], user_id=None) -> List[int]:
+    """
+    Returns the shared and per-user versions of the given namespaces
+    with a single cache lookup. Missing versions are initialized from the
+    clock, so an evicted version never brings older entries back.
+    """
+    keys = []
+    for namespace in namespaces:
+        keys.append(version_key(namespace))
+        if user_id:
+            keys.append(version_key(namespace, user_id))
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*namespaces: str, user_id=None) -> None:
+    """
+    Bumps the versions of the given namespaces of user_id, or of every
+    user when user_id is None, so their cached entries are never read again
+    """
+    for namespace in namespaces:
+        key = version_key(namespace, user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def _invalidate_all(invalidations: set) -> None:
+    """Invalidates the collected (namespace, user_id) pairs"""
+    for namespace, user_id in invalidations:
+        invalidate(namespace, user_id=user_id)
+
+
+def invalidate_on_commit(*namespaces: str, user_id=None) -> None:
+    """
+    Invalidates the namespaces right away and once more when the current
+    transaction commits, so entries cached from a snapshot taken before
+    the commit are dropped as well. The namespaces invalidated in a
+    transaction are collected by a single commit callback.
+    """
+    invalidate(*namespaces, user_id=user_id)
+    if not transaction.get_connection().in_atomic_block:
+        return
+    on_commit_batch('cache_invalidation', _invalidate_all,
+                    [(namespace, user_id) for namespace in namespaces],
+                    robust=True)
+
+
+def make_key(name: str, namespaces: Iterable[str], user_id=None, *parts) -> str:
+    """Returns the versioned cache key of name's entry for user_id and parts"""
+    versions = get_versions(namespaces, user_id)
+    digest = hashlib.sha256(
+        json.dumps([versions, parts], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f'{KEY_PREFIX}:{name}:{user_id or "all"}:{digest}'
+
+
+def cached(*namespaces: str, timeout=DEFAULT_TIMEOUT):
+    """
+    Caches the results of a function taking the user as first argument
+    under namespaces, per user and arguments. The other arguments are
+    told apart by their JSON or str() representation.
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+
+        @wraps(func)
+        def wrapper(user, *args, **kwargs):
+            user_id = user.id if user else None
+            key = make_key(name, namespaces, user_id, args, kwargs)
+            result = cache.get(key, MISSING)
+            if result is MISSING:
+                result = func(user, *args, **kwargs)
+                cache.set(key, result, timeout)
+            return result
+        return wrapper
+    return decorator
+
+
+def cache_view(*namespaces: str, timeout=DEFAULT_TIMEOUT):
+    """
+    Caches the data of the successful responses of a view's handler
+    method under namespaces, per user and full path
+    """
+    def decorator(handler):
+        name = f'{handler.__module__}.{handler.__qualname__}'
+
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            key = make_key(name, namespaces, request.user.id,
+                           request.get_full_path())
+            data = cache.get(key, MISSING)
+            if data is not MISSING:
+                return Response(data, status=status.HTTP_200_OK)
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout)
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate_on_change(model, *namespaces: str, user_field: Union[str, None] = None):
+    """
+    Invalidates namespaces for the owner of the instances of model, whose
+    id is held by user_field, whenever one is saved or deleted. Instances
+    without an owner, and models without user_field, invalidate the
+    namespaces of every user.
+    """
+    def receiver(sender, instance, **kwargs):
+        user_id = getattr(instance, user_field) if user_field else None
+        invalidate_on_commit(*namespaces, user_id=user_id)
+
+    uid = f'{KEY_PREFIX}:{model._meta.label}:{":".join(namespaces)}'
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
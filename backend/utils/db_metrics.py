@@ -0,0 +1,54 @@
+from threading import Lock
+from typing import Dict
+
+
+class ConnectionPoolMetrics:
+    """
+    Process-wide counters of the database connections, per alias.
+    Connections are opened and health checked by the utils.postgresql
+    backend, and requests that find their connection still open count
+    as reused.
+    """
+    FIELDS = ['opened', 'reused', 'closed', 'health_check_failures']
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = Lock()
+
+    def _get(self, alias: str) -> dict:
+        if alias not in self._metrics:
+            self._metrics[alias] = dict.fromkeys(self.FIELDS, 0)
+            self._metrics[alias].update(connect_time=0.0, max_connect_time=0.0)
+        return self._metrics[alias]
+
+    def increment(self, alias: str, field: str) -> None:
+        with self._lock:
+            self._get(alias)[field] += 1
+
+    def record_connect(self, alias: str, seconds: float) -> None:
+        """Counts a new connection that took seconds to establish"""
+        with self._lock:
+            metrics = self._get(alias)
+            metrics['opened'] += 1
+            metrics['connect_time'] += seconds
+            metrics['max_connect_time'] = max(metrics['max_connect_time'], seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Returns the metrics of every alias with the average connect time"""
+        with self._lock:
+            snapshot = {alias: dict(metrics)
+                        for alias, metrics in self._metrics.items()}
+        for metrics in snapshot.values():
+            metrics['avg_connect_time'] = (
+                metrics['connect_time'] / metrics['opened']
+                if metrics['opened'] else 0.0
+            )
+        return snapshot
+
+    def clear(self) -> None:
+        """Resets every counter"""
+        with self._lock:
+            self._metrics = {}
+
+
+pool_metrics = ConnectionPoolMetrics()
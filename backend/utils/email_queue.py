@@ -0,0 +1,151 @@
+import logging
+from datetime import timedelta
+from functools import partial
+from threading import Thread
+from typing import Dict, List, Union
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+from apps.base.models import OutboundEmail
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_email_queue_settings() -> dict:
+    """Returns the email queue parameters, falling back to the defaults"""
+    return {
+        # 'thread' sends from a background thread once the request commits,
+        # 'inline' sends in the commit callback and 'worker' leaves the
+        # queue to the send_queued_emails command
+        'dispatch': getattr(settings, 'EMAIL_QUEUE_DISPATCH', 'thread'),
+        'batch_size': getattr(settings, 'EMAIL_QUEUE_BATCH_SIZE', 50),
+        'max_attempts': getattr(settings, 'EMAIL_QUEUE_MAX_ATTEMPTS', 5),
+        'retry_delay': getattr(settings, 'EMAIL_QUEUE_RETRY_DELAY', 60),
+    }
+
+
+def queue_email(
+    subject: str,
+    body: str,
+    to: List[str],
+    from_email: Union[str, None] = None,
+    html_body: Union[str, None] = None
+) -> OutboundEmail:
+    """
+    Queues an email and returns it.
+    Delivery is dispatched once the current transaction commits,
+    so the request never waits on the mail server.
+    """
+    email = OutboundEmail.objects.create(subject=subject,
+                                         body=body,
+                                         html_body=html_body,
+                                         from_email=from_email,
+                                         to=list(to))
+    transaction.on_commit(partial(dispatch_queued_emails, [email.id]))
+    return email
+
+
+def dispatch_queued_emails(email_ids: List[str]) -> None:
+    """Delivers the given queued emails according to the dispatch mode"""
+    dispatch = get_email_queue_settings()['dispatch']
+    if dispatch == 'inline':
+        deliver_queued_emails(email_ids)
+    elif dispatch == 'thread':
+        Thread(target=_deliver_in_thread, args=(email_ids,), daemon=True).start()
+
+
+def _deliver_in_thread(email_ids: List[str]) -> None:
+    """Delivers the emails and closes the thread's database connections"""
+    try:
+        deliver_queued_emails(email_ids)
+    except Exception:
+        logger.exception("Failed to deliver queued emails")
+    finally:
+        connections.close_all()
+
+
+def build_message(email: OutboundEmail, connection) -> EmailMultiAlternatives:
+    """Returns the message of a queued email bound to connection"""
+    message = EmailMultiAlternatives(email.subject,
+                                     email.body,
+                                     email.from_email,
+                                     email.to,
+                                     connection=connection)
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def deliver_queued_emails(
+    email_ids: Union[List[str], None] = None,
+    batch_size: Union[int, None] = None
+) -> Dict[str, int]:
+    """
+    Sends the pending emails that are due, or only the given ones, and
+    returns the count of sent, retried and failed emails.
+    Due emails are locked with SKIP LOCKED so concurrent workers never
+    send the same email twice, and the whole batch shares a single mail
+    server connection. Failed emails are retried with an exponential
+    backoff until they run out of attempts.
+    """
+    params = get_email_queue_settings()
+    batch_size = batch_size or params['batch_size']
+    counts = {'sent': 0, 'retried': 0, 'failed': 0}
+
+    with transaction.atomic():
+        now = timezone.now()
+        emails = (
+            OutboundEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+        )
+        if email_ids is not None:
+            emails = emails.filter(id__in=email_ids)
+        emails = list(emails[:batch_size])
+        if not emails:
+            return counts
+
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            # Every email of the batch failed to reach the server
+            connection = None
+            connection_error = error
+
+        for email in emails:
+            email.attempts += 1
+            try:
+                if connection is None:
+                    raise connection_error
+                build_message(email, connection).send(fail_silently=False)
+            except Exception as error:
+                email.last_error = str(error)
+                if email.attempts >= params['max_attempts']:
+                    email.status = 'failed'
+                    counts['failed'] += 1
+                else:
+                    delay = params['retry_delay'] * 2 ** (email.attempts - 1)
+                    email.next_attempt_at = now + timedelta(seconds=delay)
+                    counts['retried'] += 1
+                logger.warning("Failed to send email %s: %s", email.id, error)
+            else:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.last_error = None
+                counts['sent'] += 1
+            email.updated_at = timezone.now()
+
+        if connection is not None:
+            connection.close()
+
+        OutboundEmail.objects.bulk_update(emails, ['status',
+                                                   'attempts',
+                                                   'next_attempt_at',
+                                                   'last_error',
+                                                   'sent_at',
+                                                   'updated_at'])
+    return counts
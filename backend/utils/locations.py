@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple, Union
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from apps.base.models import User
+from apps.client_orders.models import City, Location, NIL_UUID
+
+
+class LocationResolver:
+    """
+    Resolves (country, city) names into their ids.
+    Resolved pairs are kept in a bounded in-process LRU cache, so repeated
+    addresses need no query at all and a cache miss costs a single query.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def resolve(
+        self,
+        country_name: str,
+        city_name: str
+    ) -> Union[Tuple[str, str], None]:
+        """
+        Returns a (country_id, city_id) tuple or None if the city does not
+        exist in the given country.
+        """
+        key = (country_name.strip().lower(), city_name.strip().lower())
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        ids = (
+            City.objects
+            .filter(name__iexact=key[1], country__name__iexact=key[0])
+            .values_list('country_id', 'id')
+            .first()
+        )
+        # Only existing pairs are cached so newly added cities
+        # are picked up without invalidation
+        if ids:
+            with self._lock:
+                self._cache[key] = ids
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return ids
+
+    def clear(self) -> None:
+        """Drops every cached pair"""
+        with self._lock:
+            self._cache.clear()
+
+
+location_resolver = LocationResolver(
+    maxsize=getattr(settings, 'LOCATION_RESOLVER_CACHE_SIZE', 1024)
+)
+
+
+def upsert_location(
+    added_by: Optional[User],
+    country_id: str,
+    city_id: str,
+    street_address: Optional[str],
+) -> Location:
+    """
+    Returns the location matching the given identity fields,
+    creating it if it does not exist.
+    On Postgres this is a single INSERT ... ON CONFLICT statement
+    backed by the location's unique identity constraint.
+    """
+    street_address = street_address or None
+    added_by_id = added_by.id if added_by else None
+
+    if connection.vendor != 'postgresql':
+        location, created = Location.objects.get_or_create(
+            added_by_id=added_by_id,
+            country_id=country_id,
+            city_id=city_id,
+            street_address=street_address
+        )
+        return location
+
+    location = Location(added_by_id=added_by_id,
+                        country_id=country_id,
+                        city_id=city_id,
+                        street_address=street_address)
+    location.created_at = location.updated_at = timezone.now()
+
+    table = connection.ops.quote_name(Location._meta.db_table)
+    # The conflict target must match the unique_location_identity index
+    sql = (
+        f"INSERT INTO {table} "
+        "(id, added_by_id, country_id, city_id, street_address, "
+        "created_at, updated_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+        f"ON CONFLICT ((COALESCE(added_by_id, '{NIL_UUID}'::uuid)), "
+        "country_id, city_id, (COALESCE(street_address, ''))) "
+        f"DO UPDATE SET updated_at = {table}.updated_at "
+        "RETURNING *"
+    )
+    params = [
+        location.id,
+        added_by_id,
+        country_id,
+        city_id,
+        street_address,
+        location.created_at,
+        location.updated_at,
+    ]
+    return list(Location.objects.raw(sql, params))[0]
@@ -0,0 +1,26 @@
+from .activity import activity_buffer
+
+
+class ActivityBufferMiddleware:
+    """
+    Buffers the activities registered while handling a request and writes
+    them with a single insert once the response is ready. Activities of
+    failed requests are dropped along with the changes they describe.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = activity_buffer.start()
+        try:
+            response = self.get_response(request)
+        except Exception:
+            if started:
+                activity_buffer.discard()
+            raise
+        if started:
+            if response.status_code < 400:
+                activity_buffer.flush()
+            else:
+                activity_buffer.discard()
+        return response
@@ -17,6 +17,6 @@ class BaseModel(models.Model):
 
 def get_default_order_status():
     """Returns default order status instance"""
-    from apps.client_orders.models import OrderStatus
+    from .status_registry import order_status_registry
 
-    return OrderStatus.objects.filter(name="Pending").first()
+    return order_status_registry.get("Pending")
@@ -1,8 +1,40 @@
-from rest_framework.pagination import CursorPagination
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class CappedLimitOffsetPagination(LimitOffsetPagination):
+    """Limit/offset pagination sharing the page size limits of the cursors"""
+    default_limit = getattr(settings, 'PAGINATION_PAGE_SIZE', 10)
+    limit_query_param = 'page_size'
+    max_limit = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 100)
 
 
 class CustomCursorPagination(CursorPagination):
-    page_size = 10
+    """
+    Default pagination of every list endpoint.
+    Pages follow the queryset's ordering, or the model's default ordering.
+    Cursors can only seek on plain fields, so querysets sorted on
+    expressions (e.g. annotated stats with nulls last) are paged by offset.
+    """
+    page_size = getattr(settings, 'PAGINATION_PAGE_SIZE', 10)
     ordering = '-created_at'
     page_size_query_param = 'page_size'
-    max_page_size = 100
+    max_page_size = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 100)
+    offset_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if any(not isinstance(field, str) for field in queryset.query.order_by):
+            self.offset_paginator = CappedLimitOffsetPagination()
+            return self.offset_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if ordering:
+            return tuple(ordering)
+        return super().get_ordering(request, queryset, view)
+
+    def get_paginated_response(self, data):
+        if self.offset_paginator:
+            return self.offset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,43 @@
+import logging
+from time import perf_counter
+from django.db.backends.postgresql import base
+from ..db_metrics import pool_metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend recording connection pool metrics.
+    Behind PgBouncer in transaction pooling mode, where
+    DISABLE_SERVER_SIDE_CURSORS is set, connections must not depend on
+    session state, so changing the session time zone is reported.
+    """
+    def connect(self):
+        started = perf_counter()
+        super().connect()
+        pool_metrics.record_connect(self.alias, perf_counter() - started)
+
+    def ensure_timezone(self):
+        changed = super().ensure_timezone()
+        if changed and self.settings_dict['DISABLE_SERVER_SIDE_CURSORS']:
+            logger.warning(
+                "Set the session time zone of '%s' to %s, which is lost "
+                "when PgBouncer hands out another server connection. "
+                "Set the role's timezone instead "
+                "(ALTER ROLE ... SET timezone = '%s').",
+                self.alias, self.timezone_name, self.timezone_name
+            )
+        return changed
+
+    def close_if_health_check_failed(self):
+        was_open = self.connection is not None
+        super().close_if_health_check_failed()
+        if was_open and self.connection is None:
+            pool_metrics.increment(self.alias, 'health_check_failures')
+
+    def _close(self):
+        if self.connection is not None:
+            pool_metrics.increment(self.alias, 'closed')
+        super()._close()
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from django.db.models import Q
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 from decimal import Decimal
 from typing import Any, Union, Optional, Callable, List
 from deepdiff import DeepDiff
@@ -225,6 +226,51 @@ def validate_changes_for_delivered_parent_instance(
             )
         })
 
+def bulk_save_items_changes(
+    item_model: Union[ClientOrderedItem, SupplierOrderedItem, SoldItem],
+    items_to_update: list,
+    update_fields: List[str],
+    items_to_create: list,
+    items_to_delete: list,
+    inventory_items: Optional[List[Item]] = None,
+    inventory_fields: Optional[List[str]] = None
+) -> None:
+    """
+    Saves the changes made to a sale's/order's list of items and their
+    related inventory items with one statement per kind of change,
+    regardless of the number of items
+    """
+    now = timezone.now()
+    if inventory_items:
+        for item in inventory_items:
+            item.updated_at = now
+        Item.objects.bulk_update(inventory_items,
+                                 [*inventory_fields, 'updated_at'])
+    if items_to_update:
+        for item in items_to_update:
+            item.updated_at = now
+        item_model.objects.bulk_update(items_to_update,
+                                       [*update_fields, 'updated_at'])
+    if items_to_create:
+        item_model.objects.bulk_create(items_to_create)
+    if items_to_delete:
+        item_model.objects.filter(
+            id__in=[item.id for item in items_to_delete]
+        ).delete()
+
+def get_annotated_instance(
+    instance: Any,
+    annotate: Callable[[QuerySet], QuerySet],
+    annotation: str
+) -> Any:
+    """
+    Returns instance if it was annotated with annotation, e.g. by a list
+    view's queryset, else it queries it again through annotate
+    """
+    if hasattr(instance, annotation):
+        return instance
+    return annotate(type(instance).objects.filter(id=instance.id)).first()
+
 def decimal_to_float(value: Decimal):
     """
     Converts a Decimal to a float with 2 decimal places
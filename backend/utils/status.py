@@ -1,3 +1,7 @@
+from django.db.models import Count, Q, QuerySet
+from typing import Dict
+
+
 ORDER_STATUS = [
     'Pending',
     'Shipped',
@@ -49,3 +53,44 @@ ACTIVE_PAYMENT_STATUS = ['Pending', 'Paid']
 
 FAILED_STATUS = ['Canceled', 'Failed', 'Refunded', 'Returned']
 
+
+# Small integer codes stored in the delivery_state and payment_state
+# columns so status filters don't need to join OrderStatus
+ORDER_STATUS_CODES = {
+    'Pending': 1,
+    'Shipped': 2,
+    'Delivered': 3,
+    'Returned': 4,
+    'Canceled': 5,
+    'Failed': 6,
+    'Paid': 7,
+    'Refunded': 8
+}
+
+ORDER_STATE_CHOICES = [(code, name) for name, code in ORDER_STATUS_CODES.items()]
+
+
+def get_status_codes(names: list) -> list:
+    """Returns the state codes of the given status names"""
+    return [ORDER_STATUS_CODES[name] for name in names]
+
+
+# Delivery status buckets reported by the *Data endpoints
+ORDER_STATUS_BUCKETS = {
+    'active': Q(delivery_state__in=get_status_codes(ACTIVE_DELIVERY_STATUS)),
+    'completed': Q(delivery_state__in=get_status_codes(COMPLETED_STATUS)),
+    'failed': Q(delivery_state__in=get_status_codes(FAILED_STATUS)),
+}
+
+
+def get_status_summary(queryset: QuerySet, **buckets: Q) -> Dict[str, int]:
+    """
+    Returns the total count of the queryset's orders and the count of
+    each given status bucket, ORDER_STATUS_BUCKETS by default, computed
+    with conditional aggregation in a single query.
+    """
+    buckets = buckets or ORDER_STATUS_BUCKETS
+    return queryset.aggregate(
+        total=Count('id'),
+        **{name: Count('id', filter=query) for name, query in buckets.items()}
+    )
@@ -0,0 +1,93 @@
+import time
+from threading import Lock
+from typing import Dict, Iterable, List, Union
+from django.conf import settings
+from apps.client_orders.models import OrderStatus
+from .status import ORDER_STATUS_CODES
+
+
+class OrderStatusRegistry:
+    """
+    Process-wide registry of order statuses.
+    All statuses are loaded with a single query and looked up by name
+    or id from memory afterwards. The registry is cleared whenever an
+    order status is saved or deleted and reloaded on the next lookup.
+    Statuses created by other processes are picked up by reloading on a
+    miss, at most once every reload_interval seconds.
+    """
+    def __init__(self, reload_interval: float = 60):
+        self.reload_interval = reload_interval
+        self._indexes = None
+        self._loaded_at = None
+        self._lock = Lock()
+
+    def _load(self) -> Dict[str, Dict[str, OrderStatus]]:
+        """Loads every order status into memory and returns the indexes"""
+        statuses = list(OrderStatus.objects.all())
+        indexes = {
+            'name': {status.name.lower(): status for status in statuses},
+            'id': {str(status.id): status for status in statuses},
+        }
+        with self._lock:
+            self._indexes = indexes
+            self._loaded_at = time.monotonic()
+        return indexes
+
+    def _find(self, index: str, key: str) -> Union[OrderStatus, None]:
+        """
+        Returns the status stored under key in the given index.
+        A miss only reloads the registry if it was loaded more than
+        reload_interval seconds ago, so repeated lookups of unknown
+        statuses don't query the database every time.
+        """
+        indexes = self._indexes
+        if indexes is None:
+            return self._load()[index].get(key)
+        status = indexes[index].get(key)
+        if status is None and self._is_stale():
+            status = self._load()[index].get(key)
+        return status
+
+    def _is_stale(self) -> bool:
+        """Whether the registry was loaded more than reload_interval ago"""
+        loaded_at = self._loaded_at
+        return (loaded_at is None or
+                time.monotonic() - loaded_at >= self.reload_interval)
+
+    def get(self, name: str) -> Union[OrderStatus, None]:
+        """Returns the order status matching name (case insensitive)"""
+        if not name:
+            return None
+        return self._find('name', name.strip().lower())
+
+    def get_by_id(self, status_id) -> Union[OrderStatus, None]:
+        """Returns the order status matching status_id"""
+        if not status_id:
+            return None
+        return self._find('id', str(status_id))
+
+    def ids(self, names: Iterable[str]) -> List[str]:
+        """Returns the ids of the existing statuses matching names"""
+        statuses = (self.get(name) for name in names)
+        return [status.id for status in statuses if status]
+
+    def get_code(self, status_id) -> Union[int, None]:
+        """Returns the state code of the order status matching status_id"""
+        status = self.get_by_id(status_id)
+        return ORDER_STATUS_CODES.get(status.name) if status else None
+
+    def all(self) -> Dict[str, OrderStatus]:
+        """Returns a name to status map of every order status"""
+        indexes = self._indexes or self._load()
+        return {status.name: status for status in indexes['name'].values()}
+
+    def clear(self) -> None:
+        """Drops the loaded statuses"""
+        with self._lock:
+            self._indexes = None
+            self._loaded_at = None
+
+
+order_status_registry = OrderStatusRegistry(
+    reload_interval=getattr(settings, 'ORDER_STATUS_RELOAD_INTERVAL', 60)
+)
@@ -0,0 +1,60 @@
+import weakref
+from threading import local
+from typing import Callable, Hashable, Iterable
+from django.db import transaction
+
+
+_batches = local()
+
+
+class _CommitBatch:
+    """Items collected in a transaction and handled once it commits"""
+    def __init__(self, key: tuple, handler: Callable[[set], None]):
+        self.key = key
+        self.handler = handler
+        self.items = set()
+
+    def __call__(self):
+        # Items added from now on, e.g. by the handler, start a new batch
+        pending = _get_batches()
+        if pending.get(self.key) and pending[self.key]() is self:
+            del pending[self.key]
+        self.handler(self.items)
+
+
+def _get_batches() -> dict:
+    """Returns the weak references to the pending batches of the thread"""
+    if not hasattr(_batches, 'pending'):
+        _batches.pending = {}
+    return _batches.pending
+
+
+def on_commit_batch(
+    name: str,
+    handler: Callable[[set], None],
+    items: Iterable[Hashable],
+    using=None,
+    robust: bool = False
+) -> None:
+    """
+    Adds items to the name batch of the current transaction and calls
+    handler once with the set of all its items when the transaction
+    commits, through a single transaction.on_commit() callback. Outside
+    transactions the handler is called with the items right away.
+    Batches are only weakly referenced: once the transaction or the
+    savepoint they were registered in is rolled back, Django drops their
+    callback and the next items start a new batch.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        handler(set(items))
+        return
+
+    pending = _get_batches()
+    key = (connection.alias, name)
+    batch = pending[key]() if key in pending else None
+    if batch is None:
+        batch = _CommitBatch(key, handler)
+        pending[key] = weakref.ref(batch)
+        transaction.on_commit(batch, using=using, robust=robust)
+    batch.items.update(items)
@@ -0,0 +1,79 @@
+import copy
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Union
+from django.conf import settings
+from apps.base.models import User
+
+
+class AuthenticatedUserCache:
+    """
+    Keeps the users resolved by token authentication in a bounded
+    in-process LRU cache for ttl seconds, so authenticated requests don't
+    need to query their user. Users are dropped whenever they are saved
+    or deleted, which includes token_version bumps, and other processes
+    pick up the change once the ttl expires.
+    """
+    def __init__(self, ttl: float = 30, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._generation = 0
+        self._lock = Lock()
+
+    def get(self, user_id) -> Union[User, None]:
+        """Returns a copy of the cached user matching user_id if any"""
+        key = str(user_id)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        # Requests get their own copy so changes made while handling
+        # them never leak into the cached user
+        return copy.copy(user)
+
+    def load(self, user_id) -> User:
+        """
+        Returns the user matching user_id from the cache or the database.
+        Raises User.DoesNotExist if there is no such user.
+        """
+        user = self.get(user_id)
+        if user is not None:
+            return user
+
+        generation = self._generation
+        user = User.objects.get(id=user_id)
+        if self.ttl > 0:
+            with self._lock:
+                # Skip caching a user that changed while it was loaded
+                if generation == self._generation:
+                    self._cache[str(user_id)] = (monotonic() + self.ttl,
+                                                 copy.copy(user))
+                    self._cache.move_to_end(str(user_id))
+                    while len(self._cache) > self.maxsize:
+                        self._cache.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id) -> None:
+        """Drops the cached user matching user_id"""
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        """Drops every cached user"""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+
+user_cache = AuthenticatedUserCache(
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 30),
+    maxsize=getattr(settings, 'AUTH_USER_CACHE_SIZE', 1024)
+)
@@ -1,12 +1,15 @@
+from itertools import islice
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import JsonResponse
-from django.db.models import CharField
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.db.models import CharField, F, QuerySet
 from django.db.models.functions import Cast
-from typing import Union, List
+from typing import Dict, List, Union
 from apps.client_orders.models import ClientOrder, ClientOrderedItem
 from apps.supplier_orders.models import SupplierOrder, SupplierOrderedItem
 from apps.sales.models import Sale, SoldItem
+from .renderers import dumps
 from .tokens import Token
 
 
@@ -19,6 +22,73 @@ class CreatedByUserMixin:
         return queryset.filter(created_by=self.request.user)
 
 
+EXPORT_FORMATS = ['ndjson']
+
+
+class ExportListMixin:
+    """
+    Mixin letting list endpoints stream their whole filtered queryset
+    as JSON Lines with ?export=ndjson instead of returning a page.
+    Rows are fetched and serialized in chunks so memory use stays flat
+    regardless of the number of exported rows.
+    """
+    export_chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', 500)
+
+    def is_export(self) -> bool:
+        return 'export' in self.request.query_params
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_export():
+            return super().list(request, *args, **kwargs)
+
+        export_format = request.query_params['export'].lower()
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"Unsupported export format '{export_format}'. "
+                          f"Supported formats: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(self.stream_rows(queryset),
+                                         content_type='application/x-ndjson')
+        filename = f'{queryset.model._meta.model_name}_export.ndjson'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def stream_rows(self, queryset):
+        """Yields every serialized object of queryset as a JSON line"""
+        rows = queryset.iterator(chunk_size=self.export_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.export_chunk_size))
+            if not chunk:
+                break
+            serializer = self.get_serializer(chunk, many=True)
+            yield b''.join(dumps(data) + b'\n' for data in serializer.data)
+
+
+def apply_ordering(
+    queryset: QuerySet,
+    request,
+    fields: Dict[str, str],
+    tiebreaker: str
+) -> QuerySet:
+    """
+    Sorts queryset by the ?ordering= query parameter, e.g. -total_spend.
+    Only the keys of fields, which maps them to the sorted fields or
+    annotations, are accepted and other values are ignored. Null values
+    come last in both directions and tiebreaker sorts equal rows.
+    """
+    ordering = request.GET.get('ordering', None)
+    field = fields.get(ordering.lstrip('-')) if ordering else None
+    if not field:
+        return queryset
+    expression = (F(field).desc(nulls_last=True)
+                  if ordering.startswith('-')
+                  else F(field).asc(nulls_last=True))
+    return queryset.order_by(expression, tiebreaker)
+
+
 def validate_linked_items_for_deletion(
     ids: List[str],
     queryset: List[Union[ClientOrderedItem, SupplierOrderedItem, SoldItem]],
@@ -48,3 +48,15 @@ api.interceptors.request.use(async function (config) {
   }
   return config;
 });
+
+// List endpoints are paginated, full lists are streamed as JSON Lines
+export const getAll = async <T = any>(url: string): Promise<T[]> => {
+  const separator = url.includes('?') ? '&' : '?';
+  const res = await api.get(`${url}${separator}export=ndjson`, {
+    responseType: 'text',
+  });
+  return (res.data as string)
+    .split('\n')
+    .filter((line) => line)
+    .map((line) => JSON.parse(line));
+};
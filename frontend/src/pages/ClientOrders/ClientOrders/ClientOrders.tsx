@@ -19,7 +19,7 @@ import AgGridTable, {
 import ModalOverlay from '../../../components/ModalOverlay';
 import Breadcrumb from '../../../components/Breadcrumbs/Breadcrumb';
 import Loader from '../../../common/Loader';
-import { api } from '../../../api/axios';
+import { api, getAll } from '../../../api/axios';
 import { useAlert } from '../../../contexts/AlertContext';
 import { Alert } from '../../UiElements/Alert';
 import { useClientOrders } from '../../../contexts/ClientOrdersContext';
@@ -272,8 +272,8 @@ const ClientOrders = () => {
     const loadData = async () => {
       setOrdersLoading(true);
       try {
-        const res = await api.get('/client_orders/');
-        setRowData(res.data);
+        const data = await getAll('/client_orders/');
+        setRowData(data);
       } catch (error: any) {
         console.log('Error getting orders list', error);
       } finally {
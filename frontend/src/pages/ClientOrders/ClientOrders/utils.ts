@@ -4,7 +4,7 @@ import { format } from 'date-fns';
 import { ClientOrderSchema } from './AddClientOrder';
 import { ClientOrderProps } from './ClientOrder';
 import toast from 'react-hot-toast';
-import { api } from '../../../api/axios';
+import { getAll } from '../../../api/axios';
 import { dispatch } from '../../../store/store';
 import { setClientOrders } from '../../../store/slices/clientOrdersSlice';
 
@@ -106,8 +106,7 @@ export const handleOrderExport = (selectedRows?: ClientOrderProps[]) => {
 
 export const handleBulkExport = async () => {
   try {
-    const res = await api.get('/client_orders/');
-    const orders = res.data;
+    const orders = await getAll('/client_orders/');
     createSheetFile(orders);
   } catch (error: any) {
     console.log('Error during orders export', error);
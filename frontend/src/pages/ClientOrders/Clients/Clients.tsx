@@ -14,7 +14,7 @@ import Loader from '../../../common/Loader';
 import { ColDef, ValueGetterParams } from '@ag-grid-community/core';
 import { useAlert } from '../../../contexts/AlertContext';
 import { Alert } from '../../UiElements/Alert';
-import { api } from '../../../api/axios';
+import { api, getAll } from '../../../api/axios';
 import Breadcrumb from '../../../components/Breadcrumbs/Breadcrumb';
 import { handleBulkExport, handleClientExport } from './utils';
 import Client, { ClientProps, Location } from './Client';
@@ -132,8 +132,8 @@ const Clients = () => {
   useEffect(() => {
     const loadData = async () => {
       try {
-        const res = await api.get('/client_orders/clients/');
-        setRowData(res.data);
+        const data = await getAll('/client_orders/clients/');
+        setRowData(data);
       } catch (err) {
         console.log('Error getting user items', err);
       } finally {
@@ -3,7 +3,7 @@ import { utils, writeFile } from 'xlsx';
 import { format } from 'date-fns';
 import { UseFormSetValue } from 'react-hook-form';
 import { ClientSchema } from './AddClient';
-import { api } from '../../../api/axios';
+import { getAll } from '../../../api/axios';
 import { ClientProps } from './Client';
 import toast from 'react-hot-toast';
 
@@ -70,8 +70,7 @@ export const handleClientExport = (selectedRows?: ClientProps[]) => {
 
 export const handleBulkExport = async () => {
   try {
-    const res = await api.get('/client_orders/clients/');
-    const clientsData: ClientProps[] = res.data;
+    const clientsData: ClientProps[] = await getAll('/client_orders/clients/');
     createSheetFile(clientsData);
   } catch (err) {
     console.log('Error during bulk export', err);
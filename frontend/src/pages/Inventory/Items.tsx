@@ -15,7 +15,7 @@ import DeleteItem from './DeleteItem';
 import Loader from '../../common/Loader';
 import ModalOverlay from '../../components/ModalOverlay';
 import Breadcrumb from '../../components/Breadcrumbs/Breadcrumb';
-import { api } from '../../api/axios';
+import { api, getAll } from '../../api/axios';
 import { useInventory } from '../../contexts/InventoryContext';
 import { useAlert } from '../../contexts/AlertContext';
 import { Alert } from '../UiElements/Alert';
@@ -186,8 +186,8 @@ const Items = () => {
   useEffect(() => {
     const loadData = async () => {
       try {
-        const res = await api.get('/inventory/items/?in_inventory=true');
-        setRowData(res.data);
+        const data = await getAll('/inventory/items/?in_inventory=true');
+        setRowData(data);
       } catch (err) {
         console.log('Error getting user items', err);
       } finally {
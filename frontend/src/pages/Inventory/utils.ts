@@ -2,7 +2,7 @@ import { utils, writeFile } from 'xlsx';
 import toast from 'react-hot-toast';
 import { format } from 'date-fns';
 import { ItemProps } from './Item';
-import { api } from '../../api/axios';
+import { getAll } from '../../api/axios';
 
 export const getUpdatedInventory = (
   type: 'add' | 'update',
@@ -126,8 +126,7 @@ export const handleItemExport = (selectedRows?: ItemProps[]) => {
 
 export const handleBulkExport = async () => {
   try {
-    const res = await api.get('/inventory/user/items/');
-    const itemsData: ItemProps[] = res.data;
+    const itemsData: ItemProps[] = await getAll('/inventory/items/?in_inventory=true');
     createSheetFile(itemsData);
   } catch (err) {
     console.log('Error during bulk export', err);
@@ -16,7 +16,7 @@ import ModalOverlay from '../../components/ModalOverlay';
 import { useAlert } from '../../contexts/AlertContext';
 import { Alert } from '../UiElements/Alert';
 import { Location } from '../ClientOrders/Clients/Client';
-import { api } from '../../api/axios';
+import { api, getAll } from '../../api/axios';
 import { AgGridReact, CustomCellRendererProps } from '@ag-grid-community/react';
 import {
   ColDef,
@@ -259,8 +259,8 @@ const Sales = () => {
     const loadData = async () => {
       setSalesLoading(true);
       try {
-        const res = await api.get('/sales/');
-        setRowData(res.data);
+        const data = await getAll('/sales/');
+        setRowData(data);
       } catch (error: any) {
         console.log('Error getting sales data', error);
       } finally {
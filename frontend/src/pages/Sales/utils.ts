@@ -4,7 +4,7 @@ import { SaleProps } from './Sale';
 import toast from 'react-hot-toast';
 import { utils, writeFile } from 'xlsx';
 import { format } from 'date-fns';
-import { api } from '../../api/axios';
+import { getAll } from '../../api/axios';
 
 type FlattenedSoldItems = {
   [key: string]: string;
@@ -93,8 +93,7 @@ export const handleSaleExport = (selectedRows?: SaleProps[]) => {
 
 export const handleSaleBulkExport = async () => {
   try {
-    const res = await api.get('/sales/');
-    const orders = res.data;
+    const orders = await getAll('/sales/');
     createSheetFile(orders);
   } catch (error: any) {
     console.log('Error during sales export', error);
@@ -26,7 +26,7 @@ import {
   handleSupplierOrderExport,
 } from './utils';
 import { useSupplierOrders } from '../../../contexts/SupplierOrdersContext';
-import { api } from '../../../api/axios';
+import { api, getAll } from '../../../api/axios';
 import SupplierOrder, {
   SupplierOrderProps,
   SupplierOrderedItem,
@@ -241,8 +241,8 @@ const SupplierOrders = () => {
     const loadData = async () => {
       setOrdersLoading(true);
       try {
-        const res = await api.get('/supplier_orders/');
-        setRowData(res.data);
+        const data = await getAll('/supplier_orders/');
+        setRowData(data);
       } catch (error) {
         console.log('Error getting supplier orders', error);
       } finally {
@@ -17,7 +17,7 @@ import {
 import { dispatch } from '../../../store/store';
 import { SupplierOrderProps } from './SupplierOrder';
 import toast from 'react-hot-toast';
-import { api } from '../../../api/axios';
+import { getAll } from '../../../api/axios';
 import { format } from 'date-fns';
 
 type FlattenedOrderedItems = {
@@ -168,8 +168,7 @@ export const handleSupplierOrderExport = (selectedRows?: SupplierOrderProps[]) =
 
 export const handleSupplierOrderBulkExport = async () => {
   try {
-    const res = await api.get('/supplier_orders/');
-    const orders = res.data;
+    const orders = await getAll('/supplier_orders/');
     createSheetFile(orders);
   } catch (error: any) {
     console.log('Error during orders export', error);
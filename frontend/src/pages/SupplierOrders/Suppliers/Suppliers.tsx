@@ -14,7 +14,7 @@ import ModalOverlay from '../../../components/ModalOverlay';
 import { Location } from '../../ClientOrders/Clients/Client';
 import { useAlert } from '../../../contexts/AlertContext';
 import { Alert } from '../../UiElements/Alert';
-import { api } from '../../../api/axios';
+import { api, getAll } from '../../../api/axios';
 import { useSupplierOrders } from '../../../contexts/SupplierOrdersContext';
 import { handleSupplierBulkExport, handleSupplierExport } from './utils';
 import { AgGridReact, CustomCellRendererProps } from '@ag-grid-community/react';
@@ -130,8 +130,8 @@ const Suppliers = () => {
     const loadData = async () => {
       setSuppliersLoading(true);
       try {
-        const res = await api.get('/supplier_orders/suppliers/');
-        setRowData(res.data);
+        const data = await getAll('/supplier_orders/suppliers/');
+        setRowData(data);
       } catch (error) {
         console.log('Error fetching suppliers list', error);
       } finally {
@@ -4,7 +4,7 @@ import { format } from 'date-fns';
 import toast from 'react-hot-toast';
 import { SupplierSchema } from './AddSupplier';
 import { SupplierProps } from './Supplier';
-import { api } from '../../../api/axios';
+import { getAll } from '../../../api/axios';
 
 export const findCountryAndSetCitiesForSupplier = (
   countryName: string,
@@ -69,8 +69,7 @@ export const handleSupplierExport = (selectedRows?: SupplierProps[]) => {
 
 export const handleSupplierBulkExport = async () => {
   try {
-    const res = await api.get('/supplier_orders/suppliers/');
-    const suppliersData: SupplierProps[] = res.data;
+    const suppliersData: SupplierProps[] = await getAll('/supplier_orders/suppliers/');
     createSheetFile(suppliersData);
   } catch (err) {
     console.log('Error during bulk export', err);